@@ -16,5 +16,67 @@ class Settings:
     GITHUB_KEY = os.getenv("GITHUB_TOKEN")
     VECTOR_DB_PATH = os.path.join(BASE_DIR, "app/vectorstore/faqs")
 
+    # Intent classifier tokenizer: "fast" (precompiled regex) or "nltk"
+    INTENT_TOKENIZER = os.getenv("INTENT_TOKENIZER", "fast")
+
+    # Intent classifier inference backend: "torch" (intent_model.pth), "numpy" (intent_model.npz),
+    # "hashed" (intent_model_hashed.pth) or "vocab" (intent_model_vocab.pth)
+    INTENT_BACKEND = os.getenv("INTENT_BACKEND", "torch")
+
+    # Hot reload: poll the active intent model file and swap in new versions
+    INTENT_MODEL_WATCH = os.getenv("INTENT_MODEL_WATCH", "false").lower() == "true"
+    INTENT_MODEL_WATCH_INTERVAL = float(os.getenv("INTENT_MODEL_WATCH_INTERVAL", 5))
+
+    # Shadow evaluation: promotion gate for a candidate intent model
+    INTENT_SHADOW_MIN_SAMPLES = int(os.getenv("INTENT_SHADOW_MIN_SAMPLES", 500))
+    INTENT_SHADOW_MIN_AGREEMENT = float(os.getenv("INTENT_SHADOW_MIN_AGREEMENT", 0.9))
+    INTENT_SHADOW_MAX_LATENCY_RATIO = float(os.getenv("INTENT_SHADOW_MAX_LATENCY_RATIO", 1.5))
+
+    # Inference executor for CPU-bound model calls made from async code
+    INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", 2))
+    INFERENCE_MAX_PENDING = int(os.getenv("INFERENCE_MAX_PENDING", 256))
+    TORCH_NUM_THREADS = int(os.getenv("TORCH_NUM_THREADS", 1))
+
+    # Shared keep-alive connection pool for async LLM calls
+    LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", 100))
+    LLM_KEEPALIVE_SECONDS = float(os.getenv("LLM_KEEPALIVE_SECONDS", 60))
+
+    # Speculative handler stages while a low-confidence intent is being verified
+    SPECULATIVE_STAGES = os.getenv("SPECULATIVE_STAGES", "true").lower() == "true"
+    SPECULATION_MIN_PROBABILITY = float(os.getenv("SPECULATION_MIN_PROBABILITY", 0.25))
+
+    # Exact-match LLM completion cache shared by the workers on a node:
+    # SQLite (WAL) file by default, Redis when LLM_CACHE_URL is redis://...
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_URL = os.getenv("LLM_CACHE_URL", "")
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(BASE_DIR, "database", "llm_cache.sqlite3"))
+    LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", 7 * 86400))
+
+    # Semantic cache of FAQ/general answers: cosine threshold (overridable per
+    # intent or intent:language, e.g. "faq=0.9,general:sw=0.96"), TTL and size
+    SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.92))
+    SEMANTIC_CACHE_THRESHOLDS = os.getenv("SEMANTIC_CACHE_THRESHOLDS", "faq=0.9,general=0.95")
+    SEMANTIC_CACHE_TTL_SECONDS = float(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", 86400))
+    SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", 5000))
+
+    # Intent micro-batching: largest batch and longest wait for the first request
+    INTENT_BATCH_MAX_SIZE = int(os.getenv("INTENT_BATCH_MAX_SIZE", 32))
+    INTENT_BATCH_MAX_WAIT_MS = float(os.getenv("INTENT_BATCH_MAX_WAIT_MS", 5))
+
+    # Keyword/regex fast path rules applied before the classifier
+    INTENT_RULES_PATH = os.getenv("INTENT_RULES_PATH", os.path.join(DATA_DIR, "intent_rules.json"))
+
+    # Kenyan towns, neighbourhoods and landmarks for location normalization
+    GAZETTEER_PATH = os.getenv("GAZETTEER_PATH", os.path.join(DATA_DIR, "kenyan_places.json"))
+
+    # Minimum tag confidence to answer small talk from intents.json responses
+    DIRECT_RESPONSE_MIN_CONFIDENCE = float(os.getenv("DIRECT_RESPONSE_MIN_CONFIDENCE", 0.75))
+
+    # Embedding kNN intent fallback (runs before LLM verification)
+    INTENT_KNN_K = int(os.getenv("INTENT_KNN_K", 5))
+    INTENT_KNN_MIN_CONFIDENCE = float(os.getenv("INTENT_KNN_MIN_CONFIDENCE", 0.6))
+    INTENT_KNN_MIN_SIMILARITY = float(os.getenv("INTENT_KNN_MIN_SIMILARITY", 0.5))
+
 
 settings = Settings()
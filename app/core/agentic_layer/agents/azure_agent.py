@@ -1,3 +1,4 @@
+import logging
 import os
 from azure.ai.inference import ChatCompletionsClient
 from azure.ai.inference.models import SystemMessage, UserMessage
@@ -8,8 +9,89 @@ from app.core.agentic_layer.agents.base_agent import BaseAgent
 from app.core.agentic_layer.agent_registry import register_agent
 
 
+logger = logging.getLogger(__name__)
+
+# Async clients shared by every AzureAgent in the process, keyed by
+# (endpoint, token) -> (client, aiohttp session); rebuilt if the event loop
+# changes, with the previous loop's sessions closed
+_async_clients = {}
+_async_loop = None
+# Close tasks in flight (the loop only keeps weak references to tasks)
+_closing = set()
+
+
+async def _close_clients(clients):
+    for client, session in clients:
+        try:
+            await client.close()
+            await session.close()
+        except Exception as e:
+            # Sessions of a loop that has already been closed cannot shut
+            # their sockets down cleanly; they are still marked closed
+            logger.debug(f"Closing Azure async client failed: {e}")
+
+
+def _close_stale_clients(clients, old_loop, loop):
+    """Close the sessions of a previous event loop: on that loop if it is still running, else on this one."""
+    if old_loop is not None and old_loop.is_running() and not old_loop.is_closed():
+        import asyncio
+        asyncio.run_coroutine_threadsafe(_close_clients(clients), old_loop)
+        return
+    task = loop.create_task(_close_clients(clients))
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+async def close_async_clients():
+    """Close every pooled async client and its aiohttp session (application shutdown)."""
+    global _async_loop
+    clients = list(_async_clients.values())
+    _async_clients.clear()
+    _async_loop = None
+    await _close_clients(clients)
+
+
+def _get_async_client(endpoint: str, token: str):
+    """
+    Async ChatCompletionsClient over one keep-alive aiohttp connection pool
+    (at most LLM_MAX_CONNECTIONS sockets), so concurrent turns reuse TLS
+    connections instead of opening one per completion.
+    """
+    global _async_loop
+    import asyncio
+    import aiohttp
+    from azure.ai.inference.aio import ChatCompletionsClient as AsyncChatCompletionsClient
+    from azure.core.pipeline.transport import AioHttpTransport
+
+    loop = asyncio.get_running_loop()
+    if _async_loop is not loop:
+        stale = list(_async_clients.values())
+        _async_clients.clear()
+        if stale:
+            _close_stale_clients(stale, _async_loop, loop)
+        _async_loop = loop
+
+    key = (endpoint, token)
+    if key not in _async_clients:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=settings.LLM_MAX_CONNECTIONS,
+                keepalive_timeout=settings.LLM_KEEPALIVE_SECONDS,
+            )
+        )
+        client = AsyncChatCompletionsClient(
+            endpoint=endpoint,
+            credential=AzureKeyCredential(token),
+            transport=AioHttpTransport(session=session, session_owner=False),
+        )
+        _async_clients[key] = (client, session)
+    return _async_clients[key][0]
+
+
 @register_agent("azure")
 class AzureAgent(BaseAgent):
+    system_prompt = "You are a helpful assistant."
+
     def __init__(self, model="openai/gpt-4o", memory=None):
         super().__init__(name="azure", model=model, memory=memory)
 
@@ -27,13 +109,29 @@ class AzureAgent(BaseAgent):
         """Send a message to the Azure inference endpoint"""
         response = self.client.complete(
             messages=[
-                SystemMessage("You are a helpful assistant."),
+                SystemMessage(self.system_prompt),
                 UserMessage(message),
             ],
             model=self.model,
         )
         return response.choices[0].message.content
 
+    async def arun(self, message: str) -> str:
+        """Send a message to the Azure inference endpoint without blocking the event loop"""
+        client = _get_async_client(self.endpoint, self.token)
+        response = await client.complete(
+            messages=[
+                SystemMessage(self.system_prompt),
+                UserMessage(message),
+            ],
+            model=self.model,
+        )
+        return response.choices[0].message.content
+
+    def cache_params(self):
+        # Service-side sampling defaults; the endpoint decides what serves ``model``
+        return {"endpoint": self.endpoint}
+
     def get_llm(self):
         from app.core.agentic_layer.llm_wrappers import BaseLLMWrapper
         return BaseLLMWrapper(agent=self)
@@ -1,14 +1,112 @@
 # app/core/agentic_layer/agents/base_agent.py
+import asyncio
+import functools
 from abc import ABC, abstractmethod
 from typing import Optional, Dict, Any, List
 
+from app.core.conversation.metrics import turn_metrics
+
+
+def _cache_key(agent: "BaseAgent", message: str, kwargs: Dict) -> str:
+    from app.core.agentic_layer.completion_cache import completion_key
+    return completion_key(
+        agent.name,
+        agent.model,
+        agent.system_prompt,
+        [{"role": "user", "content": message}],
+        {**agent.cache_params(), **kwargs},
+    )
+
+
+def _count_llm_call(agent: "BaseAgent"):
+    """Count a completion requested from an LLM against the current turn."""
+    if agent.calls_llm:
+        turn_metrics.record_llm_call()
+
+
+def _completion_cache_for(agent: "BaseAgent", message: Any):
+    """The completion cache if this call may use it, else None."""
+    from app.core.agentic_layer.completion_cache import get_completion_cache
+    # An agent with memory or history answers from more than the key covers
+    if not agent.cache_completions or not isinstance(message, str) \
+            or agent.memory is not None or agent.conversation_history:
+        return None
+    return get_completion_cache()
+
+
+def _cached_run(run):
+    """Wrap a concrete ``run`` with the exact-match completion cache."""
+
+    @functools.wraps(run)
+    def wrapper(self, message: str, **kwargs):
+        cache = _completion_cache_for(self, message)
+        if cache is None:
+            _count_llm_call(self)
+            return run(self, message, **kwargs)
+
+        key = _cache_key(self, message, kwargs)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        _count_llm_call(self)
+        result = run(self, message, **kwargs)
+        # Only plain text is cached
+        if isinstance(result, str):
+            cache.set(key, result)
+        return result
+
+    return wrapper
+
+
+def _cached_arun(arun):
+    """Async counterpart of ``_cached_run``; store reads and writes run on a worker thread."""
+
+    @functools.wraps(arun)
+    async def wrapper(self, message: str, **kwargs):
+        cache = _completion_cache_for(self, message)
+        if cache is None:
+            _count_llm_call(self)
+            return await arun(self, message, **kwargs)
+
+        key = _cache_key(self, message, kwargs)
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            return cached
+        _count_llm_call(self)
+        result = await arun(self, message, **kwargs)
+        if isinstance(result, str):
+            await asyncio.to_thread(cache.set, key, result)
+        return result
+
+    return wrapper
+
 
 class BaseAgent(ABC):
     """
     Abstract base class for all AI agents.
     Defines the interface that all agents must implement.
+
+    Every ``run``/``arun`` a subclass defines is wrapped with the exact-match
+    completion cache (see ``completion_cache``), keyed by agent, model,
+    system prompt, message and ``cache_params()``. Agents whose output is
+    not a pure function of those (tool-using agents, RAG, local
+    classifiers) set ``cache_completions = False``; an agent given memory or
+    holding conversation history is not cached either. Calls that miss the cache count as LLM
+    calls for the turn metrics unless the agent sets ``calls_llm = False``
+    (local classifiers, and RAG whose own LLM agent is counted).
     """
 
+    cache_completions = True
+    calls_llm = True
+    system_prompt: Optional[str] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "run" in cls.__dict__:
+            cls.run = _cached_run(cls.__dict__["run"])
+        if "arun" in cls.__dict__:
+            cls.arun = _cached_arun(cls.__dict__["arun"])
+
     def __init__(
             self,
             name: str = "base_agent",
@@ -28,6 +126,29 @@ class BaseAgent(ABC):
         """
         pass
 
+    async def arun(self, message: str, **kwargs) -> str:
+        """
+        Async version of ``run`` for use from the orchestrator.
+
+        Agents with an async client override this; by default the blocking
+        ``run`` is offloaded to a worker thread so the event loop stays free.
+        """
+        return await asyncio.to_thread(self.run, message, **kwargs)
+
+    def forget_completion(self, message: str, **kwargs):
+        """
+        Drop the cached completion of ``run(message, **kwargs)``, for a
+        reply the caller rejected (invalid structured output), so the next
+        identical call asks the LLM again instead of repeating it.
+        """
+        cache = _completion_cache_for(self, message)
+        if cache is not None:
+            cache.delete(_cache_key(self, message, kwargs))
+
+    def cache_params(self) -> Dict[str, Any]:
+        """Generation parameters that change the completion (temperature, ...), part of the cache key."""
+        return {}
+
     def add_to_history(self, role: str, content: str):
         """Add message to conversation history"""
         self.conversation_history.append({
@@ -1,5 +1,3 @@
-from langchain_core.messages import AIMessage
-
 from app.core.agentic_layer.agents.base_agent import BaseAgent
 from app.core.agentic_layer.agent_registry import register_agent
 from langchain_anthropic import ChatAnthropic  # Anthropic Claude integration
@@ -17,8 +15,11 @@ class ClaudeAgent(BaseAgent):
             max_retries=2,
         )
 
-    def run(self, message: str) -> AIMessage:
-        return self.llm.invoke(message)
+    def run(self, message: str) -> str:
+        return self.llm.invoke(message).content
+
+    def cache_params(self):
+        return {"temperature": self.llm.temperature, "max_tokens": self.llm.max_tokens}
 
     def get_llm(self):
         from app.core.agentic_layer.llm_wrappers import BaseLLMWrapper
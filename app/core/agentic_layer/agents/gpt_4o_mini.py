@@ -9,6 +9,9 @@ from app.core.agentic_layer.tool_registry import get_registered_tools
 
 @register_agent("gpt_4o_mini")
 class GPT4oMiniAgent(BaseAgent):
+    # ReAct agent: answers come from tool calls made at run time
+    cache_completions = False
+
     def __init__(self, memory=None):
         super().__init__(name="gpt_4o_mini", model="gpt-4o-mini", memory=memory)
 
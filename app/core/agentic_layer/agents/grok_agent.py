@@ -11,8 +11,11 @@ class GrokAgent(BaseAgent):
         self.llm = ChatOpenAI(model=model, temperature=0.5)
         self.memory = memory
 
-    def run(self, message: str):
-        return self.llm.invoke(message)
+    def run(self, message: str) -> str:
+        return self.llm.invoke(message).content
+
+    def cache_params(self):
+        return {"temperature": self.llm.temperature, "max_tokens": self.llm.max_tokens}
 
     def get_llm(self):
         from app.core.agentic_layer.llm_wrappers import BaseLLMWrapper
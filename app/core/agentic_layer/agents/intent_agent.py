@@ -5,6 +5,9 @@ from app.core.agentic_layer.agent_registry import register_agent
 
 @register_agent("PyTorch")
 class IntentAgent(BaseAgent):
+    cache_completions = False
+    calls_llm = False
+
     def __init__(self, model=None, memory=None):
         super().__init__(name="PyTorch", model=model, memory=memory)
     """A simple wrapper around your PyTorch intent classifier."""
@@ -21,6 +21,9 @@ class LocalLlamaAgent(BaseAgent):
         )
         return output["choices"][0]["message"]["content"]
 
+    def cache_params(self):
+        return {"chat_format": self.llm.chat_format, "n_ctx": self.llm.n_ctx()}
+
     def get_llm(self):
         from app.core.agentic_layer.llm_wrappers import BaseLLMWrapper
         return BaseLLMWrapper(agent=self)
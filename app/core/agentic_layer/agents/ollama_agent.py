@@ -12,6 +12,9 @@ class OllamaAgent(BaseAgent):
     def run(self, message: str) -> str:
         return self.llm.invoke(message)
 
+    def cache_params(self):
+        return {"temperature": self.llm.temperature, "num_predict": self.llm.num_predict}
+
     def get_llm(self):
         from app.core.agentic_layer.llm_wrappers import BaseLLMWrapper
         return BaseLLMWrapper(agent=self)
@@ -9,6 +9,10 @@ class RagAgent(BaseAgent):
     RAG Agent that uses another agent's LLM inside RAG.
     """
 
+    # Answers depend on the vectorstore; the inner LLM agent's calls are cached instead
+    cache_completions = False
+    calls_llm = False
+
     def __init__(self, llm_agent=None, memory=None):
         super().__init__("rag", model=None, memory=memory)
 
@@ -20,3 +24,15 @@ class RagAgent(BaseAgent):
 
     def run(self, message: str):
         return self.rag_engine.run(message)
+
+    async def aretrieve(self, message: str):
+        """Embedding + Chroma search on the inference executor"""
+        from app.core.inference_executor import run_inference
+
+        return await run_inference("rag", self.rag_engine.retrieve, message)
+
+    async def arun(self, message: str, docs=None):
+        """Retrieval (unless ``docs`` were prefetched), then generation through the LLM agent's arun"""
+        if docs is None:
+            docs = await self.aretrieve(message)
+        return await self.llm_agent.arun(self.rag_engine.build_prompt(message, docs))
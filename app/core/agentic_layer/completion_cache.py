@@ -0,0 +1,218 @@
+# app/core/agentic_layer/completion_cache.py
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def completion_key(
+        agent: str,
+        model: Any,
+        system_prompt: Optional[str],
+        messages: List[Dict[str, str]],
+        params: Optional[Dict[str, Any]] = None
+) -> str:
+    """Content address of a completion request: sha256 over its canonical JSON."""
+    payload = json.dumps(
+        {
+            "agent": agent,
+            "model": str(model),
+            "system": system_prompt,
+            "messages": messages,
+            "params": params or {},
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SQLiteCompletionStore:
+    """
+    Completions in a local SQLite file in WAL mode, so every worker process
+    on the node reads and writes the same entries. Connections are per
+    thread; writes that find the database busy are dropped, not retried.
+    """
+
+    # Purge expired rows every this many writes
+    PURGE_EVERY = 500
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._local = threading.local()
+        self._writes = 0
+
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS completions ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, expires_at REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS completions_expires ON completions (expires_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Autocommit; short busy timeout so a locked database is a quick miss
+            connection = sqlite3.connect(self.path, timeout=0.1, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._connection().execute(
+            "SELECT value FROM completions WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str, ttl_seconds: float):
+        now = time.time()
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO completions (key, value, created_at, expires_at) VALUES (?, ?, ?, ?)",
+            (key, value, now, now + ttl_seconds),
+        )
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            connection.execute("DELETE FROM completions WHERE expires_at <= ?", (now,))
+
+    def delete(self, key: str):
+        self._connection().execute("DELETE FROM completions WHERE key = ?", (key,))
+
+    def clear(self):
+        self._connection().execute("DELETE FROM completions")
+
+
+class RedisCompletionStore:
+    """Completions in Redis (SETEX), shared by every worker that can reach it."""
+
+    PREFIX = "llm_completion:"
+
+    def __init__(self, url: str):
+        import redis
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(self.PREFIX + key)
+        return value.decode("utf-8") if value is not None else None
+
+    def set(self, key: str, value: str, ttl_seconds: float):
+        self.client.setex(self.PREFIX + key, max(int(ttl_seconds), 1), value)
+
+    def delete(self, key: str):
+        self.client.delete(self.PREFIX + key)
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.PREFIX + "*"):
+            self.client.delete(key)
+
+
+class CompletionCache:
+    """
+    Exact-match cache of LLM completions, keyed by ``completion_key``.
+
+    Store errors are logged and treated as misses, so a locked or missing
+    cache never fails a turn.
+    """
+
+    def __init__(self, store=None, ttl_seconds: Optional[float] = None):
+        if store is None:
+            url = settings.LLM_CACHE_URL
+            store = RedisCompletionStore(url) if url.startswith(("redis://", "rediss://")) \
+                else SQLiteCompletionStore(settings.LLM_CACHE_PATH)
+        self.store = store
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.LLM_CACHE_TTL_SECONDS
+
+        self._lock = threading.Lock()
+        self.stats: Counter = Counter()
+        self.hit_ms = 0.0
+
+    def get(self, key: str) -> Optional[str]:
+        started = time.perf_counter()
+        try:
+            value = self.store.get(key)
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            self._count("errors")
+            return None
+
+        with self._lock:
+            self.stats["hits" if value is not None else "misses"] += 1
+            if value is not None:
+                self.hit_ms += (time.perf_counter() - started) * 1000
+        return value
+
+    def set(self, key: str, value: str):
+        try:
+            self.store.set(key, value, self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {e}")
+            self._count("errors")
+            return
+        self._count("stores")
+
+    def delete(self, key: str):
+        """Drop one entry (a completion its caller rejected)."""
+        try:
+            self.store.delete(key)
+        except Exception as e:
+            logger.warning(f"LLM cache delete failed: {e}")
+            self._count("errors")
+            return
+        self._count("deletes")
+
+    def _count(self, event: str):
+        with self._lock:
+            self.stats[event] += 1
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "backend": type(self.store).__name__,
+                "ttl_seconds": self.ttl_seconds,
+                "lookups": lookups,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+                "avg_hit_ms": self.hit_ms / self.stats["hits"] if self.stats["hits"] else None,
+                **self.stats,
+            }
+
+
+# ---------------------------
+# Global Singleton Instance
+# ---------------------------
+_cache_instance = None
+_cache_failed = False
+_cache_lock = threading.Lock()
+
+
+def get_completion_cache() -> Optional[CompletionCache]:
+    """The process-wide completion cache, or None when LLM_CACHE_ENABLED is off or it cannot be opened."""
+    global _cache_instance, _cache_failed
+    if not settings.LLM_CACHE_ENABLED or _cache_failed:
+        return None
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None and not _cache_failed:
+                try:
+                    _cache_instance = CompletionCache()
+                except Exception as e:
+                    logger.error(f"LLM completion cache unavailable: {e}")
+                    _cache_failed = True
+    return _cache_instance
+
+
+def get_completion_cache_stats() -> Optional[Dict]:
+    """Cache stats, or None if no agent call has used the cache yet."""
+    return _cache_instance.get_stats() if _cache_instance is not None else None
@@ -0,0 +1,96 @@
+# app/core/agentic_layer/structured_output.py
+import json
+import re
+from typing import Dict, Iterable, Optional
+
+# Slots the combined classify + extract call may fill (same keys as the booking flow_data)
+BOOKING_SLOTS = ("vehicle_type", "pickup_location", "dropoff_location", "date", "time")
+
+INTENT_EXTRACTION_SCHEMA = """{
+  "intent": "<one of: %(intents)s>",
+  "confidence": <number between 0 and 1>,
+  "slots": {
+    "vehicle_type": <string or null>,
+    "pickup_location": <string or null>,
+    "dropoff_location": <string or null>,
+    "date": <string or null>,
+    "time": <string or null>
+  },
+  "city": <string or null>
+}"""
+
+_FENCE = re.compile(r"^\s*```(?:json)?\s*(.*?)\s*```\s*$", re.DOTALL)
+
+
+class StructuredOutputError(ValueError):
+    """LLM output that does not match the expected JSON schema"""
+
+
+def intent_extraction_schema(intents: Iterable[str]) -> str:
+    return INTENT_EXTRACTION_SCHEMA % {"intents": ", ".join(intents)}
+
+
+def _optional_string(value, field: str) -> Optional[str]:
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise StructuredOutputError(f"'{field}' must be a string or null")
+    value = value.strip()
+    # Models sometimes spell "not mentioned" out instead of using null
+    if not value or value.lower() in ("unknown", "null", "none", "n/a"):
+        return None
+    return value
+
+
+def parse_intent_extraction(text: str, intents: Iterable[str]) -> Dict:
+    """
+    Validate a classify + extract reply.
+
+    Accepts exactly one JSON object (optionally inside a ```json fence)
+    with the fields of ``INTENT_EXTRACTION_SCHEMA`` (plus an optional
+    "reasoning" string). Returns ``{"intent", "confidence", "slots", "city"}``
+    with only the mentioned slots kept; raises StructuredOutputError otherwise.
+    """
+    fenced = _FENCE.match(text)
+    if fenced:
+        text = fenced.group(1)
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise StructuredOutputError(f"not valid JSON: {e}") from e
+    if not isinstance(data, dict):
+        raise StructuredOutputError("top level must be a JSON object")
+
+    unexpected = set(data) - {"intent", "confidence", "slots", "city", "reasoning"}
+    if unexpected:
+        raise StructuredOutputError(f"unexpected fields: {sorted(unexpected)}")
+
+    intents = set(intents)
+    intent = data.get("intent")
+    if not isinstance(intent, str) or intent.strip().lower() not in intents:
+        raise StructuredOutputError(f"'intent' must be one of {sorted(intents)}")
+
+    confidence = data.get("confidence")
+    if isinstance(confidence, bool) or not isinstance(confidence, (int, float)) or not 0 <= confidence <= 1:
+        raise StructuredOutputError("'confidence' must be a number between 0 and 1")
+
+    raw_slots = data.get("slots") or {}
+    if not isinstance(raw_slots, dict):
+        raise StructuredOutputError("'slots' must be an object")
+    unknown_slots = set(raw_slots) - set(BOOKING_SLOTS)
+    if unknown_slots:
+        raise StructuredOutputError(f"unknown slots: {sorted(unknown_slots)}")
+
+    slots = {}
+    for name in BOOKING_SLOTS:
+        value = _optional_string(raw_slots.get(name), f"slots.{name}")
+        if value is not None:
+            slots[name] = value
+
+    return {
+        "intent": intent.strip().lower(),
+        "confidence": float(confidence),
+        "slots": slots,
+        "city": _optional_string(data.get("city"), "city"),
+    }
@@ -0,0 +1,74 @@
+# app/core/conversation/metrics.py
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+# LLM calls made for the turn being answered in this context. A one-item
+# list, so speculative stage tasks and to_thread calls started during the
+# turn (which copy the context) add to the same count.
+_turn_llm_calls: ContextVar[Optional[List[int]]] = ContextVar("turn_llm_calls", default=None)
+
+
+class TurnMetrics:
+    """
+    Process-wide counters for how user turns were answered.
+
+    Every orchestrator instance records into the same object, so the
+    numbers reflect the whole worker regardless of which router served
+    the request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.turns = 0
+        self.llm_free_turns = 0
+        self.by_path: Counter = Counter()
+        self.stages: Counter = Counter()
+
+    def record(self, path: str, llm_free: bool):
+        with self._lock:
+            self.turns += 1
+            self.by_path[path] += 1
+            if llm_free:
+                self.llm_free_turns += 1
+
+    def start_turn(self):
+        """Start counting LLM calls for the turn handled in the current context"""
+        _turn_llm_calls.set([0])
+
+    def record_llm_call(self):
+        """An agent requested a completion from an LLM (cache hits do not count)"""
+        calls = _turn_llm_calls.get()
+        if calls is not None:
+            with self._lock:
+                calls[0] += 1
+
+    def turn_llm_calls(self) -> int:
+        calls = _turn_llm_calls.get()
+        return calls[0] if calls is not None else 0
+
+    def record_stage(self, event: str):
+        """Speculative stage events: started / used / cancelled / failed"""
+        with self._lock:
+            self.stages[event] += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "turns": self.turns,
+                "llm_free_turns": self.llm_free_turns,
+                "llm_free_rate": self.llm_free_turns / self.turns if self.turns else 0.0,
+                "by_path": dict(self.by_path),
+                "speculative_stages": dict(self.stages),
+            }
+
+    def reset(self):
+        with self._lock:
+            self.turns = 0
+            self.llm_free_turns = 0
+            self.by_path.clear()
+            self.stages.clear()
+
+
+turn_metrics = TurnMetrics()
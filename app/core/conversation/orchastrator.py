@@ -1,14 +1,31 @@
 # app/core/orchestrator.py
 
-from typing import Dict, List, Optional, Any
+import asyncio
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
-from app.core.intent_layer.intent_classifier import get_intent_with_confidence
+from app.config import settings
+from app.core.inference_executor import run_inference
+from app.core.intent_layer.batcher import get_intent_with_confidence_async
+from app.core.intent_layer.direct_responses import get_direct_responder
+from app.core.intent_layer.knn_fallback import get_intent_fallback
+from app.core.intent_layer.rule_matcher import get_rule_matcher
 from app.core.agentic_layer.agent_manager import AgentManager
 from app.core.agentic_layer.tool_registry import get_registered_tools
+from app.core.agentic_layer.structured_output import (
+    StructuredOutputError,
+    intent_extraction_schema,
+    parse_intent_extraction,
+)
 # from app.core.rag_layer.rag_engine import handle_faq
 from app.core.conversation.conversation_manager import ConversationStateManager, ConversationState
+from app.core.conversation.metrics import turn_metrics
+from app.core.conversation.semantic_cache import get_semantic_cache
+from app.core.conversation.stage_scheduler import StageScheduler
+from app.core.gazetteer import get_gazetteer
+from utils.extractors import extract_entities, extract_entities_with_remainder
+from utils.language import detect_language
 from lib.logger.color_logger import setup_logger
 logger = setup_logger(__name__)
 
@@ -44,11 +61,31 @@ class ConversationOrchestrator:
     - Multi-turn conversation flows
     """
 
+    # Handler stage of each intent, kept when that intent wins
+    SPECULATIVE_STAGES = {
+        "faq": "rag_docs",
+        "booking": "booking_slots",
+        "weather": "weather_city",
+    }
+    # Stages that do not call the LLM, the only ones started before the
+    # intent is decided. Booking slots and the city are provided by the
+    # combined classify + extract call, or extracted by the chosen handler
+    LOCAL_STAGES = {"rag_docs"}
+
+    BOOKING_SLOTS = ("vehicle_type", "pickup_location", "dropoff_location", "date", "time")
+
     def __init__(self):
         self.agent_manager = AgentManager()
         self.tools = {tool.name: tool for tool in get_registered_tools()}
         self.state_manager = ConversationStateManager()
 
+        # Precompiled keyword/regex rules and canned small-talk responses, loaded once
+        self.rule_matcher = get_rule_matcher()
+        self.direct_responder = get_direct_responder()
+        self.gazetteer = get_gazetteer()
+        self.metrics = turn_metrics
+        self._rag_agent = None
+
         # Intent to handler mapping
         self.intent_handlers = {
             "faq": self._handle_faq,
@@ -71,8 +108,11 @@ class ConversationOrchestrator:
 
         Flow:
         1. Check if in multi-turn conversation
-        2. Get intent from PyTorch classifier
-        3. If low confidence, verify with AI agent
+        2. Get intent from keyword rules, else the PyTorch classifier
+           (confident small talk is answered directly from intents.json)
+        3. If low confidence, try embedding kNN, then one structured AI agent
+           call that both verifies the intent and extracts slots
+           (local handler stages of the likely intents, RAG retrieval, start meanwhile)
         4. Route to appropriate handler
         5. Execute action (RAG, Tool, Multi-turn)
         6. Return response
@@ -81,141 +121,345 @@ class ConversationOrchestrator:
         # Step 1: Get or create conversation state
         state = self.state_manager.get_or_create_state(user_id, session_id)
         state.add_message("user", message)
+        self.metrics.start_turn()
 
         # Step 2: Check if in active multi-turn flow
         if state.is_in_flow():
             logger.info(f"📝 Continuing multi-turn flow: {state.current_flow}")
-            return await self._handle_multi_turn(state, message)
-
-        # Step 3: Get intent from PyTorch classifier
-        intent_result = get_intent_with_confidence(message)
-        intent = intent_result["intent"]
-        confidence = intent_result["confidence"]
+            response = await self._handle_multi_turn(state, message)
+            if response is not None:
+                return self._finish_turn(state, response, "multi_turn")
+
+        # Step 3: Trivial turns ("asante", "bye", "yes") are matched by the
+        # rule fast path; everything else goes to the PyTorch classifier
+        # (micro-batched). Tags (booking_request_en, ...) are routed by category
+        rule_result = self.rule_matcher.match(message)
+        if rule_result:
+            intent_result = self._rule_intent_result(rule_result)
+        else:
+            intent_result = await get_intent_with_confidence_async(message)
+        intent = intent_result["category"]
+        confidence = intent_result["category_confidence"]
         high_confidence = intent_result["high_confidence"]
 
         logger.info(
-            f"🎯 Intent: {intent} (confidence: {confidence:.2f}, "
+            f"🎯 Intent: {intent} [{intent_result['intent']}] (confidence: {confidence:.2f}, "
             f"high: {high_confidence})"
         )
 
-        # Step 4: If low confidence, verify with AI agent
-        if not high_confidence:
-            logger.info("🤔 Low confidence, verifying with AI agent...")
-            intent, confidence = await self._verify_intent_with_agent(
-                message, intent_result
+        # Confident greetings/thanks/jokes: answer without an LLM round-trip
+        tag = intent_result["intent"]
+        if self.direct_responder.can_answer(tag, intent_result["confidence"]):
+            response = OrchestratorResponse(
+                message=self._direct_reply(tag, message),
+                response_type=ResponseType.DIRECT,
+                intent=intent,
+                confidence=intent_result["confidence"],
+                metadata={"source": "intents_json", "tag": tag}
             )
+            return self._finish_turn(state, response, "direct_response")
 
-        # Step 5: Route to appropriate handler
+        # Step 4: If low confidence, try local embedding kNN, then the AI agent
+        stages = StageScheduler(self.metrics)
+        if not high_confidence:
+            self._start_speculative_stages(stages, message, self._candidate_intents(intent_result))
+            local_result = await self._classify_with_embeddings(message)
+
+            if local_result and local_result["confident"]:
+                intent, confidence = local_result["intent"], local_result["confidence"]
+                logger.info(
+                    f"🧭 Embedding kNN resolved intent: {intent} ({confidence:.2f}, "
+                    f"nearest: {local_result['nearest_tag']})"
+                )
+            else:
+                logger.info("🤔 Low confidence, verifying with AI agent...")
+                if local_result:
+                    self._start_speculative_stages(stages, message, [local_result["intent"]])
+                verified = await self._classify_and_extract_with_agent(message, intent_result)
+                intent, confidence = verified["intent"], verified["confidence"]
+                # Locally extracted values (canonical vehicle types, resolved
+                # dates) take precedence over the agent's free text
+                entities = extract_entities(message)
+                if verified["slots"] is not None:
+                    stages.provide("booking_slots", self._normalize_locations(
+                        {**verified["slots"], **self._booking_slots(entities)}
+                    ))
+                city = entities.get("city") or self._place_city(message) or verified["city"]
+                if city:
+                    stages.provide("weather_city", self._place_city(city) or city)
+
+        # Step 5: Route to appropriate handler (losing speculative stages are cancelled)
+        await stages.cancel_except([self.SPECULATIVE_STAGES.get(intent)])
         handler = self.intent_handlers.get(intent, self._handle_general)
-        response = await handler(state, message, intent, confidence)
+        try:
+            response = await handler(state, message, intent, confidence, stages=stages)
+        finally:
+            await stages.close()
 
         # Step 6: Save state and return
+        return self._finish_turn(state, response, intent)
+
+    def _finish_turn(
+            self,
+            state: ConversationState,
+            response: OrchestratorResponse,
+            path: str
+    ) -> OrchestratorResponse:
+        """
+        Record the assistant reply, persist state and count the turn (once),
+        as LLM-free unless an agent actually called an LLM while answering it
+        """
         state.add_message("assistant", response.message)
         self.state_manager.save_state(state)
-
+        self.metrics.record(path, llm_free=self.metrics.turn_llm_calls() == 0)
         return response
 
-    async def _verify_intent_with_agent(
+    @staticmethod
+    def _rule_intent_result(rule_result: Dict) -> Dict:
+        """Shape a keyword rule hit like a classifier result"""
+        return {
+            "intent": rule_result["intent"],
+            "confidence": 1.0,
+            "category": rule_result["category"],
+            "category_confidence": 1.0,
+            "high_confidence": True,
+            "all_probabilities": {},
+            "category_probabilities": {},
+            "needs_llm_verification": False,
+            "rule": rule_result["rule"],
+        }
+
+    def _is_affirmative(self, message: str) -> bool:
+        """yes / ok / ndio / sawa ... as recognised by the keyword rules"""
+        rule_result = self.rule_matcher.match(message)
+        return rule_result is not None and rule_result["intent"] == "affirm"
+
+    async def _classify_with_embeddings(self, message: str) -> Optional[Dict]:
+        """Second local stage: cosine kNN over embedded intents.json patterns"""
+        try:
+            # Embedding the message is CPU-bound: run it off the event loop
+            return await run_inference("embedding", lambda: get_intent_fallback().classify(message))
+        except Exception as e:
+            logger.error(f"❌ Embedding intent fallback failed: {e}")
+            return None
+
+    def _candidate_intents(self, intent_result: Dict) -> List[str]:
+        """Top category plus any other category the classifier finds plausible"""
+        candidates = [intent_result["category"]]
+        for category, probability in intent_result.get("category_probabilities", {}).items():
+            if category not in candidates and probability >= settings.SPECULATION_MIN_PROBABILITY:
+                candidates.append(category)
+        return candidates
+
+    def _direct_reply(self, tag: str, message: str) -> Optional[str]:
+        """
+        Canned reply for a direct tag, in the language the user wrote in.
+        detect_language() only positively identifies Swahili ("en" is its
+        fallback), so a short Swahili greeting the classifier tagged
+        ``greeting_sw`` is not switched to English.
+        """
+        language = detect_language(message)
+        return self.direct_responder.respond(tag, language if language == "sw" else None)
+
+    def _start_speculative_stages(
+            self,
+            stages: StageScheduler,
+            message: str,
+            intents: List[str]
+    ):
+        """Start the local handler stages of ``intents`` while the intent is still being decided"""
+        if not settings.SPECULATIVE_STAGES:
+            return
+        starters = {
+            "rag_docs": self._retrieve_faq_docs,
+        }
+        for intent in intents:
+            name = self.SPECULATIVE_STAGES.get(intent)
+            if name in self.LOCAL_STAGES and not stages.has(name):
+                stages.start(name, starters[name](message))
+
+    async def _classify_and_extract_with_agent(
             self,
             message: str,
             intent_result: Dict
-    ) -> tuple[str, float]:
-        """Use AI agent to verify and refine intent when confidence is low"""
+    ) -> Dict:
+        """
+        One AI agent call that verifies a low-confidence intent and extracts
+        booking slots and the city, answered as JSON. Invalid output gets one
+        repair attempt; after that the classifier's category is kept and
+        ``slots``/``city`` are None (the handlers extract them themselves).
+        """
 
-        prompt = f"""Analyze the user's message and determine their intent.
+        intents = list(self.intent_handlers)
+        prompt = f"""Analyze the user's message, determine their intent and extract any details it states.
 
 User message: "{message}"
 
-PyTorch classifier suggests: {intent_result['intent']} (confidence: {intent_result['confidence']:.2f})
-All probabilities: {intent_result['all_probabilities']}
+PyTorch classifier suggests: {intent_result['category']} (confidence: {intent_result['category_confidence']:.2f})
+All probabilities: {intent_result['category_probabilities']}
 
-Based on this message, what is the user's primary intent? Choose from:
+Intents:
 - faq: Questions about services, pricing, policies
 - booking: Vehicle booking or reservation requests
 - payment: Payment inquiries or money transfers
 - weather: Weather-related questions
 - general: General conversation, greetings, chitchat
 
-Respond with ONLY the intent label and a confidence score (0-1), formatted as:
-INTENT: <label>
-CONFIDENCE: <score>
-REASONING: <brief explanation>"""
+Slots are booking details (vehicle type, pickup, dropoff, date, time) and "city" is the
+city a weather question is about. Use null for anything not explicitly mentioned.
+
+Respond with ONLY a JSON object in this schema, no other text:
+{intent_extraction_schema(intents)}"""
+
+        fallback = {
+            "intent": intent_result["category"],
+            "confidence": intent_result["category_confidence"],
+            "slots": None,
+            "city": None,
+        }
 
         try:
             agent = self.agent_manager.get_agent("azure")
-            result = agent.run(prompt)
-
-            # Parse agent response
-            lines = result.strip().split('\n')
-            refined_intent = None
-            refined_confidence = 0.5
-
-            for line in lines:
-                if line.startswith("INTENT:"):
-                    refined_intent = line.split(":", 1)[1].strip().lower()
-                elif line.startswith("CONFIDENCE:"):
-                    try:
-                        refined_confidence = float(line.split(":", 1)[1].strip())
-                    except:
-                        refined_confidence = 0.7
-
-            if refined_intent and refined_intent in self.intent_handlers:
-                logger.info(f"✅ Agent refined intent: {refined_intent} ({refined_confidence:.2f})")
-                return refined_intent, refined_confidence
-            else:
-                # Fall back to original
-                return intent_result["intent"], intent_result["confidence"]
+            reply = await agent.arun(prompt)
+            try:
+                result = parse_intent_extraction(reply, intents)
+            except StructuredOutputError as e:
+                logger.warning(f"⚠️ Invalid structured reply ({e}), asking agent to repair it")
+                # Rejected replies must not be served from the completion cache again
+                await asyncio.to_thread(agent.forget_completion, prompt)
+                repair_prompt = f"""Your previous reply was not valid: {e}
+
+Previous reply:
+{reply}
+
+Return ONLY the corrected JSON object in this schema, no other text:
+{intent_extraction_schema(intents)}"""
+                reply = await agent.arun(repair_prompt)
+                try:
+                    result = parse_intent_extraction(reply, intents)
+                except StructuredOutputError:
+                    await asyncio.to_thread(agent.forget_completion, repair_prompt)
+                    raise
+
+            logger.info(
+                f"✅ Agent refined intent: {result['intent']} ({result['confidence']:.2f}), "
+                f"slots: {result['slots']}, city: {result['city']}"
+            )
+            return result
 
+        except StructuredOutputError as e:
+            logger.error(f"❌ Agent verification reply still invalid after repair: {e}")
+            return fallback
         except Exception as e:
             logger.error(f"❌ Agent verification failed: {e}")
-            return intent_result["intent"], intent_result["confidence"]
+            return fallback
+
+    def _get_rag_agent(self):
+        """RAG agent (and its Chroma store) built once per orchestrator"""
+        if self._rag_agent is None:
+            from app.core.agentic_layer.agents.rag_agent import RagAgent
+            self._rag_agent = RagAgent(llm_agent=self.agent_manager.get_agent("azure"))
+        return self._rag_agent
+
+    async def _retrieve_faq_docs(self, message: str):
+        """Embedding + Chroma search on the inference executor"""
+        rag_agent = await run_inference("rag", self._get_rag_agent)
+        return await rag_agent.aretrieve(message)
+
+    async def _lookup_cached_answer(self, message: str, intent: str) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        Semantic cache lookup for answers that do not depend on conversation
+        state. Returns the hit (or None) and the key to store a fresh answer under.
+        """
+        if not settings.SEMANTIC_CACHE_ENABLED:
+            return None, None
+        try:
+            cache = await run_inference("embedding", get_semantic_cache)
+            vector = await run_inference("embedding", cache.embed, message)
+        except Exception as e:
+            logger.error(f"❌ Semantic cache unavailable: {e}")
+            return None, None
+
+        key = {"vector": vector, "intent": intent, "language": detect_language(message), "query": message}
+        hit = cache.lookup(vector, intent, key["language"])
+        if hit:
+            logger.info(f"♻️ Semantic cache hit ({hit['similarity']:.3f}): {hit['query']!r}")
+        return hit, key
+
+    @staticmethod
+    def _cached_response(hit: Dict, intent: str, confidence: float) -> OrchestratorResponse:
+        return OrchestratorResponse(
+            message=hit["answer"],
+            response_type=ResponseType(hit["response_type"]),
+            intent=intent,
+            confidence=confidence,
+            metadata={
+                "source": "semantic_cache",
+                "cached_source": hit["source"],
+                "similarity": hit["similarity"],
+            }
+        )
+
+    @staticmethod
+    def _remember_answer(key: Optional[Dict], response: OrchestratorResponse):
+        if key is None:
+            return
+        get_semantic_cache().store(
+            key["vector"], key["intent"], key["language"], key["query"], response.message,
+            response_type=response.response_type.value,
+            source=response.metadata.get("source"),
+        )
 
     async def _handle_faq(
             self,
             state: ConversationState,
             message: str,
             intent: str,
-            confidence: float
+            confidence: float,
+            stages: Optional[StageScheduler] = None
     ) -> OrchestratorResponse:
         """Handle FAQ questions using RAG"""
 
         logger.info("📚 Handling FAQ with RAG system...")
 
         try:
-            # Get answer from RAG
-            from app.core.agentic_layer.agent_manager import AgentManager
-            from app.core.agentic_layer.agents.rag_agent import RagAgent
+            # Paraphrases of recently answered questions skip RAG and the LLM
+            hit, cache_key = await self._lookup_cached_answer(message, intent)
+            if hit:
+                return self._cached_response(hit, intent, confidence)
 
-            agent_manager = AgentManager()
-
-            azure = agent_manager.get_agent("azure")
-            rag = RagAgent(llm_agent=azure)
-
-            rag_answer = rag.run(message)
+            # Get answer from RAG (embedding + Chroma search run on the
+            # inference executor, generation is awaited on the LLM client)
+            rag_agent = await run_inference("rag", self._get_rag_agent)
+            docs = await stages.take("rag_docs") if stages else None
+            rag_answer = await rag_agent.arun(message, docs=docs)
 
             # If RAG doesn't have good answer, use agent
             if "don't have that information" in rag_answer.lower() or len(rag_answer) < 20:
                 logger.info("🤖 RAG insufficient, using agent...")
                 agent = self.agent_manager.get_agent("azure")
-                agent_answer = agent.run(
+                agent_answer = await agent.arun(
                     f"Answer this FAQ question professionally: {message}"
                 )
 
-                return OrchestratorResponse(
+                response = OrchestratorResponse(
                     message=agent_answer,
                     response_type=ResponseType.AGENT,
                     intent=intent,
                     confidence=confidence,
                     metadata={"source": "agent_fallback"}
                 )
+            else:
+                response = OrchestratorResponse(
+                    message=rag_answer,
+                    response_type=ResponseType.RAG,
+                    intent=intent,
+                    confidence=confidence,
+                    metadata={"source": "rag"}
+                )
 
-            return OrchestratorResponse(
-                message=rag_answer,
-                response_type=ResponseType.RAG,
-                intent=intent,
-                confidence=confidence,
-                metadata={"source": "rag"}
-            )
+            self._remember_answer(cache_key, response)
+            return response
 
         except Exception as e:
             logger.error(f"❌ FAQ handling error: {e}")
@@ -226,7 +470,8 @@ REASONING: <brief explanation>"""
             state: ConversationState,
             message: str,
             intent: str,
-            confidence: float
+            confidence: float,
+            stages: Optional[StageScheduler] = None
     ) -> OrchestratorResponse:
         """Handle vehicle booking with multi-turn conversation"""
 
@@ -241,39 +486,12 @@ REASONING: <brief explanation>"""
             "time": None,
         })
 
-        # Try to extract info from initial message
-        agent = self.agent_manager.get_agent("azure")
-        extraction_prompt = f"""Extract booking details from this message: "{message}"
-
-Return in this exact format:
-VEHICLE_TYPE: <type or "unknown">
-PICKUP: <location or "unknown">
-DROPOFF: <location or "unknown">
-DATE: <date or "unknown">
-TIME: <time or "unknown">
-
-Only extract information that is explicitly mentioned."""
-
-        result = agent.run(extraction_prompt)
-
-        # Parse extracted info
-        for line in result.split('\n'):
-            if ':' in line:
-                key, value = line.split(':', 1)
-                key = key.strip().lower().replace('_', ' ')
-                value = value.strip()
-
-                if value.lower() != "unknown":
-                    if "vehicle" in key:
-                        state.flow_data["vehicle_type"] = value
-                    elif "pickup" in key:
-                        state.flow_data["pickup_location"] = value
-                    elif "dropoff" in key:
-                        state.flow_data["dropoff_location"] = value
-                    elif "date" in key:
-                        state.flow_data["date"] = value
-                    elif "time" in key:
-                        state.flow_data["time"] = value
+        # Try to extract info from initial message (possibly already
+        # extracted by the structured verification call)
+        slots = await stages.take("booking_slots") if stages else None
+        if slots is None:
+            slots = await self._extract_booking_slots(message)
+        state.flow_data.update(slots)
 
         # Determine what to ask next
         next_question = self._get_next_booking_question(state.flow_data)
@@ -292,6 +510,64 @@ Only extract information that is explicitly mentioned."""
             # All info collected, confirm booking
             return await self._confirm_booking(state, intent, confidence)
 
+    def _booking_slots(self, entities: Dict) -> Dict:
+        return {slot: entities[slot] for slot in self.BOOKING_SLOTS if slot in entities}
+
+    def _normalize_locations(self, slots: Dict) -> Dict:
+        """Canonical gazetteer names for pickup/dropoff ("westlands nrb" -> "Westlands, Nairobi")"""
+        for slot in ("pickup_location", "dropoff_location"):
+            if slots.get(slot):
+                slots[slot] = self.gazetteer.normalize(slots[slot]) or slots[slot]
+        return slots
+
+    def _place_city(self, text: str) -> Optional[str]:
+        """City of the place mentioned in ``text`` ("weather in westlands" -> "Nairobi")"""
+        place = self.gazetteer.resolve(text)
+        return place["city"] if place else None
+
+    async def _extract_booking_slots(self, message: str) -> Dict:
+        """
+        Booking details stated in ``message``: extracted locally first, the
+        agent is only asked for slots still missing when the message has
+        words left that the local patterns did not account for.
+        """
+        entities, unparsed = extract_entities_with_remainder(message)
+        slots = self._booking_slots(entities)
+        missing = [slot for slot in self.BOOKING_SLOTS if slot not in slots]
+        if not missing or not unparsed:
+            logger.info(f"🧩 Booking slots extracted locally: {slots}")
+            return self._normalize_locations(slots)
+
+        labels = {
+            "vehicle_type": ("VEHICLE_TYPE", "type"),
+            "pickup_location": ("PICKUP", "location"),
+            "dropoff_location": ("DROPOFF", "location"),
+            "date": ("DATE", "date"),
+            "time": ("TIME", "time"),
+        }
+        fields = "\n".join(f'{labels[slot][0]}: <{labels[slot][1]} or "unknown">' for slot in missing)
+        extraction_prompt = f"""Extract booking details from this message: "{message}"
+
+Return in this exact format:
+{fields}
+
+Only extract information that is explicitly mentioned."""
+
+        agent = self.agent_manager.get_agent("azure")
+        result = await agent.arun(extraction_prompt)
+
+        # Parse extracted info
+        by_label = {label: slot for slot, (label, _) in labels.items()}
+        for line in result.split('\n'):
+            if ':' in line:
+                key, value = line.split(':', 1)
+                slot = by_label.get(key.strip().upper())
+                value = value.strip()
+
+                if slot in missing and value and value.lower() != "unknown":
+                    slots[slot] = value
+        return self._normalize_locations(slots)
+
     def _get_next_booking_question(self, data: Dict) -> Optional[str]:
         """Determine next question in booking flow"""
 
@@ -344,27 +620,38 @@ Would you like to confirm this booking? (yes/no)"""
             state: ConversationState,
             message: str,
             intent: str,
-            confidence: float
+            confidence: float,
+            stages: Optional[StageScheduler] = None
     ) -> OrchestratorResponse:
         """Handle payment and money transfer"""
 
         logger.info("💰 Starting payment flow...")
 
-        # Similar multi-turn flow as booking
+        # Similar multi-turn flow as booking, prefilled with whatever the
+        # message already states ("send 500 to 0712345678 via mpesa"; a bare
+        # number is the amount here)
+        entities = extract_entities(message)
         state.start_flow("payment", {
-            "amount": None,
-            "recipient": None,
-            "method": None,
+            "amount": entities.get("amount", entities.get("number")),
+            "recipient": entities.get("phone"),
+            "method": entities.get("payment_method"),
         })
 
+        next_question = self._get_next_payment_question(state.flow_data)
+        if next_question is None:
+            return self._complete_payment(state)
+
+        if not state.flow_data["amount"]:
+            next_question = "💳 I can help you with payments. How much would you like to send?"
+
         return OrchestratorResponse(
-            message="💳 I can help you with payments. How much would you like to send?",
+            message=next_question,
             response_type=ResponseType.MULTI_TURN,
             intent=intent,
             confidence=confidence,
             requires_followup=True,
             next_step="collect_payment_info",
-            metadata={"flow": "payment"}
+            metadata={"flow": "payment", "collected": state.flow_data}
         )
 
     async def _handle_weather(
@@ -372,21 +659,23 @@ Would you like to confirm this booking? (yes/no)"""
             state: ConversationState,
             message: str,
             intent: str,
-            confidence: float
+            confidence: float,
+            stages: Optional[StageScheduler] = None
     ) -> OrchestratorResponse:
         """Handle weather queries using weather tool"""
 
         logger.info("🌤️ Handling weather query with tool...")
 
         # Extract city from message
-        agent = self.agent_manager.get_agent("azure")
-        city_prompt = f"Extract the city name from this message: '{message}'. Reply with ONLY the city name, nothing else."
-        city = agent.run(city_prompt).strip()
+        city = await stages.take("weather_city") if stages else None
+        if city is None:
+            city = await self._extract_city(message)
 
         # Use weather tool
         if "get_weather" in self.tools:
             weather_tool = self.tools["get_weather"]
-            result = weather_tool._run(city)
+            # Blocking HTTP call (the tools have no async API): keep it off the event loop
+            result = await asyncio.to_thread(weather_tool._run, city)
 
             return OrchestratorResponse(
                 message=result,
@@ -398,34 +687,51 @@ Would you like to confirm this booking? (yes/no)"""
 
         return self._error_response(intent, confidence)
 
+    async def _extract_city(self, message: str) -> str:
+        city = extract_entities(message).get("city") or self._place_city(message)
+        if city:
+            return city
+
+        agent = self.agent_manager.get_agent("azure")
+        city_prompt = f"Extract the city name from this message: '{message}'. Reply with ONLY the city name, nothing else."
+        city = (await agent.arun(city_prompt)).strip()
+        return self._place_city(city) or city
+
     async def _handle_general(
             self,
             state: ConversationState,
             message: str,
             intent: str,
-            confidence: float
+            confidence: float,
+            stages: Optional[StageScheduler] = None
     ) -> OrchestratorResponse:
         """Handle general conversation"""
 
         logger.info("💬 Handling general conversation...")
 
+        hit, cache_key = await self._lookup_cached_answer(message, intent)
+        if hit:
+            return self._cached_response(hit, intent, confidence)
+
         agent = self.agent_manager.get_agent("azure")
-        response = agent.run(message)
+        answer = await agent.arun(message)
 
-        return OrchestratorResponse(
-            message=response,
+        response = OrchestratorResponse(
+            message=answer,
             response_type=ResponseType.AGENT,
             intent=intent,
             confidence=confidence,
             metadata={"source": "agent"}
         )
+        self._remember_answer(cache_key, response)
+        return response
 
     async def _handle_multi_turn(
             self,
             state: ConversationState,
             message: str
-    ) -> OrchestratorResponse:
-        """Handle ongoing multi-turn conversations"""
+    ) -> Optional[OrchestratorResponse]:
+        """Handle ongoing multi-turn conversations (None: not a known flow)"""
 
         flow = state.current_flow
 
@@ -434,9 +740,9 @@ Would you like to confirm this booking? (yes/no)"""
         elif flow == "payment":
             return await self._continue_payment_flow(state, message)
 
-        # Unknown flow, end it
+        # Unknown flow: end it and route the message as a new turn
         state.end_flow()
-        return await self.process_message(state.user_id, message, state.session_id)
+        return None
 
     async def _continue_booking_flow(
             self,
@@ -447,11 +753,11 @@ Would you like to confirm this booking? (yes/no)"""
 
         # Check if awaiting confirmation
         if state.flow_step == "awaiting_confirmation":
-            if message.lower() in ["yes", "y", "confirm", "ok", "sure"]:
+            if self._is_affirmative(message):
                 # Execute booking via tool
                 if "vehicle_booking" in self.tools:
                     tool = self.tools["vehicle_booking"]
-                    result = tool._run(**state.flow_data)
+                    result = await asyncio.to_thread(tool._run, **state.flow_data)
                     state.end_flow()
 
                     return OrchestratorResponse(
@@ -478,19 +784,20 @@ Would you like to confirm this booking? (yes/no)"""
                     confidence=1.0
                 )
 
-        # Collect information step by step
+        # Collect information step by step: whatever slots the reply states
+        # ("tomorrow at 3pm") are filled, and the asked slot takes the words
+        # the patterns did not account for ("westlands" for the pickup, but
+        # nothing from "tomorrow at 3pm" for the vehicle type)
         data = state.flow_data
-
-        if not data.get("vehicle_type"):
-            data["vehicle_type"] = message
-        elif not data.get("pickup_location"):
-            data["pickup_location"] = message
-        elif not data.get("dropoff_location"):
-            data["dropoff_location"] = message
-        elif not data.get("date"):
-            data["date"] = message
-        elif not data.get("time"):
-            data["time"] = message
+        asked = next((slot for slot in self.BOOKING_SLOTS if not data.get(slot)), None)
+        entities, unparsed = extract_entities_with_remainder(message)
+        found = self._booking_slots(entities)
+        for slot, value in found.items():
+            if not data.get(slot):
+                data[slot] = value
+        if asked and not data.get(asked) and (not found or unparsed):
+            data[asked] = " ".join(unparsed) if found else message
+        self._normalize_locations(data)
 
         # Ask next question or confirm
         next_question = self._get_next_booking_question(data)
@@ -515,43 +822,59 @@ Would you like to confirm this booking? (yes/no)"""
         """Continue payment multi-turn flow"""
 
         data = state.flow_data
+        entities = extract_entities(message)
 
         if not data.get("amount"):
-            data["amount"] = message
-            return OrchestratorResponse(
-                message="👤 Who would you like to send money to?",
-                response_type=ResponseType.MULTI_TURN,
-                intent="payment",
-                confidence=1.0,
-                requires_followup=True
-            )
+            rule_result = self.rule_matcher.match(message)
+            amount = entities.get("amount", entities.get("number"))
+            if amount is not None:
+                data["amount"] = amount
+            else:
+                data["amount"] = rule_result["value"] if rule_result and rule_result["intent"] == "amount" else message
         elif not data.get("recipient"):
-            data["recipient"] = message
+            data["recipient"] = entities.get("phone") or message
+        elif not data.get("method"):
+            data["method"] = entities.get("payment_method") or message
+
+        # The reply may answer later questions as well
+        for slot, entity in (("recipient", "phone"), ("method", "payment_method")):
+            if not data.get(slot) and entities.get(entity):
+                data[slot] = entities[entity]
+
+        next_question = self._get_next_payment_question(data)
+        if next_question:
             return OrchestratorResponse(
-                message="💳 Which payment method? (M-Pesa, credit card, bank transfer)",
+                message=next_question,
                 response_type=ResponseType.MULTI_TURN,
                 intent="payment",
                 confidence=1.0,
                 requires_followup=True
             )
+
+        return self._complete_payment(state)
+
+    def _get_next_payment_question(self, data: Dict) -> Optional[str]:
+        """Determine next question in payment flow"""
+
+        if not data.get("amount"):
+            return "💳 How much would you like to send?"
+        elif not data.get("recipient"):
+            return "👤 Who would you like to send money to?"
         elif not data.get("method"):
-            data["method"] = message
-            state.end_flow()
+            return "💳 Which payment method? (M-Pesa, credit card, bank transfer)"
 
-            return OrchestratorResponse(
-                message=f"✅ Payment of {data['amount']} to {data['recipient']} via {data['method']} initiated!",
-                response_type=ResponseType.DIRECT,
-                intent="payment",
-                confidence=1.0,
-                metadata={"payment_completed": True, "details": data}
-            )
+        return None  # All info collected
 
+    def _complete_payment(self, state: ConversationState) -> OrchestratorResponse:
+        data = dict(state.flow_data)
         state.end_flow()
+
         return OrchestratorResponse(
-            message="✅ Payment flow completed!",
+            message=f"✅ Payment of {data['amount']} to {data['recipient']} via {data['method']} initiated!",
             response_type=ResponseType.DIRECT,
             intent="payment",
-            confidence=1.0
+            confidence=1.0,
+            metadata={"payment_completed": True, "details": data}
         )
 
     def _error_response(self, intent: str, confidence: float) -> OrchestratorResponse:
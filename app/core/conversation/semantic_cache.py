@@ -0,0 +1,247 @@
+# app/core/conversation/semantic_cache.py
+import logging
+import os
+import threading
+import time
+import numpy as np
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Scopes whose answers come from the FAQ data and go stale when it changes
+DATA_SCOPED_INTENTS = {"faq"}
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+
+def parse_thresholds(spec: str) -> Dict[str, float]:
+    """"faq=0.90,general:sw=0.96" -> {"faq": 0.9, "general:sw": 0.96}"""
+    thresholds = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        scope, _, value = item.partition("=")
+        thresholds[scope.strip()] = float(value)
+    return thresholds
+
+
+class _Scope:
+    """Unit-vector matrix and answers for one (intent, language) pair."""
+
+    def __init__(self, dim: int, capacity: int = 64):
+        self.matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self.created = np.zeros(capacity, dtype=np.float64)
+        self.valid = np.zeros(capacity, dtype=bool)
+        self.entries: List[Optional[Dict]] = [None] * capacity
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def add(self, vector: np.ndarray, entry: Dict, now: float) -> int:
+        if not self.free:
+            capacity = len(self.entries)
+            self.matrix = np.vstack([self.matrix, np.zeros_like(self.matrix)])
+            self.created = np.concatenate([self.created, np.zeros(capacity)])
+            self.valid = np.concatenate([self.valid, np.zeros(capacity, dtype=bool)])
+            self.entries.extend([None] * capacity)
+            self.free = list(range(2 * capacity - 1, capacity - 1, -1))
+
+        slot = self.free.pop()
+        self.matrix[slot] = vector
+        self.created[slot] = now
+        self.valid[slot] = True
+        self.entries[slot] = entry
+        return slot
+
+    def remove(self, slot: int):
+        self.valid[slot] = False
+        self.entries[slot] = None
+        self.free.append(slot)
+
+
+class SemanticResponseCache:
+    """
+    Reuses answers to FAQ and general turns for paraphrased questions.
+
+    Each (intent, language) scope keeps the query embeddings of answered
+    turns as a row-normalized matrix; a new query is a hit when its cosine
+    similarity to a stored query reaches the scope's threshold. Entries
+    expire after ``ttl_seconds`` and the least recently used one is evicted
+    once ``max_entries`` (across all scopes) is reached. FAQ scopes are
+    dropped when ``faq_data.json`` or the Chroma store changes on disk.
+    """
+
+    def __init__(
+            self,
+            embeddings=None,
+            threshold: Optional[float] = None,
+            thresholds: Optional[Dict[str, float]] = None,
+            ttl_seconds: Optional[float] = None,
+            max_entries: Optional[int] = None,
+            watch_paths: Optional[List[str]] = None,
+            check_interval: float = 5.0
+    ):
+        if embeddings is None:
+            from app.vectorstore.initialize_store import get_shared_embedding
+            embeddings = get_shared_embedding()
+
+        self.embeddings = embeddings
+        self.threshold = threshold if threshold is not None else settings.SEMANTIC_CACHE_THRESHOLD
+        self.thresholds = thresholds if thresholds is not None else parse_thresholds(settings.SEMANTIC_CACHE_THRESHOLDS)
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.SEMANTIC_CACHE_TTL_SECONDS
+        self.max_entries = max_entries or settings.SEMANTIC_CACHE_MAX_ENTRIES
+        self.watch_paths = watch_paths if watch_paths is not None else [
+            os.path.join(settings.DATA_DIR, "faq_data.json"),
+            os.path.join(settings.BASE_DIR, "database", "chroma_db", "chroma.sqlite3"),
+        ]
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        self._scopes: Dict[Tuple[str, str], _Scope] = {}
+        self._lru: "OrderedDict[Tuple[Tuple[str, str], int], None]" = OrderedDict()
+        self._fingerprint = self._data_fingerprint()
+        self._checked_at = time.monotonic()
+
+        self.stats: Counter = Counter()
+        self.scope_stats: Dict[str, Counter] = {}
+
+    # ---------------------------
+    # Lookup / store
+    # ---------------------------
+    def embed(self, text: str) -> np.ndarray:
+        """Unit-length query embedding (CPU-bound: call on the inference executor)."""
+        return _normalize(np.asarray(self.embeddings.embed_query(text), dtype=np.float32))
+
+    def threshold_for(self, intent: str, language: str) -> float:
+        return self.thresholds.get(f"{intent}:{language}", self.thresholds.get(intent, self.threshold))
+
+    def lookup(self, vector: np.ndarray, intent: str, language: str) -> Optional[Dict]:
+        """Stored answer for the most similar earlier query in scope, if similar enough."""
+        key = (intent, language)
+        now = time.time()
+
+        with self._lock:
+            self._check_data()
+            scope = self._scopes.get(key)
+            hit = None
+
+            if scope is not None and scope.valid.any():
+                expired = scope.valid & (scope.created < now - self.ttl_seconds)
+                for slot in np.flatnonzero(expired):
+                    self._remove(key, int(slot))
+                    self.stats["expired"] += 1
+
+                if scope.valid.any():
+                    similarities = scope.matrix @ vector
+                    similarities[~scope.valid] = -np.inf
+                    best = int(similarities.argmax())
+                    similarity = float(similarities[best])
+                    if similarity >= self.threshold_for(intent, language):
+                        self._lru.move_to_end((key, best))
+                        entry = scope.entries[best]
+                        entry["hits"] += 1
+                        hit = {**entry, "similarity": similarity}
+
+            self._count(key, "hits" if hit else "misses")
+        return hit
+
+    def store(self, vector: np.ndarray, intent: str, language: str, query: str, answer: str, **extra):
+        """Remember ``answer`` for ``query`` (evicting the least recently used entry when full)."""
+        key = (intent, language)
+        with self._lock:
+            while len(self._lru) >= self.max_entries:
+                (old_key, old_slot), _ = self._lru.popitem(last=False)
+                self._scopes[old_key].remove(old_slot)
+                self.stats["evictions"] += 1
+
+            scope = self._scopes.get(key)
+            if scope is None:
+                scope = self._scopes[key] = _Scope(dim=len(vector))
+            entry = {"query": query, "answer": answer, "created_at": time.time(), "hits": 0, **extra}
+            slot = scope.add(vector, entry, entry["created_at"])
+            self._lru[(key, slot)] = None
+            self.stats["stores"] += 1
+
+    def _remove(self, key: Tuple[str, str], slot: int):
+        self._scopes[key].remove(slot)
+        self._lru.pop((key, slot), None)
+
+    def _count(self, key: Tuple[str, str], event: str):
+        self.stats[event] += 1
+        self.scope_stats.setdefault(f"{key[0]}:{key[1]}", Counter())[event] += 1
+
+    # ---------------------------
+    # Invalidation
+    # ---------------------------
+    def _data_fingerprint(self) -> Tuple:
+        fingerprint = []
+        for path in self.watch_paths:
+            try:
+                stat = os.stat(path)
+                fingerprint.append((path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                fingerprint.append((path, None, None))
+        return tuple(fingerprint)
+
+    def _check_data(self):
+        """Drop FAQ scopes if the FAQ data or vectorstore changed (checked every few seconds)."""
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return
+        self._checked_at = time.monotonic()
+        fingerprint = self._data_fingerprint()
+        if fingerprint != self._fingerprint:
+            self._fingerprint = fingerprint
+            logger.info("FAQ data or vectorstore changed, invalidating cached FAQ answers")
+            self._invalidate(DATA_SCOPED_INTENTS)
+
+    def _invalidate(self, intents=None) -> int:
+        removed = 0
+        for key in [key for key in self._scopes if intents is None or key[0] in intents]:
+            removed += int(self._scopes.pop(key).valid.sum())
+        self._lru = OrderedDict((item, None) for item in self._lru if item[0] in self._scopes)
+        self.stats["invalidations"] += 1
+        self.stats["invalidated_entries"] += removed
+        return removed
+
+    def invalidate(self, intent: Optional[str] = None) -> int:
+        """Drop cached answers for ``intent`` (all intents if None); returns entries removed."""
+        with self._lock:
+            return self._invalidate({intent} if intent else None)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            by_scope = {scope: dict(counts) for scope, counts in self.scope_stats.items()}
+            for (intent, language), scope in self._scopes.items():
+                by_scope.setdefault(f"{intent}:{language}", {})["entries"] = int(scope.valid.sum())
+            return {
+                "entries": len(self._lru),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "lookups": lookups,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+                **self.stats,
+                "by_scope": by_scope,
+            }
+
+
+# ---------------------------
+# Global Singleton Instance
+# ---------------------------
+_cache_instance = None
+_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticResponseCache:
+    global _cache_instance
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                _cache_instance = SemanticResponseCache()
+    return _cache_instance
+
+
+def get_semantic_cache_stats() -> Optional[Dict]:
+    """Cache stats, or None if no turn has used the cache yet (does not load the embedding model)."""
+    return _cache_instance.get_stats() if _cache_instance is not None else None
@@ -0,0 +1,79 @@
+# app/core/conversation/stage_scheduler.py
+import asyncio
+import logging
+from typing import Any, Awaitable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StageScheduler:
+    """
+    Speculative stages for one conversation turn.
+
+    While the intent is still being decided (embedding kNN, LLM
+    verification), handler work that does not depend on the decision -
+    RAG retrieval - is started as named tasks, and results produced
+    elsewhere (slots from the verification reply) are ``provide``d. Once
+    the intent is known, the stages of other intents are cancelled and the
+    handler ``take``s the result of its own stage instead of starting it
+    from scratch.
+    """
+
+    def __init__(self, metrics=None):
+        self.metrics = metrics
+        self._tasks: Dict[str, asyncio.Future] = {}
+
+    def start(self, name: str, coro: Awaitable) -> None:
+        """Start ``coro`` under ``name`` unless that stage is already running."""
+        if name in self._tasks:
+            coro.close()
+            return
+        self._tasks[name] = asyncio.ensure_future(coro)
+        self._count("started")
+
+    def provide(self, name: str, value: Any) -> None:
+        """Set the result of ``name`` produced elsewhere (replaces a running stage)."""
+        running = self._tasks.pop(name, None)
+        if running is not None:
+            running.cancel()
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        self._tasks[name] = future
+
+    def has(self, name: str) -> bool:
+        return name in self._tasks
+
+    async def take(self, name: str) -> Optional[Any]:
+        """
+        Await and remove the stage ``name``. Returns None if it was never
+        started or failed, so the caller can fall back to doing the work inline.
+        """
+        task = self._tasks.pop(name, None)
+        if task is None:
+            return None
+        try:
+            result = await task
+        except Exception as e:
+            logger.warning(f"Speculative stage '{name}' failed: {e}")
+            self._count("failed")
+            return None
+        self._count("used")
+        return result
+
+    async def cancel_except(self, keep: Iterable[str] = ()) -> None:
+        """Cancel every running stage not in ``keep`` (the losers)."""
+        keep = set(keep)
+        losers = [name for name in self._tasks if name not in keep]
+        for name in losers:
+            self._tasks.pop(name).cancel()
+            self._count("cancelled")
+        if losers:
+            logger.info(f"✂️ Cancelled speculative stages: {losers}")
+
+    async def close(self) -> None:
+        """Cancel whatever is left (end of turn)."""
+        await self.cancel_except()
+
+    def _count(self, event: str):
+        if self.metrics is not None:
+            self.metrics.record_stage(event)
@@ -0,0 +1,270 @@
+# app/core/gazetteer.py
+import json
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+# Key marking the end of an alias in the word trie
+_END = ""
+
+
+def normalize_place(text: str) -> str:
+    """Lowercase, drop apostrophes and turn other punctuation into spaces."""
+    return " ".join(_NON_WORD.sub(" ", text.lower().replace("'", "").replace("’", "")).split())
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, giving up (returning limit + 1) once it must exceed ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """Burkhard-Keller tree over words for bounded edit-distance lookup."""
+
+    def __init__(self):
+        self.root: Optional[Tuple[str, Dict[int, tuple]]] = None
+
+    def add(self, word: str):
+        if self.root is None:
+            self.root = (word, {})
+            return
+        node = self.root
+        while True:
+            distance = edit_distance(word, node[0], len(word) + len(node[0]))
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                return
+            node = child
+
+    def closest(self, word: str, max_distance: int) -> Optional[Tuple[str, int]]:
+        """Nearest stored word within ``max_distance`` (ties: first found), or None."""
+        if self.root is None:
+            return None
+        best = None
+        stack = [self.root]
+        while stack:
+            candidate, children = stack.pop()
+            # Pruning only needs the exact distance up to the largest edge
+            # below this node (+ max_distance); beyond that no child can match
+            limit = max(children, default=0) + max_distance
+            distance = edit_distance(word, candidate, limit)
+            if distance > limit:
+                continue
+            if distance <= max_distance and (best is None or distance < best[1]):
+                best = (candidate, distance)
+                if distance == 0:
+                    break
+            # Triangle inequality: only subtrees at distance d ± max_distance can hold matches
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return best
+
+
+class PlaceGazetteer:
+    """
+    In-memory gazetteer of Kenyan towns, neighbourhoods and landmarks.
+
+    Place names and aliases from ``kenyan_places.json`` are indexed in a
+    word trie (longest match first). Words that are not place words are
+    first corrected against a BK-tree of all place words within a small
+    edit distance ("westlnds" -> "westlands"), with the corrections cached.
+    ``find`` scans free text left to right;
+    ``resolve`` turns it into one canonical place, using a city mention to
+    disambiguate ("westlands nrb" -> "Westlands, Nairobi", "milimani
+    nakuru" -> "Milimani, Nakuru"). Canonical names give booking and weather
+    lookups stable keys.
+    """
+
+    # Words this short are only matched exactly ("nrb", "cbd")
+    MIN_FUZZY_LENGTH = 4
+    # Bound on cached word corrections
+    CORRECTION_CACHE_SIZE = 10000
+
+    def __init__(self, path: Optional[str] = None):
+        path = path or settings.GAZETTEER_PATH
+        with open(path, "r", encoding="utf-8") as f:
+            self.places: List[Dict] = json.load(f)["places"]
+
+        self._lock = threading.Lock()
+        self._trie: Dict = {}
+        self._bk = BKTree()
+        self._words = set()
+        self._corrections: Dict[str, Tuple[Optional[str], int]] = {}
+        self.max_words = 1
+
+        for index, place in enumerate(self.places):
+            for alias in [place["name"], *place.get("aliases", [])]:
+                self._add_alias(normalize_place(alias), index)
+            if place["type"] != "city":
+                # "Westlands Nairobi" as one phrase
+                self._add_alias(normalize_place(f"{place['name']} {place['city']}"), index)
+
+        self.lookups = 0
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+
+    def _add_alias(self, alias: str, index: int):
+        if not alias:
+            return
+
+        node = self._trie
+        words = alias.split()
+        for word in words:
+            node = node.setdefault(word, {})
+            if word not in self._words:
+                self._words.add(word)
+                self._bk.add(word)
+        ids = node.setdefault(_END, [])
+        if index not in ids:
+            ids.append(index)
+        self.max_words = max(self.max_words, len(words))
+
+    def _correct(self, word: str) -> Tuple[Optional[str], int]:
+        """The place word ``word`` is (a misspelling of) and the edit distance, or (None, 0)."""
+        if word in self._words:
+            return word, 0
+        if len(word) < self.MIN_FUZZY_LENGTH:
+            return None, 0
+
+        correction = self._corrections.get(word)
+        if correction is None:
+            found = self._bk.closest(word, 1 if len(word) <= 6 else 2)
+            correction = found if found else (None, 0)
+            with self._lock:
+                if len(self._corrections) >= self.CORRECTION_CACHE_SIZE:
+                    self._corrections.clear()
+                self._corrections[word] = correction
+        return correction
+
+    def canonical(self, index: int) -> str:
+        place = self.places[index]
+        if place["type"] == "city":
+            return place["name"]
+        return f"{place['name']}, {place['city']}"
+
+    def find(self, text: str) -> List[Dict]:
+        """Places mentioned in ``text``, left to right, without overlaps."""
+        words = normalize_place(text).split()
+        corrected = [self._correct(word) for word in words]
+        matches = []
+        exact = fuzzy = 0
+
+        i = 0
+        while i < len(words):
+            # Longest alias starting at this word
+            hit = None
+            node = self._trie
+            distance = 0
+            for j in range(i, min(len(words), i + self.max_words)):
+                word, word_distance = corrected[j]
+                node = node.get(word) if word else None
+                if node is None:
+                    break
+                distance += word_distance
+                if _END in node:
+                    hit = (j + 1, node[_END], distance)
+
+            if hit is None:
+                i += 1
+                continue
+
+            end, ids, distance = hit
+            if distance:
+                fuzzy += 1
+            else:
+                exact += 1
+            matches.append({
+                "text": " ".join(words[i:end]),
+                "candidates": ids,
+                "distance": distance,
+            })
+            i = end
+
+        with self._lock:
+            self.lookups += 1
+            self.exact_hits += exact
+            self.fuzzy_hits += fuzzy
+        return matches
+
+    def resolve(self, text: str) -> Optional[Dict]:
+        """
+        The single place ``text`` refers to, or None. The most specific
+        mention (landmark/area over city) wins; a city mention picks among
+        same-named places and fills in the city.
+        """
+        matches = self.find(text)
+        if not matches:
+            return None
+
+        cities = {
+            self.places[index]["city"]
+            for match in matches
+            for index in match["candidates"][:1]
+            if self.places[index]["type"] == "city"
+        }
+
+        best = None
+        for match in matches:
+            for index in match["candidates"]:
+                place = self.places[index]
+                specific = place["type"] != "city"
+                in_city = place["city"] in cities
+                rank = (specific, in_city or not cities, -match["distance"])
+                if best is None or rank > best[0]:
+                    best = (rank, index, match["distance"])
+
+        _, index, distance = best
+        place = self.places[index]
+        return {
+            "name": place["name"],
+            "city": place["city"],
+            "type": place["type"],
+            "canonical": self.canonical(index),
+            "distance": distance,
+        }
+
+    def normalize(self, text: str) -> Optional[str]:
+        """Canonical place name for ``text`` ("westlands nrb" -> "Westlands, Nairobi")."""
+        place = self.resolve(text)
+        return place["canonical"] if place else None
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "places": len(self.places),
+                "words": len(self._words),
+                "lookups": self.lookups,
+                "exact_hits": self.exact_hits,
+                "fuzzy_hits": self.fuzzy_hits,
+            }
+
+
+# ---------------------------
+# Global Singleton Instance
+# ---------------------------
+_gazetteer_instance = None
+
+
+def get_gazetteer() -> PlaceGazetteer:
+    global _gazetteer_instance
+    if _gazetteer_instance is None:
+        _gazetteer_instance = PlaceGazetteer()
+    return _gazetteer_instance
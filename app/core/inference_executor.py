@@ -0,0 +1,163 @@
+# app/core/inference_executor.py
+import asyncio
+import functools
+import logging
+import sys
+import threading
+import time
+import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Timings kept per queue for percentiles
+TIMING_WINDOW = 2048
+
+
+def configure_torch_threads(num_threads: Optional[int] = None):
+    """
+    Pin torch's intra-op thread count (process-wide). Only acts once torch
+    has been imported, so NumPy-only deployments never load it.
+    """
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return
+    num_threads = num_threads or settings.TORCH_NUM_THREADS
+    if torch.get_num_threads() != num_threads:
+        torch.set_num_threads(num_threads)
+
+
+class _QueueStats:
+    def __init__(self):
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.running = 0
+        self.wait_ms = deque(maxlen=TIMING_WINDOW)
+        self.run_ms = deque(maxlen=TIMING_WINDOW)
+
+    def to_dict(self) -> Dict:
+        def percentiles(values) -> Dict:
+            if not values:
+                return {"p50": None, "p99": None}
+            array = np.fromiter(values, dtype=np.float64)
+            return {"p50": float(np.percentile(array, 50)), "p99": float(np.percentile(array, 99))}
+
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "waiting": self.submitted - self.started,
+            "running": self.running,
+            "wait_ms": percentiles(self.wait_ms),
+            "run_ms": percentiles(self.run_ms),
+        }
+
+
+class InferenceExecutor:
+    """
+    Bounded thread pool for CPU-bound model calls (intent classifier,
+    sentence embeddings, Chroma search) made from async code.
+
+    Work is tagged with a queue name ("intent", "embedding", "rag", ...).
+    Each queue admits at most ``max_pending`` calls at a time (callers beyond
+    that wait on the event loop, not in the pool), and keeps its own counters
+    and wait/run time percentiles. Torch's intra-op threads are pinned to
+    ``TORCH_NUM_THREADS`` so several uvicorn workers do not oversubscribe
+    the cores.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.max_workers = max_workers or settings.INFERENCE_THREADS
+        self.max_pending = max_pending or settings.INFERENCE_MAX_PENDING
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _QueueStats] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        configure_torch_threads()
+
+    def _semaphore(self, queue: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        # Semaphores belong to one event loop; start fresh on a new one
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphores = {}
+        if queue not in self._semaphores:
+            self._semaphores[queue] = asyncio.Semaphore(self.max_pending)
+        return self._semaphores[queue]
+
+    def _queue_stats(self, queue: str) -> _QueueStats:
+        with self._lock:
+            return self._stats.setdefault(queue, _QueueStats())
+
+    async def run(self, queue: str, fn: Callable, *args, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` in the pool and await its result."""
+        stats = self._queue_stats(queue)
+        enqueued = time.perf_counter()
+        with self._lock:
+            stats.submitted += 1
+
+        def call():
+            started = time.perf_counter()
+            with self._lock:
+                stats.started += 1
+                stats.running += 1
+                stats.wait_ms.append((started - enqueued) * 1000)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    stats.running -= 1
+                    stats.run_ms.append((time.perf_counter() - started) * 1000)
+
+        async with self._semaphore(queue):
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(self._pool, functools.partial(call))
+            except Exception:
+                with self._lock:
+                    stats.failed += 1
+                raise
+
+        with self._lock:
+            stats.completed += 1
+        return result
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "queues": {name: stats.to_dict() for name, stats in self._stats.items()},
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+
+
+# ---------------------------
+# Global Singleton Instance
+# ---------------------------
+_executor_instance = None
+_executor_lock = threading.Lock()
+
+
+def get_inference_executor() -> InferenceExecutor:
+    global _executor_instance
+    if _executor_instance is None:
+        with _executor_lock:
+            if _executor_instance is None:
+                _executor_instance = InferenceExecutor()
+    return _executor_instance
+
+
+async def run_inference(queue: str, fn: Callable, *args, **kwargs) -> Any:
+    """Run a CPU-bound model call on the shared inference executor."""
+    return await get_inference_executor().run(queue, fn, *args, **kwargs)
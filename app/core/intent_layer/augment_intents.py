@@ -0,0 +1,140 @@
+# app/core/intent_layer/augment_intents.py
+"""
+Expand intents.json into a larger synonym-augmented training corpus.
+
+    python -m app.core.intent_layer.augment_intents --variants 20 --seed 42 \
+        --output data/augmented_intents.jsonl
+    python -m app.core.intent_layer.train_intent --extra data/augmented_intents.jsonl
+
+- WordNet is queried once per distinct word in the parent process; the
+  resulting synonym table is handed to every worker at start-up (and can be
+  persisted with ``--synonym-cache`` so later runs skip WordNet entirely).
+- Patterns are fanned out over a process pool and results are written to
+  JSONL as they arrive, so the corpus never has to fit in memory.
+- Every pattern gets its own RNG seeded from (seed, pattern index) and
+  results are written in input order, so the output is identical for a
+  given seed whatever the number of workers.
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from multiprocessing import Pool
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.config import settings
+from utils.nltk_utils import augment_sentence, synonyms_for
+
+# Synonym table shared with pool workers (set by the initializer)
+_synonyms: Dict[str, List[str]] = {}
+
+
+def load_patterns(intents_path: str) -> List[Tuple[str, str]]:
+    with open(intents_path, "r", encoding="utf-8") as f:
+        intents = json.load(f)["intents"]
+    return [(pattern, intent["tag"]) for intent in intents for pattern in intent["patterns"]]
+
+
+def build_synonym_table(patterns: List[Tuple[str, str]], cache_path: Optional[str] = None) -> Dict[str, List[str]]:
+    """Synonyms for every distinct word in ``patterns``, reusing ``cache_path`` if present."""
+    table: Dict[str, List[str]] = {}
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            table = json.load(f)
+
+    words = {word.lower() for text, _ in patterns for word in text.split()}
+    missing = sorted(words - table.keys())
+    for word in missing:
+        table[word] = list(synonyms_for(word))
+
+    if cache_path and missing:
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(table, f, ensure_ascii=False, sort_keys=True)
+
+    return table
+
+
+def _init_worker(synonyms: Dict[str, List[str]]):
+    global _synonyms
+    _synonyms = synonyms
+
+
+def augment_pattern(task: Tuple[int, str, str, int, int, float]) -> List[Dict]:
+    """Up to ``variants`` distinct augmented copies of one pattern."""
+    index, text, tag, seed, variants, replace_prob = task
+    rng = random.Random(f"{seed}:{index}")
+
+    seen = {text.lower()}
+    records = []
+    # A few extra attempts because short patterns often repeat themselves
+    for _ in range(variants * 3):
+        if len(records) >= variants:
+            break
+        candidate = augment_sentence(text, rng=rng, synonyms=_synonyms, replace_prob=replace_prob)
+        if candidate.lower() not in seen:
+            seen.add(candidate.lower())
+            records.append({"text": candidate, "tag": tag})
+    return records
+
+
+def iter_tasks(patterns: List[Tuple[str, str]], seed: int, variants: int, replace_prob: float) -> Iterator[Tuple]:
+    for index, (text, tag) in enumerate(patterns):
+        yield index, text, tag, seed, variants, replace_prob
+
+
+def augment_to_file(
+        patterns: List[Tuple[str, str]],
+        output: str,
+        variants: int = 10,
+        seed: int = 42,
+        replace_prob: float = 0.5,
+        workers: Optional[int] = None,
+        synonym_cache: Optional[str] = None,
+        chunksize: int = 16
+) -> int:
+    """Stream augmented records for ``patterns`` to ``output`` (JSONL); returns the count written."""
+    synonyms = build_synonym_table(patterns, synonym_cache)
+    tasks = iter_tasks(patterns, seed, variants, replace_prob)
+    written = 0
+
+    with open(output, "w", encoding="utf-8") as f, \
+            Pool(processes=workers or os.cpu_count(), initializer=_init_worker, initargs=(synonyms,)) as pool:
+        # imap keeps input order, which keeps the file deterministic
+        for records in pool.imap(augment_pattern, tasks, chunksize=chunksize):
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            written += len(records)
+
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Augment intents.json patterns with WordNet synonyms")
+    parser.add_argument("--intents", default=os.path.join(settings.DATA_DIR, "intents.json"))
+    parser.add_argument("--output", default=os.path.join(settings.DATA_DIR, "augmented_intents.jsonl"))
+    parser.add_argument("--variants", type=int, default=10, help="Augmented copies per pattern")
+    parser.add_argument("--replace-prob", type=float, default=0.5, help="Chance of replacing each word")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--synonym-cache", default=None, help="JSON file to reuse/persist WordNet lookups")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    patterns = load_patterns(args.intents)
+    written = augment_to_file(
+        patterns,
+        args.output,
+        variants=args.variants,
+        seed=args.seed,
+        replace_prob=args.replace_prob,
+        workers=args.workers,
+        synonym_cache=args.synonym_cache,
+    )
+    print(f"✅ Wrote {written} augmented samples from {len(patterns)} patterns to {args.output} "
+          f"in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# app/core/intent_layer/batcher.py
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.core.inference_executor import run_inference
+from app.core.intent_layer.intent_classifier import IntentClassifierService, get_intent_classifier
+from app.core.intent_layer.shadow import get_shadow_evaluator
+
+logger = logging.getLogger(__name__)
+
+
+class IntentMicroBatcher:
+    """
+    Groups intent requests that arrive within a few milliseconds of each
+    other into a single forward pass.
+
+    Concurrent /chat requests each await ``submit(text)``; a background task
+    drains the queue into batches of at most ``max_batch_size`` texts, waiting
+    no longer than ``max_wait_ms`` after the first one, and resolves every
+    caller with the same dict ``get_intent_details`` returns.
+    """
+
+    def __init__(
+            self,
+            classifier: Optional[IntentClassifierService] = None,
+            max_batch_size: Optional[int] = None,
+            max_wait_ms: Optional[float] = None
+    ):
+        self.classifier = classifier
+        self.max_batch_size = max_batch_size or settings.INTENT_BATCH_MAX_SIZE
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else settings.INTENT_BATCH_MAX_WAIT_MS) / 1000
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Simple counters for monitoring
+        self.batches = 0
+        self.requests = 0
+
+    async def submit(self, text: str) -> Dict:
+        """Queue a message for classification and wait for its result."""
+        self._ensure_worker()
+
+        future = self._loop.create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def stop(self):
+        """Cancel the background worker (e.g. on application shutdown)."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+        self._queue = None
+        self._loop = None
+
+    def get_stats(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "avg_batch_size": self.requests / self.batches if self.batches else 0.0,
+        }
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+
+        # Queue and worker are bound to one event loop; rebuild them if the
+        # caller runs on a different one (e.g. successive asyncio.run calls)
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def _collect_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect_batch()
+            texts = [text for text, _ in batch]
+
+            try:
+                classifier = self.classifier or get_intent_classifier()
+                # Forward pass runs on the inference executor, off the event loop
+                results = await run_inference("intent", classifier.get_intent_details_batch, texts)
+            except Exception as e:
+                logger.error(f"Intent batch of {len(batch)} failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.requests += len(batch)
+
+            # Candidate model (if any) re-classifies these in its own thread
+            shadow = get_shadow_evaluator()
+            if shadow is not None:
+                shadow.observe_batch(texts, results, classifier)
+
+            for (_, future), result in zip(batch, results):
+                # Caller may have been cancelled while waiting
+                if not future.done():
+                    future.set_result(result)
+
+
+# ---------------------------
+# Global Singleton Instance
+# ---------------------------
+_batcher_instance = None
+
+
+def get_intent_batcher() -> IntentMicroBatcher:
+    global _batcher_instance
+    if _batcher_instance is None:
+        _batcher_instance = IntentMicroBatcher()
+    return _batcher_instance
+
+
+async def get_intent_with_confidence_async(text: str) -> Dict:
+    """Async counterpart of ``get_intent_with_confidence`` using micro-batching."""
+    return await get_intent_batcher().submit(text)
@@ -0,0 +1,229 @@
+# app/core/intent_layer/benchmark.py
+"""
+Micro-benchmarks for the intent classification path.
+
+    python -m app.core.intent_layer.benchmark --output bench.json
+    python -m app.core.intent_layer.benchmark --baseline bench.json --tolerance 0.2
+
+Every case runs at batch sizes 1, 32 and 256 over a synthetic corpus built
+from intents.json patterns (random casing, punctuation, typos and joined
+patterns, seeded). A "call" is one batch: a single message at batch size 1,
+the batch API (``preprocess_batch``, ``predict_batch``,
+``get_intent_details_batch``) or a loop for functions without one.
+"vectorize" times the classifier's own vectorizer (``transform_batch``), so
+it tracks the featurizer the model was trained with.
+
+Reported per case and batch size: p50/p99 milliseconds per call, messages
+per second and peak traced allocation per call (tracemalloc, measured in a
+separate pass so it does not skew the timings). With ``--baseline`` the run
+fails (exit code 1) when a p50 or p99 is slower than the baseline by more
+than ``--tolerance``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import numpy as np
+from typing import Callable, Dict, List, Optional
+
+from app.config import settings
+from app.core.intent_layer.intent_classifier import IntentClassifierService
+from utils.nltk_utils import fast_tokenize, tokenize
+
+BATCH_SIZES = (1, 32, 256)
+
+PUNCTUATION = ["", "", "?", "!", ".", "!!", " ?"]
+
+
+def synthetic_corpus(intents_path: str, size: int = 2000, seed: int = 42) -> List[str]:
+    """Messages derived from intents.json patterns with realistic noise."""
+    with open(intents_path, "r", encoding="utf-8") as f:
+        patterns = [p for intent in json.load(f)["intents"] for p in intent["patterns"]]
+
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(size):
+        text = rng.choice(patterns)
+
+        roll = rng.random()
+        if roll < 0.2:
+            text = f"{text} {rng.choice(patterns)}"
+        elif roll < 0.35 and len(text) > 3:
+            i = rng.randrange(len(text) - 1)
+            text = text[:i] + text[i + 1] + text[i] + text[i + 2:]  # swapped letters
+
+        if rng.random() < 0.3:
+            text = text.lower() if rng.random() < 0.5 else text.upper()
+
+        messages.append(text + rng.choice(PUNCTUATION))
+    return messages
+
+
+def build_cases(
+        classifier: IntentClassifierService,
+        corpus: List[str]
+) -> Dict[str, Callable[[List[str]], object]]:
+    """
+    Case name -> function processing one batch of messages. "vectorize"
+    times the classifier's own vectorizer (``BagOfWordsVectorizer`` or the
+    model's featurizer) on messages tokenized up front.
+    """
+    vectorizer = classifier.vectorizer
+    tokens = {text: classifier.tokenize(text) for text in corpus}
+
+    def per_message(fn):
+        return lambda batch: [fn(text) for text in batch]
+
+    def batched(single, many):
+        return lambda batch: single(batch[0]) if len(batch) == 1 else many(batch)
+
+    return {
+        "tokenize": per_message(tokenize),
+        "fast_tokenize": per_message(fast_tokenize),
+        "vectorize": lambda batch: vectorizer.transform_batch([tokens[text] for text in batch]),
+        "preprocess": batched(classifier.preprocess, classifier.preprocess_batch),
+        "predict": batched(classifier.predict, classifier.predict_batch),
+        "get_intent_details": batched(classifier.get_intent_details, classifier.get_intent_details_batch),
+    }
+
+
+def _batches(corpus: List[str], batch_size: int, count: int, rng: random.Random) -> List[List[str]]:
+    batches = []
+    for _ in range(count):
+        start = rng.randrange(max(len(corpus) - batch_size, 1))
+        batches.append(corpus[start:start + batch_size])
+    return batches
+
+
+def run_case(fn: Callable, corpus: List[str], batch_size: int, calls: int, warmup: int, seed: int) -> Dict:
+    rng = random.Random(seed)
+    for batch in _batches(corpus, batch_size, warmup, rng):
+        fn(batch)
+
+    timings = []
+    for batch in _batches(corpus, batch_size, calls, rng):
+        started = time.perf_counter()
+        fn(batch)
+        timings.append(time.perf_counter() - started)
+
+    # Allocation pass (tracemalloc slows everything down, so it is separate)
+    peaks = []
+    tracemalloc.start()
+    for batch in _batches(corpus, batch_size, min(calls, 20), rng):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        fn(batch)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - baseline)
+    tracemalloc.stop()
+
+    timings = np.array(timings) * 1000
+    return {
+        "batch_size": batch_size,
+        "calls": calls,
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p99_ms": float(np.percentile(timings, 99)),
+        "throughput_msgs_per_s": float(batch_size * len(timings) / (timings.sum() / 1000)),
+        "peak_alloc_kib_per_call": float(np.median(peaks) / 1024),
+    }
+
+
+def run_benchmarks(
+        classifier: IntentClassifierService,
+        corpus: List[str],
+        cases: Optional[List[str]] = None,
+        batch_sizes=BATCH_SIZES,
+        budget_messages: int = 20000,
+        seed: int = 42
+) -> List[Dict]:
+    available = build_cases(classifier, corpus)
+    results = []
+    for name in cases or list(available):
+        for batch_size in batch_sizes:
+            # Roughly the same number of messages per measurement
+            calls = max(20, min(1000, budget_messages // batch_size))
+            try:
+                result = run_case(available[name], corpus, batch_size, calls, warmup=max(3, calls // 10), seed=seed)
+            except LookupError as e:
+                # NLTK data (e.g. punkt) not installed: the case cannot run here
+                print(f"⚠️ Skipping {name}: NLTK data not installed ({type(e).__name__})")
+                break
+            result["case"] = name
+            results.append(result)
+            print(f"{name:<20} batch={batch_size:<4} p50={result['p50_ms']:.4f}ms p99={result['p99_ms']:.4f}ms "
+                  f"{result['throughput_msgs_per_s']:>10.0f} msg/s {result['peak_alloc_kib_per_call']:>8.1f} KiB")
+    return results
+
+
+def compare(results: List[Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """Regressions of p50/p99 beyond ``tolerance`` relative to ``baseline``."""
+    previous = {(r["case"], r["batch_size"]): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = previous.get((result["case"], result["batch_size"]))
+        if old is None:
+            continue
+        for metric in ("p50_ms", "p99_ms"):
+            if old[metric] > 0 and result[metric] > old[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{result['case']} batch={result['batch_size']} {metric}: "
+                    f"{old[metric]:.4f} -> {result[metric]:.4f} (+{result[metric] / old[metric] - 1:.0%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the intent classification path")
+    parser.add_argument("--intents", default=os.path.join(settings.DATA_DIR, "intents.json"))
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--backend", default=None)
+    parser.add_argument("--cases", nargs="*", default=None, help="Subset of cases to run")
+    parser.add_argument("--corpus-size", type=int, default=2000)
+    parser.add_argument("--budget", type=int, default=20000, help="Approximate messages per measurement")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Write results JSON here")
+    parser.add_argument("--baseline", default=None, help="Baseline results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown vs baseline")
+    args = parser.parse_args()
+
+    classifier = IntentClassifierService(model_path=args.model, backend=args.backend)
+    corpus = synthetic_corpus(args.intents, args.corpus_size, args.seed)
+
+    results = run_benchmarks(classifier, corpus, args.cases, budget_messages=args.budget, seed=args.seed)
+    report = {
+        "meta": {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "backend": classifier.backend.name,
+            "model": classifier.backend.model_path,
+            "tokenizer": settings.INTENT_TOKENIZER,
+            "corpus_size": len(corpus),
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"❌ {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"✅ No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
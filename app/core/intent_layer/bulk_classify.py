@@ -0,0 +1,245 @@
+# app/core/intent_layer/bulk_classify.py
+"""
+Classify large message dumps offline.
+
+    python -m app.core.intent_layer.bulk_classify messages.jsonl intents_out.jsonl --workers 8
+    python -m app.core.intent_layer.bulk_classify messages.csv out.csv --text-field body --resume
+
+Input is JSONL or CSV (by extension, or ``--format``), read as a stream.
+Records are grouped into batches and classified by a process pool whose
+workers each load the model once. Only a bounded number of batches is in
+flight, and results are written in input order as they complete, so memory
+stays flat whatever the input size.
+
+After every written batch the output is synced and the number of input
+records consumed, with the output size at that point, is stored in
+``<output>.offset``. ``--resume`` truncates the output back to that size
+(dropping a partial line or a batch written after the last checkpoint) and
+continues from there; ``--offset N`` skips the first N records explicitly.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Fields added to every output record
+RESULT_FIELDS = ["intent", "confidence", "category", "category_confidence", "needs_llm_verification"]
+
+_classifier = None
+
+
+def _init_worker(model_path: Optional[str], backend: Optional[str]):
+    """Load the classifier once per worker process."""
+    global _classifier
+    from app.config import settings
+
+    # One intra-op thread per process: parallelism comes from the pool
+    # (the NumPy backend never imports torch)
+    backend = backend or settings.INTENT_BACKEND
+    if backend != "numpy":
+        import torch
+        torch.set_num_threads(1)
+
+    from app.core.intent_layer.intent_classifier import IntentClassifierService
+    _classifier = IntentClassifierService(model_path=model_path, backend=backend)
+
+
+def _classify_batch(texts: List[str]) -> List[Dict]:
+    return [
+        {field: details[field] for field in RESULT_FIELDS}
+        for details in _classifier.get_intent_details_batch(texts)
+    ]
+
+
+def detect_format(path: str, explicit: Optional[str]) -> str:
+    if explicit:
+        return explicit
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_records(path: str, fmt: str) -> Iterator[Dict]:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def batched(records: Iterator[Dict], size: int) -> Iterator[List[Dict]]:
+    while True:
+        batch = list(islice(records, size))
+        if not batch:
+            return
+        yield batch
+
+
+class ResultWriter:
+    """
+    Appends classified records to JSONL or CSV and checkpoints the input
+    offset together with the output size it corresponds to.
+    """
+
+    def __init__(self, path: str, fmt: str, offset: int, output_bytes: Optional[int] = None):
+        self.fmt = fmt
+        self.offset = offset
+        self.offset_path = f"{path}.offset"
+
+        resuming = offset > 0 and os.path.exists(path)
+        if resuming and output_bytes is not None:
+            size = os.path.getsize(path)
+            if size < output_bytes:
+                raise ValueError(f"{path} has {size} bytes, fewer than its checkpoint ({output_bytes})")
+            # Whatever follows the checkpoint was never acknowledged: a
+            # partial line, or records the resumed run writes again
+            with open(path, "r+b") as f:
+                f.truncate(output_bytes)
+
+        self.file = open(path, "a" if resuming else "w", encoding="utf-8", newline="")
+        self.csv_writer = None
+        self._csv_header_written = resuming and os.path.getsize(path) > 0
+
+    def write(self, records: List[Dict], results: List[Dict]):
+        for record, result in zip(records, results):
+            row = {**record, **result}
+            if self.fmt == "csv":
+                if self.csv_writer is None:
+                    self.csv_writer = csv.DictWriter(self.file, fieldnames=list(row), extrasaction="ignore")
+                    if not self._csv_header_written:
+                        self.csv_writer.writeheader()
+                self.csv_writer.writerow(row)
+            else:
+                self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+        # Output on disk before the checkpoint that points past it
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.offset += len(records)
+        write_checkpoint(self.offset_path, self.offset, os.fstat(self.file.fileno()).st_size)
+
+    def close(self):
+        self.file.close()
+
+
+def write_checkpoint(path: str, records: int, output_bytes: int):
+    """Replace the checkpoint atomically, so a crash leaves the old or the new one."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"records": records, "output_bytes": output_bytes}, f)
+    os.replace(tmp_path, path)
+
+
+def read_checkpoint(output: str) -> Tuple[int, Optional[int]]:
+    """(input records consumed, output size in bytes) from ``<output>.offset``; (0, None) without one."""
+    path = f"{output}.offset"
+    if not os.path.exists(path):
+        return 0, None
+    with open(path, "r", encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    return checkpoint["records"], checkpoint["output_bytes"]
+
+
+def classify_file(
+        input_path: str,
+        output_path: str,
+        text_field: str = "text",
+        input_format: Optional[str] = None,
+        output_format: Optional[str] = None,
+        batch_size: int = 256,
+        workers: Optional[int] = None,
+        offset: int = 0,
+        model_path: Optional[str] = None,
+        backend: Optional[str] = None,
+        output_bytes: Optional[int] = None
+) -> int:
+    """
+    Classify ``input_path`` into ``output_path`` starting at record
+    ``offset`` (the output is first truncated to ``output_bytes``, when
+    resuming from a checkpoint); returns records written.
+    """
+    input_format = detect_format(input_path, input_format)
+    output_format = detect_format(output_path, output_format)
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+
+    records = islice(read_records(input_path, input_format), offset, None)
+    writer = ResultWriter(output_path, output_format, offset, output_bytes)
+    pending = deque()
+    written = 0
+    started = time.perf_counter()
+
+    def drain_one():
+        nonlocal written
+        batch, future = pending.popleft()
+        writer.write(batch, future.result())
+        written += len(batch)
+        if written % (batch_size * 40) < batch_size:
+            rate = written / (time.perf_counter() - started)
+            print(f"… {writer.offset} records ({rate:.0f}/s)", file=sys.stderr)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model_path, backend)) as pool:
+            for batch in batched(records, batch_size):
+                texts = [str(record.get(text_field) or "") for record in batch]
+                pending.append((batch, pool.submit(_classify_batch, texts)))
+                # Backpressure: never read far ahead of what has been written
+                if len(pending) >= max_in_flight:
+                    drain_one()
+            while pending:
+                drain_one()
+    finally:
+        writer.close()
+
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-classify messages with the intent model")
+    parser.add_argument("input", help="JSONL or CSV file of messages")
+    parser.add_argument("output", help="JSONL or CSV file to write results to")
+    parser.add_argument("--text-field", default="text", help="Field/column holding the message")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None, help="Input format (default: by extension)")
+    parser.add_argument("--output-format", choices=["jsonl", "csv"], default=None)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--backend", default=None)
+    parser.add_argument("--offset", type=int, default=None, help="Skip this many input records")
+    parser.add_argument("--resume", action="store_true", help="Continue from <output>.offset")
+    args = parser.parse_args()
+
+    offset, output_bytes = 0, None
+    if args.offset is not None:
+        offset = args.offset
+    elif args.resume:
+        offset, output_bytes = read_checkpoint(args.output)
+
+    started = time.perf_counter()
+    written = classify_file(
+        args.input,
+        args.output,
+        text_field=args.text_field,
+        input_format=args.format,
+        output_format=args.output_format,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        offset=offset,
+        model_path=args.model,
+        backend=args.backend,
+        output_bytes=output_bytes,
+    )
+    elapsed = time.perf_counter() - started
+    print(f"✅ Classified {written} records (from offset {offset}) in {elapsed:.1f}s "
+          f"({written / elapsed if elapsed else 0:.0f}/s) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+# app/core/intent_layer/calibration.py
+"""
+Offline confidence calibration for the intent classifier.
+
+Fits a softmax temperature and per-tag confidence thresholds on the
+samples training held out (``train_intent --holdout``, stored in the model
+artifact) plus optional labeled traffic, and writes them next
+to the model as ``<model>.calibration.json`` (``intent_model.calibration.json``
+for both ``intent_model.pth`` and its exported ``intent_model.npz``):
+
+    python -m app.core.intent_layer.train_intent --holdout 0.2
+    python -m app.core.intent_layer.calibration --target-accuracy 0.95 \
+        --traffic data/labeled_traffic.jsonl
+
+Labeled traffic is JSONL with one ``{"text": ..., "tag": ...}`` per line.
+IntentClassifierService picks the file up automatically on load.
+"""
+
+import argparse
+import json
+import os
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from app.core.intent_layer.numpy_backend import softmax
+
+CALIBRATION_SUFFIX = ".calibration.json"
+
+
+def calibration_path_for(model_path: str) -> str:
+    """
+    Calibration file of one model: every model in the folder (bow, hashed,
+    vocab, registry versions, shadow candidates) keeps its own.
+    """
+    return os.path.splitext(model_path)[0] + CALIBRATION_SUFFIX
+
+
+def load_calibration(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def apply_temperature(probs: np.ndarray, temperature: float) -> np.ndarray:
+    """Rescale softmax outputs as if the logits had been divided by ``temperature``."""
+    if temperature == 1.0:
+        return probs
+    logits = np.log(np.clip(probs, 1e-12, None)) / temperature
+    return softmax(logits).astype(np.float32)
+
+
+def fit_temperature(probs: np.ndarray, labels: np.ndarray) -> float:
+    """
+    Temperature minimizing the negative log-likelihood of the true tags.
+
+    The search is bounded to [0.5, 5]: on samples the model has memorized
+    (e.g. patterns it was trained on) the likelihood keeps improving as the
+    temperature goes to zero, which would make every prediction look certain.
+    """
+    candidates = np.linspace(0.5, 5.0, 181)
+    rows = np.arange(len(labels))
+
+    def nll(temperature: float) -> float:
+        scaled = apply_temperature(probs, temperature)
+        return float(-np.log(np.clip(scaled[rows, labels], 1e-12, None)).mean())
+
+    losses = [nll(t) for t in candidates]
+    return float(candidates[int(np.argmin(losses))])
+
+
+def fit_thresholds(
+        confidences: np.ndarray,
+        predicted_tags: List[str],
+        correct: np.ndarray,
+        target_accuracy: float,
+        min_samples: int,
+        floor: float,
+        default: float
+) -> Dict[str, float]:
+    """
+    Lowest threshold per predicted tag whose accepted predictions still reach
+    ``target_accuracy``, never stricter than ``default`` when the tag made no
+    mistakes. Tags with fewer than ``min_samples`` held-out predictions are
+    left out (the global threshold applies to them).
+    """
+    thresholds = {}
+    predicted_tags = np.array(predicted_tags)
+
+    for tag in np.unique(predicted_tags):
+        mask = predicted_tags == tag
+        if mask.sum() < min_samples:
+            continue
+
+        conf, ok = confidences[mask], correct[mask]
+        if ok.mean() >= target_accuracy:
+            # Every held-out prediction can be accepted: no evidence for a
+            # stricter cut than the global one
+            threshold = min(float(conf.min()), default)
+        else:
+            threshold = 1.0  # never trust this tag without verification
+            for candidate in np.unique(conf):
+                accepted = conf >= candidate
+                if ok[accepted].mean() >= target_accuracy:
+                    threshold = float(candidate)
+                    break
+
+        # Round down so the fitted boundary sample is still accepted
+        thresholds[str(tag)] = float(np.floor(max(threshold, floor) * 1e4) / 1e4)
+
+    return thresholds
+
+
+def load_holdout(model_path: str) -> Optional[List[Tuple[str, str]]]:
+    """
+    The (text, tag) pairs train_intent held out of ``model_path`` (a .pth
+    artifact or its exported .npz), or None if it trained on every sample.
+    """
+    if model_path.endswith(".npz"):
+        with np.load(model_path, allow_pickle=False) as data:
+            record = json.loads(str(data["holdout"])) if "holdout" in data.files else None
+    else:
+        import torch
+        record = torch.load(model_path, map_location="cpu").get("holdout")
+
+    if not record:
+        return None
+    return [(text, tag) for text, tag in record["samples"]]
+
+
+def load_labeled_traffic(path: str) -> List[Tuple[str, str]]:
+    samples = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                samples.append((record["text"], record["tag"]))
+    return samples
+
+
+def calibrate(
+        classifier,
+        samples: List[Tuple[str, str]],
+        target_accuracy: float = 0.95,
+        min_samples: int = 3,
+        floor: float = 0.3
+) -> Dict:
+    """
+    Fit temperature and per-tag thresholds for ``classifier`` on ``samples``
+    and estimate how many LLM verification calls they save.
+    """
+    tag_index = {tag: i for i, tag in enumerate(classifier.tags)}
+    samples = [(text, tag) for text, tag in samples if tag in tag_index]
+    if not samples:
+        raise ValueError("No calibration samples with tags known to the model")
+
+    texts = [text for text, _ in samples]
+    labels = np.array([tag_index[tag] for _, tag in samples])
+
+    # Raw model probabilities (bypassing any calibration already loaded)
+    raw = classifier.backend.predict_proba(classifier.preprocess_batch(texts))
+    temperature = fit_temperature(raw, labels)
+    calibrated = apply_temperature(raw, temperature)
+
+    router = classifier.router
+    true_categories = np.array([
+        router.categories.index(router.route_tag(classifier.tags[label])) for label in labels
+    ])
+
+    def category_view(probs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        category_probs = router.category_proba(probs)
+        return category_probs.max(axis=1), category_probs.argmax(axis=1) == true_categories
+
+    raw_conf, raw_correct = category_view(raw)
+    cal_conf, cal_correct = category_view(calibrated)
+    predicted_tags = [classifier.tags[i] for i in calibrated.argmax(axis=1)]
+
+    default = classifier.CONFIDENCE_THRESHOLD
+    thresholds = fit_thresholds(cal_conf, predicted_tags, cal_correct, target_accuracy, min_samples, floor, default)
+    per_sample = np.array([thresholds.get(tag, default) for tag in predicted_tags])
+
+    baseline_accept = raw_conf >= default
+    calibrated_accept = cal_conf >= per_sample
+
+    def accuracy(correct: np.ndarray, accepted: np.ndarray) -> Optional[float]:
+        return float(correct[accepted].mean()) if accepted.any() else None
+
+    baseline_rate = float(1 - baseline_accept.mean())
+    calibrated_rate = float(1 - calibrated_accept.mean())
+
+    return {
+        "temperature": temperature,
+        "thresholds": thresholds,
+        "default_threshold": default,
+        "target_accuracy": target_accuracy,
+        "report": {
+            "samples": len(samples),
+            "baseline_verification_rate": baseline_rate,
+            "calibrated_verification_rate": calibrated_rate,
+            "verification_calls_saved": (
+                (baseline_rate - calibrated_rate) / baseline_rate if baseline_rate else 0.0
+            ),
+            "baseline_accepted_accuracy": accuracy(raw_correct, baseline_accept),
+            "calibrated_accepted_accuracy": accuracy(cal_correct, calibrated_accept),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate intent classifier confidence thresholds")
+    parser.add_argument("--model", default=None, help="Model path (default: backend's default model)")
+    parser.add_argument("--backend", default=None, help="torch or numpy (default: INTENT_BACKEND)")
+    parser.add_argument("--traffic", default=None, help="Labeled traffic JSONL ({text, tag} per line)")
+    parser.add_argument("--target-accuracy", type=float, default=0.95)
+    parser.add_argument("--min-samples", type=int, default=3, help="Minimum samples to fit a tag threshold")
+    parser.add_argument("--output", default=None, help="Output path (default: next to the model)")
+    args = parser.parse_args()
+
+    from app.core.intent_layer.intent_classifier import IntentClassifierService
+
+    classifier = IntentClassifierService(model_path=args.model, backend=args.backend)
+
+    # Only samples the model never trained on: thresholds fitted on training
+    # patterns would be overconfident
+    samples = load_holdout(classifier.backend.model_path) or []
+    if args.traffic:
+        samples += load_labeled_traffic(args.traffic)
+    if not samples:
+        parser.error(
+            "the model holds out no samples: retrain it with train_intent --holdout 0.2, "
+            "or pass labeled --traffic"
+        )
+
+    result = calibrate(classifier, samples, args.target_accuracy, args.min_samples)
+
+    output = args.output or calibration_path_for(classifier.backend.model_path)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+
+    report = result["report"]
+    print(f"✅ Calibration written to {output}")
+    print(f"   Temperature: {result['temperature']:.3f} | per-tag thresholds: {len(result['thresholds'])}")
+    print(
+        f"   LLM verification rate: {report['baseline_verification_rate']:.1%} -> "
+        f"{report['calibrated_verification_rate']:.1%} "
+        f"({report['verification_calls_saved']:.1%} fewer calls at target accuracy {args.target_accuracy:.0%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
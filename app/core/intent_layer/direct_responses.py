@@ -0,0 +1,83 @@
+# app/core/intent_layer/direct_responses.py
+import json
+import os
+import random
+from typing import Dict, List, Optional
+
+from app.config import settings
+
+# intents.json categories that can be answered straight from their canned responses
+DIRECT_CATEGORIES = {"greeting", "goodbye", "small_talk", "jokes"}
+
+# Language hints (detector codes or intents.json names) -> intents.json "language"
+LANGUAGE_NAMES = {
+    "en": "English",
+    "english": "English",
+    "sw": "Swahili",
+    "swahili": "Swahili",
+    "sheng": "Swahili",
+}
+
+
+class DirectResponder:
+    """
+    Answers small talk (greetings, goodbyes, thanks, jokes) from the
+    ``responses`` in intents.json without calling an LLM.
+
+    The response table is loaded once. Tags are already language specific
+    (``greeting_en`` / ``greeting_sw``), so by default the reply is in the
+    language the classifier recognised; an explicit language hint switches
+    to the sibling tag of the same category.
+    """
+
+    def __init__(self, intents_path: Optional[str] = None, min_confidence: Optional[float] = None):
+        intents_path = intents_path or os.path.join(settings.DATA_DIR, "intents.json")
+        self.min_confidence = (
+            min_confidence if min_confidence is not None else settings.DIRECT_RESPONSE_MIN_CONFIDENCE
+        )
+
+        with open(intents_path, "r", encoding="utf-8") as f:
+            intents = json.load(f)["intents"]
+
+        # tag -> responses, and (category, language) -> tag
+        self.responses: Dict[str, List[str]] = {}
+        self.tag_categories: Dict[str, str] = {}
+        self.by_language: Dict[tuple, str] = {}
+
+        for intent in intents:
+            category = intent.get("category")
+            responses = [r for r in intent.get("responses", []) if "{" not in r]
+
+            if category not in DIRECT_CATEGORIES or not responses:
+                continue
+
+            self.responses[intent["tag"]] = responses
+            self.tag_categories[intent["tag"]] = category
+            self.by_language[(category, intent.get("language"))] = intent["tag"]
+
+    def can_answer(self, tag: str, confidence: float) -> bool:
+        return tag in self.responses and confidence >= self.min_confidence
+
+    def respond(self, tag: str, language: Optional[str] = None) -> Optional[str]:
+        """Pick a canned response for ``tag``, optionally in another language."""
+        if tag not in self.responses:
+            return None
+
+        if language:
+            language_name = LANGUAGE_NAMES.get(language.lower(), language)
+            tag = self.by_language.get((self.tag_categories[tag], language_name), tag)
+
+        return random.choice(self.responses[tag])
+
+
+# ---------------------------
+# Global Singleton Instance
+# ---------------------------
+_responder_instance = None
+
+
+def get_direct_responder() -> DirectResponder:
+    global _responder_instance
+    if _responder_instance is None:
+        _responder_instance = DirectResponder()
+    return _responder_instance
@@ -0,0 +1,138 @@
+# app/core/intent_layer/feature_benchmark.py
+"""
+Compare intent feature modes (dense BOW vs hashed n-gram and vocab.json
+EmbeddingBag models) on the same train/held-out split:
+
+    python -m app.core.intent_layer.feature_benchmark --holdout 0.3 \
+        --extra data/augmented_intents.jsonl --json benchmark.json
+
+For each mode it reports held-out accuracy (overall and on messages with
+words the BOW vocabulary has never seen), parameter count, artifact size and
+featurize+forward latency per message at batch sizes 1 and 256.
+"""
+
+import argparse
+import io
+import json
+import os
+import time
+import numpy as np
+import torch
+from typing import Dict, List, Tuple
+
+from app.config import settings
+from app.core.intent_layer.train_intent import (
+    FEATURE_MODES, build_featurizer, build_model, build_vocabulary, encode, load_samples, set_seed,
+    split_holdout, train,
+)
+from utils.nltk_utils import IGNORE_WORDS, fast_tokenize, stem
+
+
+def has_oov(text: str, vocabulary: set) -> bool:
+    return any(stem(token) not in vocabulary for token in fast_tokenize(text) if token not in IGNORE_WORDS)
+
+
+def latency_ms(featurizer, model, texts: List[str], batch_size: int, repeats: int = 5) -> float:
+    """Mean milliseconds per message to tokenize, featurize and classify."""
+    batch = (texts * (batch_size // max(len(texts), 1) + 1))[:batch_size]
+    timings = []
+    with torch.no_grad():
+        for _ in range(repeats):
+            started = time.perf_counter()
+            X = featurizer.transform_batch([fast_tokenize(text) for text in batch])
+            torch.softmax(model(torch.from_numpy(X)), dim=1)
+            timings.append(time.perf_counter() - started)
+    return float(np.median(timings)) * 1000 / batch_size
+
+
+def benchmark_mode(
+        features: str,
+        train_samples: List[Tuple[str, str]],
+        test_samples: List[Tuple[str, str]],
+        tags: List[str],
+        oov_mask: np.ndarray,
+        args
+) -> Dict:
+    featurizer = build_featurizer(features, train_samples, args.num_buckets, args.vocab, args.extend_vocab)
+    X_train, y_train = encode(featurizer, train_samples, tags)
+    X_test, y_test = encode(featurizer, test_samples, tags)
+
+    set_seed(args.seed)
+    model = build_model(featurizer, len(tags), args.hidden_size, args.embed_dim)
+    learning_rate = args.learning_rate if features == "bow" else args.embedding_learning_rate
+    model, metrics = train(
+        X_train, y_train, model,
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        learning_rate=learning_rate,
+        seed=args.seed,
+    )
+
+    with torch.no_grad():
+        correct = (model(torch.from_numpy(X_test)).argmax(dim=1).numpy() == y_test)
+
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+
+    texts = [text for text, _ in test_samples]
+    return {
+        "features": features,
+        "feature_space": featurizer.size,
+        "parameters": sum(param.numel() for param in model.parameters()),
+        "artifact_bytes": buffer.getbuffer().nbytes,
+        "train_accuracy": metrics["train_accuracy"],
+        "holdout_accuracy": float(correct.mean()),
+        "holdout_oov_accuracy": float(correct[oov_mask].mean()) if oov_mask.any() else None,
+        "train_seconds": metrics["duration_seconds"],
+        "latency_ms_batch_1": latency_ms(featurizer, model, texts, 1),
+        "latency_ms_batch_256": latency_ms(featurizer, model, texts, 256),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark BOW, hashed n-gram and vocab intent features")
+    parser.add_argument("--intents", default=os.path.join(settings.DATA_DIR, "intents.json"))
+    parser.add_argument("--extra", action="append", default=[], help="Extra JSONL samples ({text, tag} per line)")
+    parser.add_argument("--holdout", type=float, default=0.3)
+    parser.add_argument("--epochs", type=int, default=300)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--hidden-size", type=int, default=8)
+    parser.add_argument("--embed-dim", type=int, default=32)
+    parser.add_argument("--num-buckets", type=int, default=2 ** 15)
+    parser.add_argument("--learning-rate", type=float, default=0.001)
+    parser.add_argument("--embedding-learning-rate", type=float, default=0.01, help="Learning rate for EmbeddingBag models")
+    parser.add_argument("--vocab", default=os.path.join(settings.DATA_DIR, "vocab.json"))
+    parser.add_argument("--extend-vocab", action="store_true", help="Append unseen training words to the vocab")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", default=None, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    samples = load_samples(args.intents, args.extra)
+    tags = sorted({tag for _, tag in samples})
+    train_idx, test_idx = split_holdout(len(samples), args.holdout, args.seed)
+    train_samples = [samples[i] for i in train_idx]
+    test_samples = [samples[i] for i in test_idx]
+
+    vocabulary = set(build_vocabulary(train_samples))
+    oov_mask = np.array([has_oov(text, vocabulary) for text, _ in test_samples], dtype=bool)
+
+    results = [
+        benchmark_mode(features, train_samples, test_samples, tags, oov_mask, args)
+        for features in FEATURE_MODES
+    ]
+
+    print(f"\n{len(train_samples)} train / {len(test_samples)} held-out samples "
+          f"({int(oov_mask.sum())} held-out with out-of-vocabulary words)")
+    print(f"{'features':<8} {'params':>9} {'bytes':>9} {'acc':>6} {'oov acc':>8} {'ms@1':>7} {'ms@256':>7}")
+    for r in results:
+        oov = f"{r['holdout_oov_accuracy']:.3f}" if r["holdout_oov_accuracy"] is not None else "-"
+        print(f"{r['features']:<8} {r['parameters']:>9} {r['artifact_bytes']:>9} {r['holdout_accuracy']:>6.3f} "
+              f"{oov:>8} {r['latency_ms_batch_1']:>7.3f} {r['latency_ms_batch_256']:>7.4f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"samples": len(samples), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
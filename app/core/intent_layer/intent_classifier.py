@@ -1,129 +1,180 @@
-import torch
 import os
-import torch.nn as nn
-from typing import Dict, Tuple
+import numpy as np
+from typing import Dict, List, Tuple
 from app.config import settings
-from utils.nltk_utils import tokenize, bag_of_words
+from app.core.intent_layer.intent_routing import IntentCategoryRouter
+from app.core.intent_layer.calibration import apply_temperature, calibration_path_for, load_calibration
+from utils.nltk_utils import tokenize, fast_tokenize, BagOfWordsVectorizer
 
 
-class NeuralNet(nn.Module):
-    """Simple feedforward neural network for intent classification."""
+# Default model file per backend, inside settings.MODEL_DIR
+DEFAULT_MODEL_FILES = {
+    "torch": "intent_model.pth",
+    "numpy": "intent_model.npz",
+    "hashed": "intent_model_hashed.pth",
+    "vocab": "intent_model_vocab.pth",
+}
 
-    def __init__(self, input_size, hidden_size, num_classes):
-        super(NeuralNet, self).__init__()
-        self.l1 = nn.Linear(input_size, hidden_size)
-        self.l2 = nn.Linear(hidden_size, hidden_size)
-        self.l3 = nn.Linear(hidden_size, num_classes)
-        self.relu = nn.ReLU()
-        self.dropout = nn.Dropout(0.2)
 
-    def forward(self, x):
-        out = self.l1(x)
-        out = self.relu(out)
-        out = self.dropout(out)
-        out = self.l2(out)
-        out = self.relu(out)
-        out = self.dropout(out)
-        out = self.l3(out)
-        return out
+def default_model_path(backend: str = None) -> str:
+    backend = backend or settings.INTENT_BACKEND
+    if backend not in DEFAULT_MODEL_FILES:
+        raise ValueError(f"Unknown intent backend '{backend}'. Available: {list(DEFAULT_MODEL_FILES)}")
+    return os.path.join(settings.MODEL_DIR, DEFAULT_MODEL_FILES[backend])
+
+
+def load_intent_backend(backend: str = None, model_path: str = None):
+    """
+    Load the inference backend for the intent NeuralNet.
+
+    - "torch": original ``intent_model.pth`` run by PyTorch
+    - "numpy": exported ``intent_model.npz`` run by NumPy (torch is never imported)
+    - "hashed": EmbeddingBag model over hashed word/char n-grams (``intent_model_hashed.pth``)
+    - "vocab": EmbeddingBag model over ``vocab.json`` token ids (``intent_model_vocab.pth``)
+    """
+    backend = backend or settings.INTENT_BACKEND
+    model_path = model_path or default_model_path(backend)
+
+    if backend == "numpy":
+        from app.core.intent_layer.numpy_backend import NumpyIntentBackend
+        return NumpyIntentBackend(model_path)
+
+    if backend == "torch":
+        from app.core.intent_layer.torch_backend import TorchIntentBackend
+        return TorchIntentBackend(model_path)
+
+    # "hashed" and "vocab" artifacts carry their own featurizer config
+    from app.core.intent_layer.torch_backend import EmbeddingBagIntentBackend
+    return EmbeddingBagIntentBackend(model_path)
 
 
 class IntentClassifierService:
     """
     Updated Intent Classifier:
-    - Uses the ORIGINAL PyTorch NeuralNet (feedforward model)
+    - Uses the ORIGINAL feedforward NeuralNet (PyTorch or NumPy backend)
     - Returns the NEW standardized output structure
     """
 
     CONFIDENCE_THRESHOLD = 0.65  # same as your new classifier
 
-    def __init__(self, model_path: str = None):
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-
+    def __init__(
+            self,
+            model_path: str = None,
+            tokenizer: str = None,
+            backend: str = None,
+            calibration_path: str = None
+    ):
         # ---------------------------
         # Load trained original model
         # ---------------------------
-        model_path = model_path or os.path.join(settings.MODEL_DIR, "intent_model.pth")
+        self.backend = load_intent_backend(backend, model_path)
 
-        if not os.path.exists(model_path):
-            raise FileNotFoundError(f"❌ Intent model not found at {model_path}")
+        self.input_size = self.backend.input_size
+        self.hidden_size = self.backend.hidden_size
+        self.output_size = self.backend.output_size
+        self.all_words = self.backend.all_words
+        self.tags = self.backend.tags
 
-        data = torch.load(model_path, map_location=self.device)
+        # Word -> column index built once from the model vocabulary, unless
+        # the model brings its own featurizer (hashed n-grams, vocab.json ids)
+        self.vectorizer = getattr(self.backend, "featurizer", None) or BagOfWordsVectorizer(self.all_words)
 
-        self.input_size = data["input_size"]
-        self.hidden_size = data["hidden_size"]
-        self.output_size = data["output_size"]
-        self.all_words = data["all_words"]
-        self.tags = data["tags"]
+        # Regex tokenizer matches nltk.word_tokenize, so no retraining needed
+        tokenizer = tokenizer or settings.INTENT_TOKENIZER
+        self.tokenize = fast_tokenize if tokenizer == "fast" else tokenize
 
-        # Build feed-forward neural network (original model)
-        self.model = NeuralNet(self.input_size, self.hidden_size, self.output_size).to(self.device)
-        self.model.load_state_dict(data["model_state"])
-        self.model.eval()
+        # Tag -> handler category table (booking_request_en -> booking, ...)
+        self.router = IntentCategoryRouter(self.tags)
 
-        print(f"✅ Loaded intent model with {len(self.tags)} intents")
+        # Optional temperature + per-tag thresholds written by calibration.py
+        calibration = load_calibration(calibration_path or calibration_path_for(self.backend.model_path)) or {}
+        self.temperature = calibration.get("temperature", 1.0)
+        self.thresholds = calibration.get("thresholds", {})
+
+        print(f"✅ Loaded intent model with {len(self.tags)} intents ({self.backend.name} backend)")
 
     # --------------------------------------------------------
     # Preprocess input text using original tokenization + BOW
     # --------------------------------------------------------
-    def preprocess(self, text: str):
-        tokens = tokenize(text)
-        bow = bag_of_words(tokens, self.all_words)
-        bow = bow.reshape(1, bow.shape[0])
-        return torch.from_numpy(bow).to(self.device)
+    def preprocess(self, text: str) -> np.ndarray:
+        return self.preprocess_batch([text])
+
+    def preprocess_batch(self, texts: List[str]) -> np.ndarray:
+        return self.vectorizer.transform_batch([self.tokenize(text) for text in texts])
 
     # --------------------------------------------------------
     # Predict intent using original model
     # --------------------------------------------------------
-    def predict(self, text: str) -> Tuple[str, float, Dict]:
-        X = self.preprocess(text)
-
-        with torch.no_grad():
-            output = self.model(X)
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        """Class probabilities for a batch of texts in one forward pass."""
+        probs = self.backend.predict_proba(self.preprocess_batch(texts))
+        return apply_temperature(probs, self.temperature)
 
-            probs = torch.softmax(output, dim=1)
-            conf, predicted = torch.max(probs, dim=1)
+    def predict_batch(self, texts: List[str]) -> List[Tuple[str, float, Dict]]:
+        if not texts:
+            return []
+        return self._rank_tags(self.predict_proba(texts))
 
-            intent = self.tags[predicted.item()]
-            confidence_score = conf.item()
+    def _rank_tags(self, probs: np.ndarray) -> List[Tuple[str, float, Dict]]:
+        predicted = probs.argmax(axis=1).tolist()
 
+        results = []
+        for idx, row in zip(predicted, probs.tolist()):
             # Build probability dict for all intents
-            all_probs = {
-                self.tags[i]: probs[0][i].item()
-                for i in range(len(self.tags))
-            }
+            all_probs = dict(zip(self.tags, row))
+            results.append((self.tags[idx], row[idx], all_probs))
+
+        return results
 
-            return intent, confidence_score, all_probs
+    def predict(self, text: str) -> Tuple[str, float, Dict]:
+        return self.predict_batch([text])[0]
 
-    def is_high_confidence(self, conf: float) -> bool:
-        return conf >= self.CONFIDENCE_THRESHOLD
+    def is_high_confidence(self, conf: float, intent: str = None) -> bool:
+        # Calibrated per-tag threshold when available, global one otherwise
+        return conf >= self.thresholds.get(intent, self.CONFIDENCE_THRESHOLD)
 
     # --------------------------------------------------------
     # The required unified details
     # --------------------------------------------------------
-    def get_intent_details(self, text: str) -> Dict:
-        intent, confidence, probabilities = self.predict(text)
+    # Confidence is judged on the handler category: probabilities of all
+    # tags routed to the same category (e.g. booking_info_en/_sw,
+    # booking_request_en/_sw) are summed before thresholding.
+    def _build_details(self, tag_result: Tuple, category_result: Tuple) -> Dict:
+        intent, confidence, probabilities = tag_result
+        category, category_confidence, category_probabilities = category_result
 
         return {
             "intent": intent,
             "confidence": confidence,
-            "high_confidence": self.is_high_confidence(confidence),
+            "category": category,
+            "category_confidence": category_confidence,
+            "high_confidence": self.is_high_confidence(category_confidence, intent),
             "all_probabilities": probabilities,
-            "needs_llm_verification": not self.is_high_confidence(confidence)
+            "category_probabilities": category_probabilities,
+            "needs_llm_verification": not self.is_high_confidence(category_confidence, intent)
         }
 
+    def get_intent_details(self, text: str) -> Dict:
+        return self.get_intent_details_batch([text])[0]
 
-# ---------------------------
-# Global Singleton Instance
-# ---------------------------
-_classifier_instance = None
+    def get_intent_details_batch(self, texts: List[str]) -> List[Dict]:
+        if not texts:
+            return []
+
+        probs = self.predict_proba(texts)
+        return [
+            self._build_details(tag_result, category_result)
+            for tag_result, category_result in zip(self._rank_tags(probs), self.router.route_batch(probs))
+        ]
 
 
+# ---------------------------
+# Global Instance
+# ---------------------------
 def get_intent_classifier() -> IntentClassifierService:
-    global _classifier_instance
-    if _classifier_instance is None:
-        _classifier_instance = IntentClassifierService()
-    return _classifier_instance
+    """Currently active classifier; hot-swappable through the model registry."""
+    from app.core.intent_layer.model_registry import get_model_registry
+    return get_model_registry().active
 
 
 def get_intent(text: str) -> str:
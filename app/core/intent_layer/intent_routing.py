@@ -0,0 +1,95 @@
+# app/core/intent_layer/intent_routing.py
+import json
+import os
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+
+# Orchestrator handler categories
+ROUTE_CATEGORIES = ["faq", "booking", "payment", "weather", "general"]
+
+# intents.json "category" -> orchestrator handler category
+CATEGORY_ROUTES = {
+    "booking": "booking",
+    "payments": "payment",
+    "account": "payment",
+    "weather": "weather",
+    "products": "faq",
+    "traveling": "faq",
+    "datetime": "faq",
+    "greeting": "general",
+    "goodbye": "general",
+    "small_talk": "general",
+    "jokes": "general",
+    "otp": "general",
+}
+
+# Tags routed differently from the rest of their category: questions
+# about payments, transfers and recoveries are answered from the FAQ
+# instead of starting a send-money flow
+TAG_ROUTES = {
+    "payments_en": "faq",
+    "payments_sw": "faq",
+    "transfer_info_en": "faq",
+    "transfer_info_sw": "faq",
+    "recover_info_en": "faq",
+    "recover_info_sw": "faq",
+}
+
+DEFAULT_ROUTE = "general"
+
+
+def route_for(tag: str, category: Optional[str]) -> str:
+    """Handler category of an intents.json tag (per-tag override, else its category's route)."""
+    return TAG_ROUTES.get(tag) or CATEGORY_ROUTES.get(category, DEFAULT_ROUTE)
+
+
+def load_tag_categories(intents_path: Optional[str] = None) -> Dict[str, str]:
+    """Read the tag -> category mapping from intents.json."""
+    intents_path = intents_path or os.path.join(settings.DATA_DIR, "intents.json")
+
+    with open(intents_path, "r", encoding="utf-8") as f:
+        intents = json.load(f)["intents"]
+
+    return {intent["tag"]: intent.get("category", "") for intent in intents}
+
+
+class IntentCategoryRouter:
+    """
+    Maps the fine-grained classifier tags (e.g. ``booking_request_en``,
+    ``payments_sw``) onto the orchestrator's handler categories.
+
+    The mapping is precomputed as a (num_tags, num_categories) 0/1 matrix,
+    so summing tag probabilities per category is a single matmul for a
+    whole batch.
+    """
+
+    def __init__(self, tags: List[str], intents_path: Optional[str] = None):
+        self.tags = list(tags)
+        self.categories = list(ROUTE_CATEGORIES)
+
+        tag_categories = load_tag_categories(intents_path)
+        self.tag_routes = {tag: route_for(tag, tag_categories.get(tag)) for tag in self.tags}
+
+        column = {category: i for i, category in enumerate(self.categories)}
+        self.matrix = np.zeros((len(self.tags), len(self.categories)), dtype=np.float32)
+        for row, tag in enumerate(self.tags):
+            self.matrix[row, column[self.tag_routes[tag]]] = 1
+
+    def route_tag(self, tag: str) -> str:
+        return self.tag_routes.get(tag, DEFAULT_ROUTE)
+
+    def category_proba(self, probs: np.ndarray) -> np.ndarray:
+        """Sum (batch, num_tags) tag probabilities into (batch, num_categories)."""
+        return probs @ self.matrix
+
+    def route_batch(self, probs: np.ndarray) -> List[Tuple[str, float, Dict]]:
+        """(category, confidence, category probabilities) for each row."""
+        category_probs = self.category_proba(probs)
+        predicted = category_probs.argmax(axis=1).tolist()
+
+        return [
+            (self.categories[idx], row[idx], dict(zip(self.categories, row)))
+            for idx, row in zip(predicted, category_probs.tolist())
+        ]
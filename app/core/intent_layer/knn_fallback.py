@@ -0,0 +1,120 @@
+# app/core/intent_layer/knn_fallback.py
+import json
+import logging
+import os
+import threading
+import numpy as np
+from typing import Dict, Optional
+
+from app.config import settings
+from app.core.intent_layer.intent_routing import ROUTE_CATEGORIES, route_for
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class EmbeddingIntentFallback:
+    """
+    Second-stage intent classifier for messages the BOW model is unsure about.
+
+    All ``patterns`` from intents.json are embedded once with the shared
+    MiniLM model into a row-normalized matrix. A query is classified by
+    similarity-weighted voting of its k nearest patterns, cross-checked
+    against the nearest category centroid. Only when both agree (and the
+    best match is similar enough) is the result trusted; otherwise the
+    caller falls back to LLM verification.
+    """
+
+    def __init__(
+            self,
+            embeddings=None,
+            intents_path: Optional[str] = None,
+            k: Optional[int] = None,
+            min_confidence: Optional[float] = None,
+            min_similarity: Optional[float] = None
+    ):
+        if embeddings is None:
+            from app.vectorstore.initialize_store import get_shared_embedding
+            embeddings = get_shared_embedding()
+
+        self.embeddings = embeddings
+        self.k = k or settings.INTENT_KNN_K
+        self.min_confidence = min_confidence if min_confidence is not None else settings.INTENT_KNN_MIN_CONFIDENCE
+        self.min_similarity = min_similarity if min_similarity is not None else settings.INTENT_KNN_MIN_SIMILARITY
+        self.categories = list(ROUTE_CATEGORIES)
+
+        intents_path = intents_path or os.path.join(settings.DATA_DIR, "intents.json")
+        with open(intents_path, "r", encoding="utf-8") as f:
+            intents = json.load(f)["intents"]
+
+        patterns, tags, labels = [], [], []
+        column = {category: i for i, category in enumerate(self.categories)}
+        for intent in intents:
+            route = route_for(intent["tag"], intent.get("category"))
+            for pattern in intent["patterns"]:
+                patterns.append(pattern)
+                tags.append(intent["tag"])
+                labels.append(column[route])
+
+        self.tags = tags
+        self.labels = np.array(labels, dtype=np.int64)
+
+        # (num_patterns, dim) unit vectors, embedded in one batch
+        self.matrix = _normalize(np.asarray(embeddings.embed_documents(patterns), dtype=np.float32))
+
+        # Normalized mean embedding per category (zero rows for unused categories)
+        centroids = np.zeros((len(self.categories), self.matrix.shape[1]), dtype=np.float32)
+        np.add.at(centroids, self.labels, self.matrix)
+        self.centroids = _normalize(centroids)
+
+        logger.info(f"Embedded {len(patterns)} intent patterns for kNN fallback")
+
+    def classify(self, text: str) -> Dict:
+        query = _normalize(np.asarray(self.embeddings.embed_query(text), dtype=np.float32))
+        similarities = self.matrix @ query
+
+        k = min(self.k, len(similarities))
+        nearest = np.argpartition(-similarities, k - 1)[:k]
+        weights = np.clip(similarities[nearest], 0, None)
+
+        votes = np.bincount(self.labels[nearest], weights=weights, minlength=len(self.categories))
+        total = votes.sum()
+        knn_idx = int(votes.argmax())
+        confidence = float(votes[knn_idx] / total) if total > 0 else 0.0
+
+        centroid_idx = int((self.centroids @ query).argmax())
+        best = int(nearest[similarities[nearest].argmax()])
+        top_similarity = float(similarities[best])
+
+        return {
+            "intent": self.categories[knn_idx],
+            "confidence": confidence,
+            "nearest_tag": self.tags[best],
+            "top_similarity": top_similarity,
+            "centroid_intent": self.categories[centroid_idx],
+            "confident": (
+                confidence >= self.min_confidence
+                and top_similarity >= self.min_similarity
+                and centroid_idx == knn_idx
+            ),
+        }
+
+
+# ---------------------------
+# Global Singleton Instance
+# ---------------------------
+_fallback_instance = None
+_fallback_lock = threading.Lock()
+
+
+def get_intent_fallback() -> EmbeddingIntentFallback:
+    global _fallback_instance
+    if _fallback_instance is None:
+        with _fallback_lock:
+            if _fallback_instance is None:
+                _fallback_instance = EmbeddingIntentFallback()
+    return _fallback_instance
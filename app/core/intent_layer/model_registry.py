@@ -0,0 +1,224 @@
+# app/core/intent_layer/model_registry.py
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.core.intent_layer.calibration import calibration_path_for
+from app.core.intent_layer.intent_classifier import IntentClassifierService, default_model_path
+
+logger = logging.getLogger(__name__)
+
+
+def _fingerprint(path: str) -> Optional[tuple]:
+    """(mtime, size) of the model file and its calibration, or None if missing."""
+    if not os.path.exists(path):
+        return None
+    calibration = calibration_path_for(path)
+    stats = [os.stat(p) for p in (path, calibration) if os.path.exists(p)]
+    return tuple((s.st_mtime_ns, s.st_size) for s in stats)
+
+
+def _checksum_ok(path: str) -> bool:
+    """Verify ``<model>.sha256`` (written by train_intent) when present."""
+    checksum_path = f"{path}.sha256"
+    if not os.path.exists(checksum_path):
+        return True
+
+    with open(checksum_path, "r", encoding="utf-8") as f:
+        expected = f.read().split()[0]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest() == expected
+
+
+class ModelVersion:
+    """A loaded, warmed classifier plus where it came from."""
+
+    def __init__(self, classifier: IntentClassifierService, model_path: str, backend: str):
+        self.classifier = classifier
+        self.model_path = model_path
+        self.backend = backend
+        self.loaded_at = time.time()
+
+    def to_dict(self) -> Dict:
+        return {
+            "model_path": self.model_path,
+            "backend": self.backend,
+            "tags": len(self.classifier.tags),
+            "loaded_at": self.loaded_at,
+        }
+
+
+class IntentModelRegistry:
+    """
+    Holds the active intent classifier and swaps in new versions at runtime.
+
+    A new version is loaded and warmed in a background thread while the
+    current one keeps serving; the swap itself is a single reference
+    assignment, so in-flight predictions finish on the model they started
+    with and nothing blocks. The replaced version is kept for ``rollback()``.
+
+    New versions arrive either through ``reload()`` (admin endpoint) or by
+    polling the active model file (``start_watching``): a changed file is
+    loaded once it has been stable for one poll and its ``.sha256`` matches.
+    """
+
+    def __init__(self, model_path: Optional[str] = None, backend: Optional[str] = None):
+        backend = backend or settings.INTENT_BACKEND
+        model_path = model_path or default_model_path(backend)
+
+        self._swap_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+        # Last on-disk state handled per model path, so the watcher neither
+        # reloads the same file twice nor undoes a rollback
+        self._seen: Dict[str, Optional[tuple]] = {}
+
+        self._active: ModelVersion = self._load_version(model_path, backend)
+        self._previous: Optional[ModelVersion] = None
+
+        self.last_error: Optional[str] = None
+        self.reloads = 0
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+
+    @property
+    def active(self) -> IntentClassifierService:
+        return self._active.classifier
+
+    def _load_version(self, model_path: str, backend: str) -> ModelVersion:
+        self._seen[model_path] = _fingerprint(model_path)
+        classifier = IntentClassifierService(model_path=model_path, backend=backend)
+        self._warm(classifier)
+        return ModelVersion(classifier, model_path, backend)
+
+    @staticmethod
+    def _warm(classifier: IntentClassifierService):
+        """Run every intents.json pattern through the model to fill caches before serving."""
+        patterns: List[str] = []
+        intents_path = os.path.join(settings.DATA_DIR, "intents.json")
+        if os.path.exists(intents_path):
+            with open(intents_path, "r", encoding="utf-8") as f:
+                patterns = [p for intent in json.load(f)["intents"] for p in intent["patterns"]]
+
+        classifier.get_intent_details_batch(patterns or ["hello"])
+
+    def reload(self, model_path: Optional[str] = None, backend: Optional[str] = None) -> Dict:
+        """
+        Load ``model_path`` (default: the active path, re-read from disk),
+        warm it and make it active. On failure the active model is kept.
+        """
+        current = self._active
+        model_path = model_path or current.model_path
+        backend = backend or current.backend
+
+        with self._load_lock:
+            try:
+                self._seen[model_path] = _fingerprint(model_path)
+                if not _checksum_ok(model_path):
+                    raise ValueError(f"Checksum mismatch for {model_path}")
+                version = self._load_version(model_path, backend)
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Intent model reload failed, keeping {current.model_path}: {e}")
+                raise
+
+            with self._swap_lock:
+                self._previous, self._active = self._active, version
+                self.reloads += 1
+                self.last_error = None
+
+        logger.info(f"Intent model swapped to {model_path} ({backend})")
+        return version.to_dict()
+
+    def reload_in_background(self, model_path: Optional[str] = None, backend: Optional[str] = None) -> threading.Thread:
+        def _run():
+            try:
+                self.reload(model_path, backend)
+            except Exception:
+                pass  # already logged; active model unchanged
+
+        thread = threading.Thread(target=_run, name="intent-model-reload", daemon=True)
+        thread.start()
+        return thread
+
+    def rollback(self) -> Dict:
+        """Swap back to the previously active version."""
+        with self._swap_lock:
+            if self._previous is None:
+                raise ValueError("No previous intent model to roll back to")
+            self._active, self._previous = self._previous, self._active
+            version = self._active
+
+        logger.info(f"Intent model rolled back to {version.model_path}")
+        return version.to_dict()
+
+    # ---------------------------
+    # File watching
+    # ---------------------------
+    def start_watching(self, interval: Optional[float] = None):
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        interval = interval or settings.INTENT_MODEL_WATCH_INTERVAL
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name="intent-model-watch", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._stop_watching.set()
+
+    def _watch(self, interval: float):
+        pending = None
+        while not self._stop_watching.wait(interval):
+            current = self._active
+            fingerprint = _fingerprint(current.model_path)
+
+            if fingerprint is None or fingerprint == self._seen.get(current.model_path):
+                pending = None
+                continue
+
+            # Wait until the file has stopped changing (trainer still writing)
+            if fingerprint != pending:
+                pending = fingerprint
+                continue
+
+            pending = None
+            try:
+                self.reload(current.model_path, current.backend)
+            except Exception:
+                pass  # marked as seen: a broken file is not retried until it changes again
+
+    def get_status(self) -> Dict:
+        return {
+            "active": self._active.to_dict(),
+            "previous": self._previous.to_dict() if self._previous else None,
+            "reloads": self.reloads,
+            "watching": self._watcher is not None and self._watcher.is_alive(),
+            "last_error": self.last_error,
+        }
+
+
+# ---------------------------
+# Global Singleton Instance
+# ---------------------------
+_registry_instance = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> IntentModelRegistry:
+    global _registry_instance
+    if _registry_instance is None:
+        with _registry_lock:
+            if _registry_instance is None:
+                _registry_instance = IntentModelRegistry()
+                if settings.INTENT_MODEL_WATCH:
+                    _registry_instance.start_watching()
+    return _registry_instance
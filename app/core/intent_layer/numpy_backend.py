@@ -0,0 +1,107 @@
+# app/core/intent_layer/numpy_backend.py
+"""
+Torch-free inference for the intent NeuralNet.
+
+The weights of ``intent_model.pth`` are exported once to a flat ``.npz``
+file; serving then only needs NumPy:
+
+    python -m app.core.intent_layer.numpy_backend [intent_model.pth] [intent_model.npz]
+"""
+
+import json
+import os
+import sys
+import numpy as np
+
+# Linear layers of NeuralNet, in forward order
+LAYERS = ("l1", "l2", "l3")
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class NumpyIntentBackend:
+    """
+    Runs the NeuralNet forward pass (linear -> ReLU -> linear -> ReLU ->
+    linear -> softmax) in NumPy. Dropout is a no-op at inference time.
+    """
+
+    name = "numpy"
+
+    def __init__(self, weights_path: str):
+        if not os.path.exists(weights_path):
+            raise FileNotFoundError(
+                f"❌ NumPy intent weights not found at {weights_path}. "
+                f"Export them with: python -m app.core.intent_layer.numpy_backend"
+            )
+
+        with np.load(weights_path, allow_pickle=False) as data:
+            self.model_path = weights_path
+            self.input_size = int(data["input_size"])
+            self.hidden_size = int(data["hidden_size"])
+            self.output_size = int(data["output_size"])
+            self.all_words = data["all_words"].tolist()
+            self.tags = data["tags"].tolist()
+
+            # Store weights transposed so the forward pass is X @ W + b
+            self.weights = [
+                (
+                    np.ascontiguousarray(data[f"{layer}.weight"].T, dtype=np.float32),
+                    np.asarray(data[f"{layer}.bias"], dtype=np.float32),
+                )
+                for layer in LAYERS
+            ]
+
+    def forward(self, X: np.ndarray) -> np.ndarray:
+        out = X
+        last = len(self.weights) - 1
+        for i, (weight, bias) in enumerate(self.weights):
+            out = out @ weight + bias
+            if i < last:
+                np.maximum(out, 0, out=out)
+        return out
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Softmax probabilities for a (batch, input_size) float32 matrix."""
+        return softmax(self.forward(X))
+
+
+def export_numpy_weights(model_path: str, weights_path: str) -> str:
+    """
+    Convert an ``intent_model.pth`` artifact to the ``.npz`` format read by
+    NumpyIntentBackend. This is the only place torch is needed.
+    """
+    import torch
+
+    data = torch.load(model_path, map_location="cpu")
+    arrays = {
+        name: tensor.detach().cpu().numpy().astype(np.float32)
+        for name, tensor in data["model_state"].items()
+    }
+    if data.get("holdout"):
+        # Held-out split, for calibration.py (as JSON: npz is loaded without pickle)
+        arrays["holdout"] = np.array(json.dumps(data["holdout"], ensure_ascii=False))
+
+    np.savez_compressed(
+        weights_path,
+        input_size=np.int64(data["input_size"]),
+        hidden_size=np.int64(data["hidden_size"]),
+        output_size=np.int64(data["output_size"]),
+        all_words=np.array(data["all_words"], dtype=str),
+        tags=np.array(data["tags"], dtype=str),
+        **arrays,
+    )
+    return weights_path
+
+
+if __name__ == "__main__":
+    from app.config import settings
+
+    src = sys.argv[1] if len(sys.argv) > 1 else os.path.join(settings.MODEL_DIR, "intent_model.pth")
+    dst = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(src)[0] + ".npz"
+
+    export_numpy_weights(src, dst)
+    print(f"✅ Exported NumPy intent weights to {dst}")
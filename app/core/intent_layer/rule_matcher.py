@@ -0,0 +1,107 @@
+# app/core/intent_layer/rule_matcher.py
+import json
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, Optional
+
+from app.config import settings
+
+
+class KeywordRuleMatcher:
+    """
+    Constant-time fast path for trivially recognizable turns ("yes", "asante",
+    "bye", a bare phone number or amount).
+
+    Every rule in ``intent_rules.json`` (keyword lists and regexes, English and
+    Swahili/Sheng) is compiled at startup into ONE alternation of named
+    groups, so a message is matched by a single ``fullmatch`` call and the
+    winning rule is read from ``lastgroup``. Rules are tried in file order.
+
+    The keyword lists are curated in that file by hand. They are not
+    derived from the language-detection word lists in ``utils/language.py``
+    or ``LanguageDetector``, which carry no intent; new Swahili/Sheng
+    phrasings have to be added to the rules file.
+    """
+
+    def __init__(self, rules_path: Optional[str] = None):
+        rules_path = rules_path or settings.INTENT_RULES_PATH
+
+        with open(rules_path, "r", encoding="utf-8") as f:
+            rules = json.load(f)["rules"]
+
+        self.rules: Dict[str, Dict] = {}
+        alternatives = []
+
+        for i, rule in enumerate(rules):
+            group = f"r{i}"
+            if rule.get("keywords"):
+                # Longest first so "asante sana" is not cut short by "asante"
+                keywords = sorted(rule["keywords"], key=len, reverse=True)
+                body = "|".join(re.escape(keyword.lower()) for keyword in keywords)
+            else:
+                body = rule["regex"]
+
+            alternatives.append(f"(?P<{group}>{body})")
+            self.rules[group] = rule
+
+        self.pattern = re.compile("|".join(alternatives))
+
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits: Counter = Counter()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Lowercase, collapse whitespace and drop surrounding punctuation."""
+        return " ".join(text.lower().split()).strip(" .,!?;:")
+
+    def match(self, text: str) -> Optional[Dict]:
+        """
+        Return the matching rule as an intent result, or None.
+
+        The whole (normalized) message must match, so "yes" fires but
+        "yes I want to book a car" goes on to the classifier.
+        """
+        normalized = self.normalize(text)
+        match = self.pattern.fullmatch(normalized) if normalized else None
+
+        with self._lock:
+            self.lookups += 1
+            if match:
+                self.hits[self.rules[match.lastgroup]["name"]] += 1
+
+        if not match:
+            return None
+
+        rule = self.rules[match.lastgroup]
+        return {
+            "rule": rule["name"],
+            "intent": rule["intent"],
+            "category": rule["category"],
+            "value": match.group(),
+        }
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            fired = sum(self.hits.values())
+            return {
+                "lookups": self.lookups,
+                "hits": fired,
+                "hit_rate": fired / self.lookups if self.lookups else 0.0,
+                "by_rule": dict(self.hits),
+            }
+
+
+# ---------------------------
+# Global Singleton Instance
+# ---------------------------
+_matcher_instance = None
+
+
+def get_rule_matcher() -> KeywordRuleMatcher:
+    global _matcher_instance
+    if _matcher_instance is None:
+        _matcher_instance = KeywordRuleMatcher()
+    return _matcher_instance
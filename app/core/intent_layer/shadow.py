@@ -0,0 +1,266 @@
+# app/core/intent_layer/shadow.py
+import logging
+import queue
+import threading
+import time
+import numpy as np
+from collections import Counter, deque
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.core.intent_layer.intent_classifier import IntentClassifierService
+
+logger = logging.getLogger(__name__)
+
+# Per-message latencies kept for percentiles
+LATENCY_WINDOW = 10000
+
+
+class ShadowEvaluator:
+    """
+    Runs a candidate intent model next to the active one on live traffic.
+
+    The request path only hands over what the active model already
+    produced (``observe_batch`` is a non-blocking put; when the queue is
+    full the batch is dropped and counted). A background thread classifies
+    each live batch with the candidate and records agreement with the
+    active model (tag and handler category), per-tag confusion, LLM
+    verification rates and per-message latency. ``decision()`` gates
+    promotion on those numbers.
+
+    Latency is compared like for like: the thread times the active model
+    and the candidate back to back on the same batch (the texts the
+    micro-batcher grouped, in alternating order), rather than setting the
+    batcher's live timings against the candidate's.
+
+    ``stop`` does not wait for queued batches: the worker finishes the
+    batch in hand and exits, however full the queue is.
+    """
+
+    def __init__(self, candidate: IntentClassifierService, max_queue: int = 1000):
+        self.candidate = candidate
+        self.started_at = time.time()
+
+        self._queue: "queue.Queue[Optional[Tuple[List[str], List[Dict], IntentClassifierService]]]" = \
+            queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._reset_stats()
+
+        self._worker = threading.Thread(target=self._run, name="intent-shadow", daemon=True)
+        self._worker.start()
+
+    def _reset_stats(self):
+        self.samples = 0
+        self.batches = 0
+        self.dropped = 0
+        self.errors = 0
+        self.tag_agreements = 0
+        self.category_agreements = 0
+        self.active_verifications = 0
+        self.candidate_verifications = 0
+        self.confusion: Counter = Counter()
+        self.per_tag: Dict[str, List[int]] = {}
+        self.active_latency = deque(maxlen=LATENCY_WINDOW)
+        self.candidate_latency = deque(maxlen=LATENCY_WINDOW)
+
+    def observe_batch(self, texts: List[str], active_results: List[Dict], active: IntentClassifierService):
+        """Queue a batch the ``active`` classifier just classified. Never blocks."""
+        if self._stopped.is_set():
+            return
+        try:
+            self._queue.put_nowait((texts, active_results, active))
+        except queue.Full:
+            with self._lock:
+                self.dropped += len(texts)
+
+    def stop(self, timeout: float = 5):
+        """Stop the worker after its current batch, dropping queued ones. Never blocks on the queue."""
+        self._stopped.set()
+        try:
+            # Wakes a worker idle on an empty queue; a busy one sees the event
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        self._worker.join(timeout=timeout)
+
+    @staticmethod
+    def _time_ms(classifier: IntentClassifierService, texts: List[str]) -> Tuple[List[Dict], float]:
+        started = time.perf_counter()
+        results = classifier.get_intent_details_batch(texts)
+        return results, (time.perf_counter() - started) * 1000
+
+    def _run(self):
+        while not self._stopped.is_set():
+            item = self._queue.get()
+            if item is None:
+                return
+
+            texts, active_results, active = item
+            if self._stopped.is_set():
+                return
+            try:
+                # Same batch, same thread, back to back; alternate which goes
+                # first so neither always runs with warmer caches
+                if self.batches % 2:
+                    results, candidate_ms = self._time_ms(self.candidate, texts)
+                    _, active_ms = self._time_ms(active, texts)
+                else:
+                    _, active_ms = self._time_ms(active, texts)
+                    results, candidate_ms = self._time_ms(self.candidate, texts)
+            except Exception as e:
+                logger.error(f"Shadow intent batch of {len(texts)} failed: {e}")
+                with self._lock:
+                    self.errors += len(texts)
+                continue
+
+            self._record(texts, active_results, results, active_ms / len(texts), candidate_ms / len(texts))
+
+    def _record(
+            self,
+            texts: List[str],
+            active_results: List[Dict],
+            results: List[Dict],
+            active_ms: float,
+            candidate_ms: float
+    ):
+        with self._lock:
+            self.batches += 1
+            for active, candidate in zip(active_results, results):
+                same_tag = active["intent"] == candidate["intent"]
+
+                self.samples += 1
+                self.tag_agreements += same_tag
+                self.category_agreements += active["category"] == candidate["category"]
+                self.active_verifications += active["needs_llm_verification"]
+                self.candidate_verifications += candidate["needs_llm_verification"]
+                if not same_tag:
+                    self.confusion[(active["intent"], candidate["intent"])] += 1
+
+                counts = self.per_tag.setdefault(active["intent"], [0, 0])
+                counts[0] += 1
+                counts[1] += same_tag
+
+                self.active_latency.append(active_ms)
+                self.candidate_latency.append(candidate_ms)
+
+    @staticmethod
+    def _percentiles(values) -> Dict:
+        if not values:
+            return {"p50": None, "p99": None}
+        array = np.fromiter(values, dtype=np.float64)
+        return {"p50": float(np.percentile(array, 50)), "p99": float(np.percentile(array, 99))}
+
+    def get_report(self, top_confusions: int = 20) -> Dict:
+        with self._lock:
+            samples = self.samples
+
+            def rate(count: int) -> Optional[float]:
+                return count / samples if samples else None
+
+            return {
+                "candidate": self.candidate.backend.model_path,
+                "running_seconds": time.time() - self.started_at,
+                "samples": samples,
+                "batches": self.batches,
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "pending": self._queue.qsize(),
+                "tag_agreement": rate(self.tag_agreements),
+                "category_agreement": rate(self.category_agreements),
+                "active_verification_rate": rate(self.active_verifications),
+                "candidate_verification_rate": rate(self.candidate_verifications),
+                "per_tag_agreement": {
+                    tag: {"samples": total, "agreement": agreed / total}
+                    for tag, (total, agreed) in sorted(self.per_tag.items())
+                },
+                "confusion": [
+                    {"active": active, "candidate": candidate, "count": count}
+                    for (active, candidate), count in self.confusion.most_common(top_confusions)
+                ],
+                "latency_ms": {
+                    "active": self._percentiles(self.active_latency),
+                    "candidate": self._percentiles(self.candidate_latency),
+                },
+            }
+
+    def decision(
+            self,
+            min_samples: Optional[int] = None,
+            min_agreement: Optional[float] = None,
+            max_latency_ratio: Optional[float] = None
+    ) -> Dict:
+        """
+        Whether the candidate may be promoted: enough traffic seen, handler
+        categories agree often enough and p99 latency is not much worse.
+        """
+        min_samples = min_samples if min_samples is not None else settings.INTENT_SHADOW_MIN_SAMPLES
+        min_agreement = min_agreement if min_agreement is not None else settings.INTENT_SHADOW_MIN_AGREEMENT
+        max_latency_ratio = max_latency_ratio if max_latency_ratio is not None else settings.INTENT_SHADOW_MAX_LATENCY_RATIO
+
+        report = self.get_report(top_confusions=0)
+        reasons = []
+
+        if report["samples"] < min_samples:
+            reasons.append(f"only {report['samples']}/{min_samples} samples")
+        elif report["category_agreement"] < min_agreement:
+            reasons.append(f"category agreement {report['category_agreement']:.3f} < {min_agreement}")
+
+        active_p99 = report["latency_ms"]["active"]["p99"]
+        candidate_p99 = report["latency_ms"]["candidate"]["p99"]
+        if active_p99 and candidate_p99 and candidate_p99 > active_p99 * max_latency_ratio:
+            reasons.append(f"p99 latency {candidate_p99:.3f}ms > {max_latency_ratio}x active ({active_p99:.3f}ms)")
+
+        return {"promote": not reasons, "reasons": reasons, "report": report}
+
+
+# ---------------------------
+# Global Instance
+# ---------------------------
+_shadow_instance: Optional[ShadowEvaluator] = None
+
+
+def get_shadow_evaluator() -> Optional[ShadowEvaluator]:
+    """Running shadow evaluation, or None (the common case)."""
+    return _shadow_instance
+
+
+def start_shadow(model_path: str, backend: Optional[str] = None) -> ShadowEvaluator:
+    """Load ``model_path`` as the candidate and start shadowing (replaces any running one)."""
+    global _shadow_instance
+    candidate = IntentClassifierService(model_path=model_path, backend=backend)
+    previous, _shadow_instance = _shadow_instance, ShadowEvaluator(candidate)
+    if previous is not None:
+        previous.stop()
+    logger.info(f"Shadow evaluation started for {model_path}")
+    return _shadow_instance
+
+
+def stop_shadow() -> Optional[Dict]:
+    """Stop shadowing and return the final report."""
+    global _shadow_instance
+    shadow, _shadow_instance = _shadow_instance, None
+    if shadow is None:
+        return None
+    shadow.stop()
+    return shadow.get_report()
+
+
+def promote_shadow(registry, force: bool = False) -> Dict:
+    """
+    Make the candidate the active model through the model registry if the
+    promotion gate passes (or ``force``), then stop shadowing.
+    """
+    shadow = get_shadow_evaluator()
+    if shadow is None:
+        raise ValueError("No shadow evaluation running")
+
+    decision = shadow.decision()
+    if not decision["promote"] and not force:
+        return decision
+
+    backend = shadow.candidate.backend
+    decision["active"] = registry.reload(backend.model_path, backend.name)
+    decision["promote"] = True
+    stop_shadow()
+    return decision
@@ -0,0 +1,139 @@
+# app/core/intent_layer/torch_backend.py
+import os
+import numpy as np
+import torch
+import torch.nn as nn
+
+from app.core.inference_executor import configure_torch_threads
+from utils.nltk_utils import featurizer_from_config
+
+
+class NeuralNet(nn.Module):
+    """Simple feedforward neural network for intent classification."""
+
+    def __init__(self, input_size, hidden_size, num_classes):
+        super(NeuralNet, self).__init__()
+        self.l1 = nn.Linear(input_size, hidden_size)
+        self.l2 = nn.Linear(hidden_size, hidden_size)
+        self.l3 = nn.Linear(hidden_size, num_classes)
+        self.relu = nn.ReLU()
+        self.dropout = nn.Dropout(0.2)
+
+    def forward(self, x):
+        out = self.l1(x)
+        out = self.relu(out)
+        out = self.dropout(out)
+        out = self.l2(out)
+        out = self.relu(out)
+        out = self.dropout(out)
+        out = self.l3(out)
+        return out
+
+
+class EmbeddingBagNet(nn.Module):
+    """
+    Mean-pooled EmbeddingBag over sparse feature ids followed by a small
+    feed-forward head. Inputs are (batch, longest) id matrices padded with
+    ``padding_idx``, which is excluded from the mean.
+    """
+
+    def __init__(self, num_embeddings, embed_dim, hidden_size, num_classes, padding_idx=0):
+        super(EmbeddingBagNet, self).__init__()
+        self.embedding = nn.EmbeddingBag(
+            num_embeddings, embed_dim, mode="mean", sparse=True, padding_idx=padding_idx
+        )
+        self.l1 = nn.Linear(embed_dim, hidden_size)
+        self.l2 = nn.Linear(hidden_size, num_classes)
+        self.relu = nn.ReLU()
+        self.dropout = nn.Dropout(0.2)
+
+    def forward(self, ids):
+        out = self.embedding(ids)
+        out = self.l1(out)
+        out = self.relu(out)
+        out = self.dropout(out)
+        out = self.l2(out)
+        return out
+
+
+class TorchIntentBackend:
+    """
+    Runs the original PyTorch NeuralNet from ``intent_model.pth``.
+    """
+
+    name = "torch"
+
+    def __init__(self, model_path: str):
+        configure_torch_threads()
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"❌ Intent model not found at {model_path}")
+
+        data = torch.load(model_path, map_location=self.device)
+
+        self.model_path = model_path
+        self.input_size = data["input_size"]
+        self.hidden_size = data["hidden_size"]
+        self.output_size = data["output_size"]
+        self.all_words = data["all_words"]
+        self.tags = data["tags"]
+
+        # Build feed-forward neural network (original model)
+        self.model = NeuralNet(self.input_size, self.hidden_size, self.output_size).to(self.device)
+        self.model.load_state_dict(data["model_state"])
+        self.model.eval()
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Softmax probabilities for a (batch, input_size) float32 matrix."""
+        inputs = torch.from_numpy(X).to(self.device)
+
+        with torch.no_grad():
+            output = self.model(inputs)
+            probs = torch.softmax(output, dim=1)
+
+        # Single device -> host copy for the whole batch
+        return probs.cpu().numpy()
+
+
+class EmbeddingBagIntentBackend:
+    """
+    Runs an EmbeddingBagNet artifact (hashed n-grams or vocab.json ids). The
+    artifact carries its featurizer config, which the classifier uses in
+    place of the bag-of-words vectorizer.
+    """
+
+    def __init__(self, model_path: str):
+        configure_torch_threads()
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"❌ Intent model not found at {model_path}")
+
+        data = torch.load(model_path, map_location=self.device)
+
+        self.model_path = model_path
+        self.featurizer = featurizer_from_config(data["featurizer"])
+        self.name = data["featurizer"]["type"]
+        self.input_size = data["num_embeddings"]
+        self.embed_dim = data["embed_dim"]
+        self.hidden_size = data["hidden_size"]
+        self.output_size = data["output_size"]
+        self.all_words = data.get("all_words", [])
+        self.tags = data["tags"]
+
+        self.model = EmbeddingBagNet(
+            self.input_size, self.embed_dim, self.hidden_size, self.output_size, self.featurizer.pad_id
+        ).to(self.device)
+        self.model.load_state_dict(data["model_state"])
+        self.model.eval()
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Softmax probabilities for a (batch, longest) int64 feature id matrix."""
+        inputs = torch.from_numpy(X).to(self.device)
+
+        with torch.no_grad():
+            output = self.model(inputs)
+            probs = torch.softmax(output, dim=1)
+
+        return probs.cpu().numpy()
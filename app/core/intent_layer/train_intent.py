@@ -0,0 +1,348 @@
+# app/core/intent_layer/train_intent.py
+"""
+Train the intent NeuralNet and write ``intent_model.pth``.
+
+    python -m app.core.intent_layer.train_intent --epochs 500 --seed 42 \
+        --extra data/augmented_intents.jsonl
+    python -m app.core.intent_layer.train_intent --features hashed --learning-rate 0.01
+    python -m app.core.intent_layer.train_intent --features vocab --extend-vocab --learning-rate 0.01
+
+The bag-of-words design matrix for every pattern is built in one pass,
+mini-batches are gathered with a single index per batch, and all seeds are
+fixed so the same inputs produce the same model. Next to the model it writes:
+
+- ``intent_model.pth``          same format as before (model_state, sizes, all_words, tags)
+- ``intent_model.pth.sha256``   checksum of the artifact
+- ``intent_model_metrics.json`` training metrics, hyperparameters and checksum
+- ``intent_model.npz``          NumPy backend weights (bow only, unless --no-numpy)
+
+With ``--holdout`` the held-out samples are stored in the artifact
+(``holdout``), and ``calibration.py`` fits thresholds on exactly those.
+
+``--features hashed`` trains an EmbeddingBagNet over hashed word/char
+n-grams instead (``intent_model_hashed.pth``, served by the "hashed" backend);
+``--features vocab`` over ``data/vocab.json`` token ids
+(``intent_model_vocab.pth``, "vocab" backend; ``--extend-vocab`` appends
+training words the table does not know yet).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import time
+import numpy as np
+import torch
+import torch.nn as nn
+from torch.utils.data import BatchSampler, DataLoader, RandomSampler, TensorDataset
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.config import settings
+from app.core.intent_layer.numpy_backend import export_numpy_weights
+from app.core.intent_layer.torch_backend import EmbeddingBagNet, NeuralNet
+from utils.nltk_utils import (
+    IGNORE_WORDS, BagOfWordsVectorizer, HashedNgramFeaturizer, VocabIndexer, fast_tokenize, stem
+)
+
+FEATURE_MODES = ("bow", "hashed", "vocab")
+
+DEFAULT_OUTPUTS = {
+    "bow": "intent_model.pth",
+    "hashed": "intent_model_hashed.pth",
+    "vocab": "intent_model_vocab.pth",
+}
+
+
+def set_seed(seed: int):
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+    torch.use_deterministic_algorithms(True, warn_only=True)
+
+
+def iter_jsonl_samples(path: str) -> Iterator[Tuple[str, str]]:
+    """Stream (text, tag) pairs from a JSONL file of ``{"text", "tag"}`` records."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record["text"], record["tag"]
+
+
+def load_samples(intents_path: str, extra_paths: Optional[List[str]] = None) -> List[Tuple[str, str]]:
+    with open(intents_path, "r", encoding="utf-8") as f:
+        intents = json.load(f)["intents"]
+
+    samples = [(pattern, intent["tag"]) for intent in intents for pattern in intent["patterns"]]
+    for path in extra_paths or []:
+        samples.extend(iter_jsonl_samples(path))
+    return samples
+
+
+def build_vocabulary(samples: List[Tuple[str, str]]) -> List[str]:
+    return sorted({
+        stem(token) for text, _ in samples for token in fast_tokenize(text) if token not in IGNORE_WORDS
+    })
+
+
+def build_featurizer(
+        features: str,
+        samples: List[Tuple[str, str]],
+        num_buckets: int = 2 ** 15,
+        vocab_path: Optional[str] = None,
+        extend_vocab: bool = False
+):
+    """Featurizer for ``features``; the BOW vocabulary (and vocab extension) is taken from ``samples``."""
+    if features == "bow":
+        return BagOfWordsVectorizer(build_vocabulary(samples))
+    if features == "hashed":
+        return HashedNgramFeaturizer(num_buckets=num_buckets)
+    if features == "vocab":
+        indexer = VocabIndexer.from_file(vocab_path or os.path.join(settings.DATA_DIR, "vocab.json"))
+        if extend_vocab:
+            indexer = indexer.extend([fast_tokenize(text) for text, _ in samples])
+        return indexer
+    raise ValueError(f"Unknown feature mode '{features}'. Available: {list(FEATURE_MODES)}")
+
+
+def encode(featurizer, samples: List[Tuple[str, str]], tags: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Design matrix (dense BOW or padded feature ids) and label vector for ``samples``."""
+    X = featurizer.transform_batch([fast_tokenize(text) for text, _ in samples])
+    tag_index = {tag: i for i, tag in enumerate(tags)}
+    y = np.array([tag_index[tag] for _, tag in samples], dtype=np.int64)
+    return X, y
+
+
+def build_model(featurizer, num_classes: int, hidden_size: int = 8, embed_dim: int = 32) -> nn.Module:
+    if isinstance(featurizer, BagOfWordsVectorizer):
+        return NeuralNet(featurizer.size, hidden_size, num_classes)
+    return EmbeddingBagNet(featurizer.size, embed_dim, hidden_size, num_classes, featurizer.pad_id)
+
+
+def split_holdout(n: int, holdout: float, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.random.default_rng(seed).permutation(n)
+    cut = int(round(n * holdout))
+    return order[cut:], order[:cut]
+
+
+def holdout_record(
+        samples: List[Tuple[str, str]],
+        holdout_idx: np.ndarray,
+        holdout: float,
+        seed: int
+) -> Optional[Dict]:
+    """The held-out split as stored in the artifact (None when nothing was held out)."""
+    if not len(holdout_idx):
+        return None
+    indices = sorted(int(i) for i in holdout_idx)
+    return {
+        "method": "split_holdout",
+        "fraction": holdout,
+        "seed": seed,
+        "indices": indices,
+        "samples": [list(samples[i]) for i in indices],
+    }
+
+
+def accuracy(model: nn.Module, X: torch.Tensor, y: torch.Tensor) -> Optional[float]:
+    if len(y) == 0:
+        return None
+    model.eval()
+    with torch.no_grad():
+        predicted = model(X).argmax(dim=1)
+    model.train()
+    return float((predicted == y).float().mean())
+
+
+def build_optimizers(model: nn.Module, learning_rate: float) -> List[torch.optim.Optimizer]:
+    """Adam for dense parameters, SparseAdam for sparse EmbeddingBag tables."""
+    sparse = [
+        param for module in model.modules() if getattr(module, "sparse", False)
+        for param in module.parameters(recurse=False)
+    ]
+    sparse_ids = {id(param) for param in sparse}
+    dense = [param for param in model.parameters() if id(param) not in sparse_ids]
+
+    optimizers = [torch.optim.Adam(dense, lr=learning_rate)]
+    if sparse:
+        optimizers.append(torch.optim.SparseAdam(sparse, lr=learning_rate))
+    return optimizers
+
+
+def train(
+        X: np.ndarray,
+        y: np.ndarray,
+        model: nn.Module,
+        epochs: int = 500,
+        batch_size: int = 64,
+        learning_rate: float = 0.001,
+        holdout: float = 0.0,
+        seed: int = 42
+) -> Tuple[nn.Module, Dict]:
+    """Train ``model`` in place. Call set_seed() before building the model."""
+    train_idx, val_idx = split_holdout(len(y), holdout, seed)
+    X_all, y_all = torch.from_numpy(X), torch.from_numpy(y)
+    X_train, y_train = X_all[train_idx], y_all[train_idx]
+    X_val, y_val = X_all[val_idx], y_all[val_idx]
+
+    # Whole batches are gathered with one index instead of per-sample collation
+    dataset = TensorDataset(X_train, y_train)
+    sampler = BatchSampler(
+        RandomSampler(dataset, generator=torch.Generator().manual_seed(seed)),
+        batch_size=batch_size,
+        drop_last=False,
+    )
+    loader = DataLoader(dataset, sampler=sampler, batch_size=None)
+
+    criterion = nn.CrossEntropyLoss()
+    optimizers = build_optimizers(model, learning_rate)
+
+    model.train()
+    started = time.perf_counter()
+    loss_value = float("nan")
+
+    for epoch in range(epochs):
+        epoch_loss, batches = 0.0, 0
+        for words, labels in loader:
+            for optimizer in optimizers:
+                optimizer.zero_grad()
+            loss = criterion(model(words), labels)
+            loss.backward()
+            for optimizer in optimizers:
+                optimizer.step()
+            epoch_loss += loss.item()
+            batches += 1
+
+        loss_value = epoch_loss / max(batches, 1)
+        if (epoch + 1) % 100 == 0:
+            print(f"Epoch [{epoch + 1}/{epochs}], Loss: {loss_value:.4f}")
+
+    model.eval()
+    metrics = {
+        "samples": int(len(y)),
+        "train_samples": int(len(train_idx)),
+        "holdout_samples": int(len(val_idx)),
+        "final_loss": loss_value,
+        "train_accuracy": accuracy(model, X_train, y_train),
+        "holdout_accuracy": accuracy(model, X_val, y_val),
+        "duration_seconds": round(time.perf_counter() - started, 3),
+    }
+    return model, metrics
+
+
+def sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_artifact(model: nn.Module, featurizer, tags: List[str], hidden_size: int, embed_dim: int) -> Dict:
+    if isinstance(featurizer, BagOfWordsVectorizer):
+        return {
+            "model_state": model.state_dict(),
+            "input_size": featurizer.size,
+            "hidden_size": hidden_size,
+            "output_size": len(tags),
+            "all_words": featurizer.words,
+            "tags": tags,
+        }
+    return {
+        "model_state": model.state_dict(),
+        "featurizer": featurizer.config(),
+        "num_embeddings": featurizer.size,
+        "embed_dim": embed_dim,
+        "hidden_size": hidden_size,
+        "output_size": len(tags),
+        "tags": tags,
+    }
+
+
+def save_artifacts(data: Dict, metrics: Dict, output: str, export_numpy: bool = True) -> Dict:
+    torch.save(data, output)
+
+    checksum = sha256_file(output)
+    with open(f"{output}.sha256", "w", encoding="utf-8") as f:
+        f.write(f"{checksum}  {os.path.basename(output)}\n")
+
+    metrics = dict(
+        metrics,
+        sha256=checksum,
+        input_size=data.get("input_size", data.get("num_embeddings")),
+        output_size=data["output_size"],
+        parameters=sum(tensor.numel() for tensor in data["model_state"].values()),
+        artifact_bytes=os.path.getsize(output),
+    )
+    metrics_path = os.path.splitext(output)[0] + "_metrics.json"
+    with open(metrics_path, "w", encoding="utf-8") as f:
+        json.dump(metrics, f, indent=2)
+
+    # The NumPy backend only runs the BOW NeuralNet
+    if export_numpy and "all_words" in data:
+        export_numpy_weights(output, os.path.splitext(output)[0] + ".npz")
+
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the intent classifier")
+    parser.add_argument("--intents", default=os.path.join(settings.DATA_DIR, "intents.json"))
+    parser.add_argument("--extra", action="append", default=[], help="Extra JSONL samples ({text, tag} per line)")
+    parser.add_argument("--features", choices=FEATURE_MODES, default="bow")
+    parser.add_argument("--output", default=None, help="Model path (default: models/<default name for features>)")
+    parser.add_argument("--hidden-size", type=int, default=8)
+    parser.add_argument("--embed-dim", type=int, default=32, help="Embedding size (hashed features)")
+    parser.add_argument("--num-buckets", type=int, default=2 ** 15, help="Hash buckets (hashed features)")
+    parser.add_argument("--vocab", default=os.path.join(settings.DATA_DIR, "vocab.json"), help="word2idx table (vocab features)")
+    parser.add_argument("--extend-vocab", action="store_true", help="Append unseen training words to the vocab")
+    parser.add_argument("--epochs", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--learning-rate", type=float, default=0.001)
+    parser.add_argument("--holdout", type=float, default=0.0, help="Share of samples kept out for evaluation")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-numpy", action="store_true", help="Skip exporting NumPy backend weights")
+    args = parser.parse_args()
+
+    output = args.output or os.path.join(settings.MODEL_DIR, DEFAULT_OUTPUTS[args.features])
+
+    samples = load_samples(args.intents, args.extra)
+    featurizer = build_featurizer(args.features, samples, args.num_buckets, args.vocab, args.extend_vocab)
+    tags = sorted({tag for _, tag in samples})
+    X, y = encode(featurizer, samples, tags)
+    print(f"📚 {len(samples)} samples, {featurizer.size} features ({args.features}), {len(tags)} tags")
+
+    set_seed(args.seed)
+    model = build_model(featurizer, len(tags), args.hidden_size, args.embed_dim)
+    model, metrics = train(
+        X, y, model,
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        learning_rate=args.learning_rate,
+        holdout=args.holdout,
+        seed=args.seed,
+    )
+    metrics.update(
+        features=args.features,
+        seed=args.seed,
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        learning_rate=args.learning_rate,
+        hidden_size=args.hidden_size,
+    )
+
+    data = build_artifact(model, featurizer, tags, args.hidden_size, args.embed_dim)
+    # Same split train() held out, so calibration never sees training samples
+    _, holdout_idx = split_holdout(len(y), args.holdout, args.seed)
+    holdout = holdout_record(samples, holdout_idx, args.holdout, args.seed)
+    if holdout:
+        data["holdout"] = holdout
+    metrics = save_artifacts(data, metrics, output, not args.no_numpy)
+    print(f"✅ Saved {output} (sha256 {metrics['sha256'][:12]}…) "
+          f"loss={metrics['final_loss']:.4f} train_acc={metrics['train_accuracy']:.3f} "
+          f"in {metrics['duration_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
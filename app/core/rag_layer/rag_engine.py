@@ -3,7 +3,21 @@ from langchain_classic.chains.retrieval_qa.base import RetrievalQA
 from langchain_core.prompts import PromptTemplate
 from langchain_chroma import Chroma
 from app.config import settings
-from app.vectorstore.initialize_store import create_embedding
+from app.vectorstore.initialize_store import get_shared_embedding
+
+
+PROMPT_TEMPLATE = """
+Use the following context to answer the user's question.
+If the answer isn't in the documents, say: "I don't have that information."
+
+Context:
+{context}
+
+Question:
+{question}
+
+Answer:
+"""
 
 
 class RagEngine:
@@ -28,7 +42,7 @@ class RagEngine:
 
         # db_path = os.path.join(settings.VECTOR_DB_PATH, "chroma_db")
         db_path = os.path.join(settings.BASE_DIR, "database", "chroma_db")
-        embeddings = create_embedding()
+        embeddings = get_shared_embedding()
 
         self._vectorstore = Chroma(
             persist_directory=db_path,
@@ -45,21 +59,8 @@ class RagEngine:
 
         vectorstore = self.load_vectorstore()
 
-        prompt_template = """
-Use the following context to answer the user's question.
-If the answer isn't in the documents, say: "I don't have that information."
-
-Context:
-{context}
-
-Question:
-{question}
-
-Answer:
-"""
-
         PROMPT = PromptTemplate(
-            template=prompt_template,
+            template=PROMPT_TEMPLATE,
             input_variables=["context", "question"],
         )
 
@@ -79,3 +80,16 @@ Answer:
         chain = self.get_chain()
         result = chain.invoke({"query": message})
         return result["result"]  # Return only the answer text
+
+    # ----------------------------------------
+    # Split steps for async callers
+    # ----------------------------------------
+    def retrieve(self, message: str, k: int = 3):
+        """Embedding + Chroma search (CPU-bound; run it off the event loop)"""
+        return self.load_vectorstore().similarity_search(message, k=k)
+
+    @staticmethod
+    def build_prompt(message: str, docs) -> str:
+        """Same prompt the "stuff" chain sends to the LLM"""
+        context = "\n\n".join(doc.page_content for doc in docs)
+        return PROMPT_TEMPLATE.format(context=context, question=message)
@@ -71,6 +71,13 @@ class FeedbackRequest(BaseModel):
         }
 
 
+@app.on_event("shutdown")
+async def close_llm_clients():
+    """Close the pooled Azure aiohttp sessions so no connector is left open"""
+    from app.core.agentic_layer.agents.azure_agent import close_async_clients
+    await close_async_clients()
+
+
 # ===== API Endpoints =====
 @app.get("/")
 async def root():
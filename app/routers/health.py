@@ -1,5 +1,11 @@
 from fastapi import APIRouter
+from app.core.agentic_layer.completion_cache import get_completion_cache_stats
 from app.core.conversation.orchastrator import ConversationOrchestrator
+from app.core.conversation.metrics import turn_metrics
+from app.core.conversation.semantic_cache import get_semantic_cache_stats
+from app.core.gazetteer import get_gazetteer
+from app.core.inference_executor import get_inference_executor
+from app.core.intent_layer.rule_matcher import get_rule_matcher
 from lib.logger.color_logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -22,5 +28,11 @@ async def health_check():
             "agent_manager": "ok",
             "state_manager": "ok",
             "tools": len(orchestrator.tools)
-        }
+        },
+        "turns": turn_metrics.snapshot(),
+        "intent_rules": get_rule_matcher().get_stats(),
+        "inference": get_inference_executor().get_stats(),
+        "gazetteer": get_gazetteer().get_stats(),
+        "semantic_cache": get_semantic_cache_stats(),
+        "llm_cache": get_completion_cache_stats()
     }
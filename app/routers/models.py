@@ -0,0 +1,124 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from app.core.intent_layer.model_registry import get_model_registry
+from app.core.intent_layer.shadow import get_shadow_evaluator, promote_shadow, start_shadow, stop_shadow
+from lib.logger.color_logger import setup_logger
+
+logger = setup_logger(__name__)
+
+router = APIRouter(prefix="/models", tags=["Models"])
+
+
+class ShadowRequest(BaseModel):
+    model_path: str
+    backend: Optional[str] = None
+
+
+class ReloadRequest(BaseModel):
+    model_path: Optional[str] = None
+    backend: Optional[str] = None
+    wait: bool = False
+
+
+@router.get("/intent")
+async def get_intent_model_status():
+    """
+    Active and previous intent model versions
+    """
+
+    return get_model_registry().get_status()
+
+
+@router.post("/intent/reload")
+async def reload_intent_model(request: ReloadRequest):
+    """
+    Load, warm and swap in an intent model (the active file re-read from disk by default)
+    """
+
+    registry = get_model_registry()
+
+    if not request.wait:
+        registry.reload_in_background(request.model_path, request.backend)
+        return {"status": "reloading"}
+
+    try:
+        version = await asyncio.to_thread(registry.reload, request.model_path, request.backend)
+        return {"status": "success", "active": version}
+
+    except Exception as e:
+        logger.error(f"Error reloading intent model: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/intent/rollback")
+async def rollback_intent_model():
+    """
+    Swap back to the previously active intent model
+    """
+
+    try:
+        version = get_model_registry().rollback()
+        return {"status": "success", "active": version}
+
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.post("/intent/shadow")
+async def start_intent_shadow(request: ShadowRequest):
+    """
+    Run a candidate intent model in shadow next to the active one
+    """
+
+    try:
+        shadow = await asyncio.to_thread(start_shadow, request.model_path, request.backend)
+        return {"status": "shadowing", "candidate": shadow.candidate.backend.model_path}
+
+    except Exception as e:
+        logger.error(f"Error starting shadow evaluation: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/intent/shadow")
+async def get_intent_shadow_report():
+    """
+    Agreement, confusion and latency of the shadow candidate, plus the promotion decision
+    """
+
+    shadow = get_shadow_evaluator()
+    if shadow is None:
+        raise HTTPException(status_code=404, detail="No shadow evaluation running")
+
+    decision = shadow.decision()
+    decision["report"] = shadow.get_report()
+    return decision
+
+
+@router.post("/intent/shadow/promote")
+async def promote_intent_shadow(force: bool = False):
+    """
+    Promote the shadow candidate if it passes the gate (or force=true)
+    """
+
+    try:
+        return await asyncio.to_thread(promote_shadow, get_model_registry(), force)
+
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.delete("/intent/shadow")
+async def stop_intent_shadow():
+    """
+    Stop the shadow evaluation and return its final report
+    """
+
+    report = stop_shadow()
+    if report is None:
+        raise HTTPException(status_code=404, detail="No shadow evaluation running")
+    return report
@@ -26,6 +26,20 @@ def create_embedding():
     return HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
 
 
+_shared_embedding = None
+
+
+def get_shared_embedding():
+    """Process-wide MiniLM instance so the model weights are loaded only once."""
+    global _shared_embedding
+    if _shared_embedding is None:
+        _shared_embedding = create_embedding()
+        # sentence-transformers just imported torch; pin its thread count
+        from app.core.inference_executor import configure_torch_threads
+        configure_torch_threads()
+    return _shared_embedding
+
+
 def get_embeddings():
     """
     Select embeddings provider based on available credentials.
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+pytest.importorskip("azure.ai.inference")
+
+from app.core.agentic_layer.agents import azure_agent  # noqa: E402
+
+ENDPOINT = "https://models.example.invalid/inference"
+
+
+def _session():
+    azure_agent._get_async_client(ENDPOINT, "token")
+    return azure_agent._async_clients[(ENDPOINT, "token")][1]
+
+
+def test_sessions_of_a_previous_loop_are_closed():
+    async def first_loop():
+        return _session()
+
+    async def second_loop():
+        session = _session()
+        await asyncio.gather(*list(azure_agent._closing))
+        await azure_agent.close_async_clients()
+        return session
+
+    first = asyncio.run(first_loop())
+    second = asyncio.run(second_loop())
+    assert first.closed
+    assert second.closed
+
+
+def test_clients_are_reused_on_one_loop_and_closed_on_shutdown():
+    async def main():
+        client = azure_agent._get_async_client(ENDPOINT, "token")
+        assert azure_agent._get_async_client(ENDPOINT, "token") is client
+        session = azure_agent._async_clients[(ENDPOINT, "token")][1]
+        await azure_agent.close_async_clients()
+        return session
+
+    assert asyncio.run(main()).closed
+    assert azure_agent._async_clients == {}
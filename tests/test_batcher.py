@@ -0,0 +1,94 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.intent_layer import batcher as batcher_module
+from app.core.intent_layer.batcher import IntentMicroBatcher
+
+
+class FakeClassifier:
+    def __init__(self, fail_on=None):
+        self.batches = []
+        self.fail_on = fail_on
+        self.threads = set()
+
+    def get_intent_details_batch(self, texts):
+        self.threads.add(threading.get_ident())
+        self.batches.append(list(texts))
+        if self.fail_on in texts:
+            raise RuntimeError("model crashed")
+        return [{"intent": f"tag:{text}", "category": "general"} for text in texts]
+
+
+@pytest.fixture(autouse=True)
+def no_shadow(monkeypatch):
+    monkeypatch.setattr(batcher_module, "get_shadow_evaluator", lambda: None)
+
+
+def test_concurrent_requests_share_one_forward_pass():
+    classifier = FakeClassifier()
+    batcher = IntentMicroBatcher(classifier, max_batch_size=32, max_wait_ms=20)
+
+    async def main():
+        results = await asyncio.gather(*(batcher.submit(f"m{i}") for i in range(5)))
+        await batcher.stop()
+        return results, threading.get_ident()
+
+    results, loop_thread = asyncio.run(main())
+    assert [result["intent"] for result in results] == [f"tag:m{i}" for i in range(5)]
+    assert classifier.batches == [[f"m{i}" for i in range(5)]]
+    assert loop_thread not in classifier.threads
+    assert batcher.get_stats() == {"requests": 5, "batches": 1, "avg_batch_size": 5.0}
+
+
+def test_batches_are_capped_at_max_batch_size():
+    classifier = FakeClassifier()
+    batcher = IntentMicroBatcher(classifier, max_batch_size=2, max_wait_ms=20)
+
+    async def main():
+        await asyncio.gather(*(batcher.submit(f"m{i}") for i in range(5)))
+        await batcher.stop()
+
+    asyncio.run(main())
+    assert [len(batch) for batch in classifier.batches] == [2, 2, 1]
+
+
+def test_failed_batch_fails_its_callers_and_the_worker_carries_on():
+    classifier = FakeClassifier(fail_on="bad")
+    batcher = IntentMicroBatcher(classifier, max_batch_size=32, max_wait_ms=5)
+
+    async def main():
+        failed = await asyncio.gather(batcher.submit("bad"), batcher.submit("ok"), return_exceptions=True)
+        after = await batcher.submit("later")
+        await batcher.stop()
+        return failed, after
+
+    failed, after = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in failed)
+    assert after["intent"] == "tag:later"
+
+
+def test_shadow_sees_each_live_batch(monkeypatch):
+    observed = []
+
+    class Shadow:
+        def observe_batch(self, texts, results, classifier):
+            observed.append((texts, [result["intent"] for result in results], classifier))
+
+    monkeypatch.setattr(batcher_module, "get_shadow_evaluator", lambda: Shadow())
+    classifier = FakeClassifier()
+    batcher = IntentMicroBatcher(classifier, max_wait_ms=5)
+
+    async def main():
+        await asyncio.gather(batcher.submit("a"), batcher.submit("b"))
+        await batcher.stop()
+
+    asyncio.run(main())
+    assert observed == [(["a", "b"], ["tag:a", "tag:b"], classifier)]
+
+
+def test_usable_from_successive_event_loops():
+    batcher = IntentMicroBatcher(FakeClassifier(), max_wait_ms=1)
+    assert asyncio.run(batcher.submit("first"))["intent"] == "tag:first"
+    assert asyncio.run(batcher.submit("second"))["intent"] == "tag:second"
@@ -0,0 +1,65 @@
+import json
+import os
+import sys
+
+import pytest
+
+from app.core.intent_layer.benchmark import compare, main, synthetic_corpus
+
+
+def result(case, batch_size, p50, p99):
+    return {"case": case, "batch_size": batch_size, "p50_ms": p50, "p99_ms": p99}
+
+
+def test_compare_flags_slowdowns_beyond_tolerance():
+    baseline = {"results": [result("predict", 1, 1.0, 2.0), result("predict", 32, 10.0, 20.0)]}
+    results = [result("predict", 1, 1.1, 2.0), result("predict", 32, 10.0, 30.0)]
+
+    regressions = compare(results, baseline, tolerance=0.2)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("predict batch=32 p99_ms")
+
+
+def test_compare_ignores_cases_missing_from_the_baseline():
+    baseline = {"results": [result("predict", 1, 1.0, 1.0)]}
+    assert compare([result("vectorize", 1, 50.0, 50.0)], baseline, tolerance=0.2) == []
+
+
+def test_synthetic_corpus_is_seeded():
+    from app.config import settings
+
+    path = os.path.join(settings.DATA_DIR, "intents.json")
+    assert synthetic_corpus(path, 50, seed=1) == synthetic_corpus(path, 50, seed=1)
+
+
+def run_main(monkeypatch, *args):
+    monkeypatch.setattr(sys, "argv", [
+        "benchmark", "--cases", "vectorize", "--corpus-size", "100", "--budget", "40", *args,
+    ])
+    main()
+
+
+def test_baseline_gate_exits_on_regression(tmp_path, monkeypatch):
+    pytest.importorskip("torch")
+    output = tmp_path / "bench.json"
+    run_main(monkeypatch, "--output", str(output))
+
+    report = json.loads(output.read_text())
+    assert {r["case"] for r in report["results"]} == {"vectorize"}
+    assert {r["batch_size"] for r in report["results"]} == {1, 32, 256}
+
+    # Same timings scaled up: comfortably within tolerance
+    slow = tmp_path / "slow.json"
+    slow.write_text(json.dumps({"results": [
+        {**r, "p50_ms": r["p50_ms"] * 100, "p99_ms": r["p99_ms"] * 100} for r in report["results"]
+    ]}))
+    run_main(monkeypatch, "--baseline", str(slow))
+
+    # An impossibly fast baseline fails the run
+    fast = tmp_path / "fast.json"
+    fast.write_text(json.dumps({"results": [
+        {**r, "p50_ms": 1e-6, "p99_ms": 1e-6} for r in report["results"]
+    ]}))
+    with pytest.raises(SystemExit) as exit_info:
+        run_main(monkeypatch, "--baseline", str(fast))
+    assert exit_info.value.code == 1
@@ -0,0 +1,91 @@
+import json
+import os
+import subprocess
+import sys
+
+from app.core.intent_layer.bulk_classify import ResultWriter, classify_file, read_checkpoint
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def records(start, stop):
+    return [{"id": i, "text": f"message {i}"} for i in range(start, stop)]
+
+
+def results(batch):
+    return [{"intent": "greeting"} for _ in batch]
+
+
+def write_batches(path, fmt, batches, offset=0, output_bytes=None):
+    writer = ResultWriter(str(path), fmt, offset, output_bytes)
+    for batch in batches:
+        writer.write(batch, results(batch))
+    writer.close()
+
+
+def test_resume_drops_partial_and_unacknowledged_output(tmp_path):
+    output = tmp_path / "out.jsonl"
+    write_batches(output, "jsonl", [records(0, 3), records(3, 6)])
+
+    # Crash: a batch reached the output but its checkpoint did not, and the
+    # next one was cut off mid-line
+    with open(output, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"id": 6, "text": "message 6", "intent": "greeting"}) + "\n")
+        f.write('{"id": 7, "te')
+
+    offset, output_bytes = read_checkpoint(str(output))
+    assert offset == 6
+    write_batches(output, "jsonl", [records(6, 9)], offset, output_bytes)
+
+    with open(output, "r", encoding="utf-8") as f:
+        ids = [json.loads(line)["id"] for line in f]
+    assert ids == list(range(9))
+
+
+def test_csv_resume_keeps_a_single_header(tmp_path):
+    output = tmp_path / "out.csv"
+    write_batches(output, "csv", [records(0, 2)])
+    with open(output, "a", encoding="utf-8") as f:
+        f.write("2,message 2,gre")
+
+    offset, output_bytes = read_checkpoint(str(output))
+    write_batches(output, "csv", [records(2, 4)], offset, output_bytes)
+
+    with open(output, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines == [
+        "id,text,intent",
+        "0,message 0,greeting",
+        "1,message 1,greeting",
+        "2,message 2,greeting",
+        "3,message 3,greeting",
+    ]
+
+
+def test_classify_file_in_input_order(tmp_path):
+    source = tmp_path / "in.jsonl"
+    source.write_text("".join(json.dumps(record) + "\n" for record in [
+        {"text": "hello there"}, {"text": "I want to book a car"}, {"text": "thank you"},
+    ]))
+    output = tmp_path / "out.jsonl"
+
+    written = classify_file(str(source), str(output), batch_size=2, workers=1, backend="numpy")
+
+    with open(output, "r", encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    assert written == 3
+    assert [row["text"] for row in rows] == ["hello there", "I want to book a car", "thank you"]
+    assert all("intent" in row and "category" in row for row in rows)
+    assert read_checkpoint(str(output)) == (3, os.path.getsize(output))
+
+
+def test_numpy_workers_do_not_import_torch():
+    script = (
+        "import sys\n"
+        "from app.core.intent_layer.bulk_classify import _init_worker\n"
+        "_init_worker(None, None)\n"
+        "print('torch' in sys.modules)\n"
+    )
+    env = {**os.environ, "INTENT_BACKEND": "numpy"}
+    out = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip().splitlines()[-1] == "False"
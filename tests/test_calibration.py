@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.core.intent_layer.calibration import apply_temperature, calibration_path_for, fit_temperature, load_holdout
+
+
+def test_calibration_file_is_per_model():
+    paths = {
+        calibration_path_for(f"models/{name}")
+        for name in ("intent_model.pth", "intent_model_hashed.pth", "intent_model_vocab.pth", "candidate_v2.pth")
+    }
+    assert len(paths) == 4
+    assert calibration_path_for("models/intent_model.pth") == "models/intent_model.calibration.json"
+    # The exported NumPy weights are the same model
+    assert calibration_path_for("models/intent_model.npz") == calibration_path_for("models/intent_model.pth")
+
+
+def test_temperature_softens_overconfident_predictions():
+    probs = np.array([[0.98, 0.01, 0.01], [0.98, 0.01, 0.01], [0.01, 0.98, 0.01]], dtype=np.float32)
+    labels = np.array([0, 1, 1])
+
+    temperature = fit_temperature(probs, labels)
+    assert temperature > 1.0
+    assert apply_temperature(probs, temperature)[0, 0] < probs[0, 0]
+
+
+def test_calibration_reuses_the_training_holdout(tmp_path):
+    pytest.importorskip("torch")
+    from app.config import settings
+    from app.core.intent_layer import train_intent
+
+    samples = train_intent.load_samples(os.path.join(settings.DATA_DIR, "intents.json"))
+    featurizer = train_intent.build_featurizer("bow", samples)
+    tags = sorted({tag for _, tag in samples})
+    X, y = train_intent.encode(featurizer, samples, tags)
+
+    train_intent.set_seed(7)
+    model, metrics = train_intent.train(X, y, train_intent.build_model(featurizer, len(tags)), epochs=1, holdout=0.2, seed=7)
+    train_idx, holdout_idx = train_intent.split_holdout(len(y), 0.2, 7)
+
+    data = train_intent.build_artifact(model, featurizer, tags, 8, 32)
+    data["holdout"] = train_intent.holdout_record(samples, holdout_idx, 0.2, 7)
+    output = str(tmp_path / "intent_model.pth")
+    train_intent.save_artifacts(data, metrics, output)
+
+    expected = [samples[i] for i in sorted(holdout_idx)]
+    assert len(expected) == metrics["holdout_samples"]
+    assert load_holdout(output) == expected
+    assert load_holdout(str(tmp_path / "intent_model.npz")) == expected
+    assert not set(expected) & {samples[i] for i in train_idx}
+
+
+def test_model_trained_on_everything_has_no_holdout():
+    pytest.importorskip("torch")
+    from app.core.intent_layer import train_intent
+
+    assert train_intent.holdout_record([("hi", "greeting")], np.array([], dtype=np.int64), 0.0, 42) is None
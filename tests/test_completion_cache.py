@@ -0,0 +1,172 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.core.agentic_layer import completion_cache
+from app.core.agentic_layer.agents.base_agent import BaseAgent
+from app.core.agentic_layer.completion_cache import CompletionCache, SQLiteCompletionStore, completion_key
+
+
+class CountingAgent(BaseAgent):
+    system_prompt = "You are a helpful assistant."
+
+    def __init__(self, name="counting", temperature=0.0, memory=None):
+        super().__init__(name=name, model="test-model", memory=memory)
+        self.temperature = temperature
+        self.calls = 0
+
+    def run(self, message: str, **kwargs) -> str:
+        self.calls += 1
+        return f"answer {self.calls} to {message}"
+
+    def cache_params(self):
+        return {"temperature": self.temperature}
+
+
+class AsyncAgent(CountingAgent):
+    async def arun(self, message: str, **kwargs) -> str:
+        self.calls += 1
+        return f"answer {self.calls} to {message}"
+
+
+class ToolAgent(CountingAgent):
+    cache_completions = False
+
+
+class StoreThreads(SQLiteCompletionStore):
+    """Records which threads the store is used from."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return super().get(key)
+
+    def set(self, key, value, ttl_seconds):
+        self.threads.add(threading.get_ident())
+        super().set(key, value, ttl_seconds)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = CompletionCache(StoreThreads(str(tmp_path / "llm_cache.sqlite3")), ttl_seconds=60)
+    monkeypatch.setattr(completion_cache.settings, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(completion_cache, "_cache_instance", cache)
+    monkeypatch.setattr(completion_cache, "_cache_failed", False)
+    return cache
+
+
+def test_completion_key_is_stable_and_covers_every_input():
+    messages = [{"role": "user", "content": "hi"}]
+    key = completion_key("azure", "gpt-4o", "sys", messages, {"temperature": 0, "max_tokens": 10})
+
+    assert key == completion_key("azure", "gpt-4o", "sys", messages, {"max_tokens": 10, "temperature": 0})
+    assert len(key) == 64
+    assert len({
+        key,
+        completion_key("claude", "gpt-4o", "sys", messages, {"temperature": 0, "max_tokens": 10}),
+        completion_key("azure", "gpt-4o-mini", "sys", messages, {"temperature": 0, "max_tokens": 10}),
+        completion_key("azure", "gpt-4o", "other", messages, {"temperature": 0, "max_tokens": 10}),
+        completion_key("azure", "gpt-4o", "sys", [{"role": "user", "content": "hi!"}], {"temperature": 0, "max_tokens": 10}),
+        completion_key("azure", "gpt-4o", "sys", messages, {"temperature": 0.5, "max_tokens": 10}),
+    }) == 6
+
+
+def test_repeated_prompt_is_served_from_cache(cache):
+    agent = CountingAgent()
+    assert agent.run("hi") == "answer 1 to hi"
+    assert agent.run("hi") == "answer 1 to hi"
+    assert agent.run("hello") == "answer 2 to hello"
+    assert agent.calls == 2
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_sampling_settings_are_part_of_the_key(cache):
+    CountingAgent(temperature=0.0).run("hi")
+    warm = CountingAgent(temperature=0.7)
+    warm.run("hi")
+    assert warm.calls == 1
+
+
+def test_tool_agent_is_not_cached(cache):
+    agent = ToolAgent()
+    assert agent.run("weather in nairobi") == "answer 1 to weather in nairobi"
+    assert agent.run("weather in nairobi") == "answer 2 to weather in nairobi"
+    assert cache.get_stats()["lookups"] == 0
+
+
+def test_agent_with_memory_or_history_is_not_cached(cache):
+    with_memory = CountingAgent(memory=object())
+    with_memory.run("hi")
+    with_memory.run("hi")
+    assert with_memory.calls == 2
+
+    with_history = CountingAgent()
+    with_history.add_to_history("user", "my name is Wanjiru")
+    with_history.run("what is my name?")
+    with_history.run("what is my name?")
+    assert with_history.calls == 2
+
+
+def test_async_lookups_run_off_the_event_loop(cache):
+    agent = AsyncAgent()
+
+    async def turn():
+        first = await agent.arun("hi")
+        second = await agent.arun("hi")
+        return first, second, threading.get_ident()
+
+    first, second, loop_thread = asyncio.run(turn())
+    assert first == second == "answer 1 to hi"
+    assert cache.store.threads and loop_thread not in cache.store.threads
+
+
+def test_gpt_4o_mini_agent_is_not_cached():
+    gpt_4o_mini = pytest.importorskip("app.core.agentic_layer.agents.gpt_4o_mini")
+    assert gpt_4o_mini.GPT4oMiniAgent.cache_completions is False
+
+
+def test_forgotten_completion_is_asked_again(cache):
+    agent = CountingAgent()
+    agent.run("classify this")
+    agent.forget_completion("classify this")
+    assert agent.run("classify this") == "answer 2 to classify this"
+    assert agent.run("classify this") == "answer 2 to classify this"
+    assert cache.get_stats()["deletes"] == 1
+
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeChatModel:
+    """Returns message objects like a LangChain chat model"""
+    temperature = 0.5
+    max_tokens = None
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, message):
+        self.calls += 1
+        return FakeMessage(f"reply to {message}")
+
+
+@pytest.mark.parametrize("module, cls", [
+    ("app.core.agentic_layer.agents.claude_agent", "ClaudeAgent"),
+    ("app.core.agentic_layer.agents.deepseek_agent", "DeepSeekAgent"),
+    ("app.core.agentic_layer.agents.grok_agent", "GrokAgent"),
+])
+def test_chat_model_agents_return_and_cache_text(cache, module, cls):
+    agent_class = getattr(pytest.importorskip(module), cls)
+    agent = agent_class.__new__(agent_class)
+    BaseAgent.__init__(agent, name=cls, model="test-model")
+    agent.llm = FakeChatModel()
+
+    assert agent.run("hi") == "reply to hi"
+    assert agent.run("hi") == "reply to hi"
+    assert agent.llm.calls == 1
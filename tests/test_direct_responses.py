@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from app.core.intent_layer.direct_responses import DirectResponder
+
+
+@pytest.fixture
+def responder():
+    return DirectResponder(min_confidence=0.75)
+
+
+def replies(responder, tag):
+    return set(responder.responses[tag])
+
+
+def test_can_answer_requires_a_direct_tag_and_confidence(responder):
+    assert responder.can_answer("greeting_en", 0.75)
+    assert responder.can_answer("greeting_en", 0.99)
+    assert not responder.can_answer("greeting_en", 0.74)
+    # Known intents outside the small-talk categories always go to the LLM path
+    assert not responder.can_answer("booking_request_en", 0.99)
+    assert not responder.can_answer("no_such_tag", 0.99)
+
+
+def test_threshold_defaults_to_settings(monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "DIRECT_RESPONSE_MIN_CONFIDENCE", 0.9)
+    responder = DirectResponder()
+    assert not responder.can_answer("greeting_en", 0.85)
+    assert responder.can_answer("greeting_en", 0.9)
+
+
+def test_templated_responses_are_not_direct(tmp_path):
+    intents = {"intents": [
+        {"tag": "greeting_en", "category": "greeting", "language": "English", "responses": ["Hi {name}!"]},
+        {"tag": "thanks_en", "category": "small_talk", "language": "English", "responses": ["Any time!", "Hi {name}"]},
+    ]}
+    path = tmp_path / "intents.json"
+    path.write_text(json.dumps(intents))
+
+    responder = DirectResponder(str(path), min_confidence=0.5)
+    assert not responder.can_answer("greeting_en", 1.0)
+    assert responder.respond("greeting_en") is None
+    assert responder.responses["thanks_en"] == ["Any time!"]
+
+
+def test_reply_stays_in_the_tag_language_without_a_hint(responder):
+    assert responder.respond("greeting_sw") in replies(responder, "greeting_sw")
+    assert responder.respond("goodbye_en") in replies(responder, "goodbye_en")
+
+
+@pytest.mark.parametrize("language", ["sw", "SW", "swahili", "sheng", "Swahili"])
+def test_language_hint_switches_to_the_sibling_tag(responder, language):
+    assert responder.respond("greeting_en", language) in replies(responder, "greeting_sw")
+    assert responder.respond("funny_en", language) in replies(responder, "funny_sw")
+
+
+def test_english_hint_and_unknown_languages(responder):
+    assert responder.respond("thanks_sw", "en") in replies(responder, "thanks_en")
+    # No sibling in that language: keep the classified tag
+    assert responder.respond("thanks_sw", "unknown") in replies(responder, "thanks_sw")
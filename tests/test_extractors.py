@@ -0,0 +1,110 @@
+from datetime import datetime
+
+import pytest
+
+from utils.extractors import extract_entities, extract_entities_with_remainder
+
+# A Saturday
+NOW = datetime(2026, 10, 17, 9, 0)
+
+
+def entities(text):
+    return extract_entities(text, NOW)
+
+
+@pytest.mark.parametrize("text, expected", [
+    # A verb after "going to" is not a destination, and the vehicle is still found
+    ("I am going to book a car tomorrow at 3pm", {"date": "2026-10-18", "time": "15:00"}),
+    ("I want to book a van", {"vehicle_type": "van"}),
+    # "to <place>" after a movement word
+    ("I want to go to westlands", {"dropoff_location": "Westlands"}),
+    ("ride to cbd", {"dropoff_location": "Cbd"}),
+    ("take me to the airport please", {"dropoff_location": "Airport"}),
+    ("book a suv to westlands", {"vehicle_type": "SUV", "dropoff_location": "Westlands"}),
+    # A place ends before vehicle and filler words
+    ("drop me off at two rivers mall with a van", {"dropoff_location": "Two Rivers Mall", "vehicle_type": "van"}),
+    ("from westlands to go to cbd", {"pickup_location": "Westlands", "dropoff_location": "Cbd"}),
+    # "to" without a movement word is not a destination
+    ("talk to customer care", {}),
+])
+def test_locations(text, expected):
+    assert entities(text) == expected
+
+
+@pytest.mark.parametrize("text", ["I want to book a car", "nataka gari", "any vehicle will do"])
+def test_generic_vehicle_words_leave_the_type_open(text):
+    assert "vehicle_type" not in entities(text)
+
+
+def test_specific_type_after_a_generic_word():
+    assert entities("a car, an suv please") == {"vehicle_type": "SUV"}
+
+
+@pytest.mark.parametrize("text", ["I need 2 cars", "in 2 hours", "send 500 to 0712345678"])
+def test_bare_number_is_not_an_amount(text):
+    found = entities(text)
+    assert "amount" not in found
+    assert found["number"] in (2.0, 500.0)
+
+
+def test_amounts_with_a_currency():
+    assert entities("pay 1,500 ksh")["amount"] == 1500.0
+    assert entities("Ksh. 250.50 via mpesa") == {"amount": 250.5, "payment_method": "M-Pesa"}
+
+
+def test_full_booking_in_one_message():
+    assert entities("I need a van from Karen to JKIA on friday at 10am") == {
+        "vehicle_type": "van",
+        "pickup_location": "Karen",
+        "dropoff_location": "Jkia",
+        "date": "2026-10-23",
+        "time": "10:00",
+    }
+
+
+def test_swahili_booking():
+    assert entities("kutoka kasarani hadi town kesho saa tatu asubuhi") == {
+        "pickup_location": "Kasarani",
+        "dropoff_location": "Town",
+        "date": "2026-10-18",
+        "time": "09:00",
+    }
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("saa moja asubuhi", "07:00"),
+    ("saa nne usiku", "22:00"),
+    ("saa sita usiku", "00:00"),
+    ("12am", "00:00"),
+    ("7:30 pm", "19:30"),
+    ("noon", "12:00"),
+])
+def test_times(text, expected):
+    assert entities(text)["time"] == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("today", "2026-10-17"),
+    ("keshokutwa", "2026-10-19"),
+    ("next saturday", "2026-10-24"),
+    ("monday", "2026-10-19"),
+    ("25/12", "2026-12-25"),
+    ("3rd of jan", "2027-01-03"),
+    ("31/02", None),
+])
+def test_dates(text, expected):
+    assert entities(text).get("date") == expected
+
+
+def test_payment_entities():
+    assert entities("send 500 to +254712345678 via airtel money") == {
+        "number": 500.0,
+        "phone": "254712345678",
+        "payment_method": "Airtel Money",
+    }
+
+
+def test_remainder_holds_only_unparsed_words():
+    found, remainder = extract_entities_with_remainder("book a noah to karen for my grandmother", NOW)
+    assert found == {"vehicle_type": "van", "dropoff_location": "Karen"}
+    assert remainder == ["grandmother"]
@@ -0,0 +1,94 @@
+import json
+import random
+
+import pytest
+
+from app.core.gazetteer import BKTree, PlaceGazetteer, edit_distance, normalize_place
+
+
+@pytest.fixture(scope="module")
+def gazetteer():
+    return PlaceGazetteer()
+
+
+def levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def test_normalize_place():
+    assert normalize_place("  Sarit   Centre, Westlands! ") == "sarit centre westlands"
+    assert normalize_place("Nyayo's Stadium") == "nyayos stadium"
+    assert normalize_place("St. Paul’s") == "st pauls"
+
+
+def test_edit_distance_gives_up_past_the_limit():
+    assert edit_distance("westlands", "westlnds", 2) == 1
+    assert edit_distance("kilimani", "kileleshwa", 2) == 3
+    assert edit_distance("nrb", "nairobi", 2) == 3
+
+
+def test_bk_tree_matches_brute_force():
+    rng = random.Random(7)
+    words = ["".join(rng.choice("abcde") for _ in range(rng.randint(3, 7))) for _ in range(300)]
+    tree = BKTree()
+    for word in words:
+        tree.add(word)
+
+    for _ in range(200):
+        query = "".join(rng.choice("abcdef") for _ in range(rng.randint(3, 7)))
+        found = tree.closest(query, 2)
+        best = min(levenshtein(query, word) for word in words)
+        if best > 2:
+            assert found is None
+        else:
+            assert found[1] == best == levenshtein(query, found[0])
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("westlands", "Westlands, Nairobi"),
+    ("westlnds", "Westlands, Nairobi"),
+    ("westlands nrb", "Westlands, Nairobi"),
+    ("pick me at jkia", "JKIA, Nairobi"),
+    ("milimani nakuru", "Milimani, Nakuru"),
+    ("cbd msa", "CBD, Mombasa"),
+    ("cbd", "CBD, Nairobi"),
+    ("kisumu", "Kisumu"),
+    ("nowhere at all", None),
+])
+def test_normalize(gazetteer, text, expected):
+    assert gazetteer.normalize(text) == expected
+
+
+def test_short_words_are_only_matched_exactly(gazetteer):
+    assert gazetteer.find("nrb")[0]["distance"] == 0
+    assert gazetteer.find("nrv") == []
+
+
+def test_find_scans_left_to_right_without_overlaps(gazetteer):
+    matches = gazetteer.find("from yaya centre to the cbd")
+    assert [match["text"] for match in matches] == ["yaya centre", "cbd"]
+    assert len(matches[1]["candidates"]) > 1
+
+
+def test_most_specific_place_wins(tmp_path):
+    path = tmp_path / "places.json"
+    path.write_text(json.dumps({"places": [
+        {"name": "Alpha", "type": "city", "city": "Alpha", "aliases": []},
+        {"name": "Beta", "type": "city", "city": "Beta", "aliases": []},
+        {"name": "Market", "type": "landmark", "city": "Alpha", "aliases": ["the market"]},
+        {"name": "Market", "type": "landmark", "city": "Beta", "aliases": []},
+    ]}))
+    gazetteer = PlaceGazetteer(str(path))
+
+    assert gazetteer.resolve("beta market") == {
+        "name": "Market", "city": "Beta", "type": "landmark", "canonical": "Market, Beta", "distance": 0,
+    }
+    assert gazetteer.normalize("market") == "Market, Alpha"
+    assert gazetteer.normalize("markt in beta") == "Market, Beta"
+    assert gazetteer.get_stats()["fuzzy_hits"] == 1
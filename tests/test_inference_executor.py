@@ -0,0 +1,81 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.inference_executor import InferenceExecutor
+
+
+@pytest.fixture
+def executor():
+    executor = InferenceExecutor(max_workers=4, max_pending=2)
+    yield executor
+    executor.shutdown()
+
+
+def test_calls_run_in_the_pool_and_are_counted(executor):
+    async def main():
+        return await executor.run("intent", lambda a, b=0: (a + b, threading.get_ident()), 1, b=2), threading.get_ident()
+
+    (result, worker), loop_thread = asyncio.run(main())
+    assert result == 3
+    assert worker != loop_thread
+
+    stats = executor.get_stats()["queues"]["intent"]
+    assert (stats["submitted"], stats["completed"], stats["failed"], stats["waiting"], stats["running"]) == (1, 1, 0, 0, 0)
+    assert stats["run_ms"]["p50"] is not None
+
+
+def test_failures_are_raised_and_counted(executor):
+    def boom():
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError, match="bad input"):
+        asyncio.run(executor.run("embedding", boom))
+    stats = executor.get_stats()["queues"]["embedding"]
+    assert (stats["failed"], stats["completed"]) == (1, 0)
+
+
+def test_event_loop_stays_free_during_a_call(executor):
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.ensure_future(ticker())
+        await executor.run("rag", time.sleep, 0.1)
+        task.cancel()
+        return ticks
+
+    assert asyncio.run(main()) >= 5
+
+
+def test_pending_calls_are_bounded_per_queue(executor):
+    running = {"intent": 0, "embedding": 0}
+    peak = {"intent": 0, "embedding": 0}
+    lock = threading.Lock()
+
+    def work(queue):
+        with lock:
+            running[queue] += 1
+            peak[queue] = max(peak[queue], running[queue])
+        time.sleep(0.02)
+        with lock:
+            running[queue] -= 1
+
+    async def main():
+        await asyncio.gather(*(executor.run(queue, work, queue) for queue in ["intent", "embedding"] * 5))
+
+    asyncio.run(main())
+    # max_pending=2 per queue, four workers shared by both queues
+    assert peak == {"intent": 2, "embedding": 2}
+
+
+def test_usable_from_successive_event_loops(executor):
+    assert asyncio.run(executor.run("intent", sum, [1, 2])) == 3
+    assert asyncio.run(executor.run("intent", sum, [3, 4])) == 7
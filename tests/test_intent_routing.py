@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from app.core.intent_layer.intent_routing import (
+    ROUTE_CATEGORIES,
+    TAG_ROUTES,
+    IntentCategoryRouter,
+    load_tag_categories,
+)
+
+TAGS = sorted(load_tag_categories())
+
+
+@pytest.fixture(scope="module")
+def router():
+    return IntentCategoryRouter(TAGS)
+
+
+def test_every_tag_routes_to_a_handler(router):
+    assert set(router.tag_routes) == set(TAGS)
+    assert set(router.tag_routes.values()) <= set(ROUTE_CATEGORIES)
+    assert set(TAG_ROUTES) <= set(TAGS)
+
+
+@pytest.mark.parametrize("tag, route", [
+    ("transfer_info_en", "faq"),
+    ("transfer_info_sw", "faq"),
+    ("recover_info_en", "faq"),
+    ("recover_info_sw", "faq"),
+    ("payments_en", "faq"),
+    ("transfer_request", "payment"),
+    ("recover_request", "payment"),
+    ("booking_request_en", "booking"),
+    ("greeting_sw", "general"),
+    ("items", "faq"),
+])
+def test_routes(router, tag, route):
+    assert router.route_tag(tag) == route
+
+
+def test_unknown_tag_is_general(router):
+    assert router.route_tag("not_a_tag") == "general"
+
+
+def test_category_probabilities_sum_per_handler(router):
+    probs = np.zeros((2, len(TAGS)), dtype=np.float32)
+    probs[0, TAGS.index("transfer_info_en")] = 0.3
+    probs[0, TAGS.index("transfer_request")] = 0.3
+    probs[0, TAGS.index("recover_request")] = 0.3
+    probs[0, TAGS.index("items")] = 0.1
+    probs[1, TAGS.index("greeting_en")] = 1.0
+
+    (category, confidence, by_category), (second, _, _) = router.route_batch(probs)
+    assert category == "payment"
+    assert confidence == pytest.approx(0.6)
+    assert by_category["faq"] == pytest.approx(0.4)
+    assert sum(by_category.values()) == pytest.approx(1.0)
+    assert second == "general"
@@ -0,0 +1,138 @@
+import json
+import threading
+import time
+
+import pytest
+
+from app.core.intent_layer import knn_fallback
+from app.core.intent_layer.knn_fallback import EmbeddingIntentFallback
+
+# Tag -> (category, patterns); each pattern's embedding is given below
+INTENTS = {
+    "booking_request_en": ("booking", ["book a van", "reserve a car", "hire a matatu"]),
+    "items": ("products", ["what do you sell"]),
+    "transfer_info_en": ("account", ["how do i transfer money"]),
+    "greeting_en": ("greeting", ["hi", "hello"]),
+}
+
+VECTORS = {
+    "book a van": [1.0, 0.0, 0.0],
+    "reserve a car": [0.9, 0.1, 0.0],
+    "hire a matatu": [0.95, 0.0, 0.05],
+    "what do you sell": [0.0, 1.0, 0.0],
+    "how do i transfer money": [0.1, 0.9, 0.1],
+    "hi": [0.0, 0.0, 1.0],
+    "hello": [0.0, 0.1, 1.0],
+    # Queries
+    "i want to book a car": [1.0, 0.05, 0.0],
+    "something vague": [0.5, 0.5, 0.4],
+    "far from everything": [-1.0, -1.0, -1.0],
+}
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.document_batches = 0
+
+    def embed_documents(self, texts):
+        self.document_batches += 1
+        return [VECTORS[text] for text in texts]
+
+    def embed_query(self, text):
+        return VECTORS[text]
+
+
+@pytest.fixture
+def intents_path(tmp_path):
+    path = tmp_path / "intents.json"
+    path.write_text(json.dumps({"intents": [
+        {"tag": tag, "category": category, "patterns": patterns, "responses": []}
+        for tag, (category, patterns) in INTENTS.items()
+    ]}))
+    return str(path)
+
+
+def make_fallback(intents_path, **kwargs):
+    options = dict(k=3, min_confidence=0.6, min_similarity=0.5)
+    options.update(kwargs)
+    return EmbeddingIntentFallback(FakeEmbeddings(), intents_path, **options)
+
+
+def test_nearest_patterns_vote_and_centroid_agrees(intents_path):
+    result = make_fallback(intents_path).classify("i want to book a car")
+
+    assert result["intent"] == "booking"
+    assert result["centroid_intent"] == "booking"
+    assert result["nearest_tag"] == "booking_request_en"
+    assert result["confidence"] == pytest.approx(1.0)
+    assert result["top_similarity"] > 0.99
+    assert result["confident"]
+
+
+def test_split_vote_is_not_confident(intents_path):
+    result = make_fallback(intents_path, k=7).classify("something vague")
+    assert result["confidence"] < 0.6
+    assert not result["confident"]
+
+
+def test_centroid_disagreement_is_not_confident(tmp_path, monkeypatch):
+    # Two pricing questions sit right next to the query, but most FAQ
+    # patterns are far away, so the nearest centroid is booking's
+    monkeypatch.setitem(VECTORS, "how much to book", [0.7, 0.7, 0.0])
+    monkeypatch.setitem(VECTORS, "booking prices", [0.69, 0.72, 0.0])
+    monkeypatch.setitem(VECTORS, "what do you sell", [0.0, 0.0, 1.0])
+    monkeypatch.setitem(VECTORS, "how do i transfer money", [0.0, 0.0, 1.0])
+    monkeypatch.setitem(VECTORS, "hi", [-1.0, 0.0, 0.0])
+    monkeypatch.setitem(VECTORS, "hello", [-1.0, 0.0, 0.0])
+    monkeypatch.setitem(VECTORS, "pay for a booking", [1.0, 0.5, 0.0])
+    path = tmp_path / "intents.json"
+    path.write_text(json.dumps({"intents": [
+        {"tag": "booking_request_en", "category": "booking", "patterns": INTENTS["booking_request_en"][1]},
+        {"tag": "items", "category": "products",
+         "patterns": ["how much to book", "booking prices", "what do you sell", "how do i transfer money"]},
+        {"tag": "greeting_en", "category": "greeting", "patterns": ["hi", "hello"]},
+    ]}))
+
+    result = make_fallback(str(path), k=3, min_confidence=0.0, min_similarity=0.0).classify("pay for a booking")
+    assert result["intent"] == "faq"
+    assert result["centroid_intent"] == "booking"
+    assert not result["confident"]
+
+
+def test_dissimilar_query_is_not_confident(intents_path):
+    result = make_fallback(intents_path).classify("far from everything")
+    assert result["confidence"] == 0.0
+    assert not result["confident"]
+
+
+def test_patterns_are_routed_like_the_classifier(intents_path):
+    fallback = make_fallback(intents_path)
+    routes = {tag: fallback.categories[label] for tag, label in zip(fallback.tags, fallback.labels)}
+    assert routes == {
+        "booking_request_en": "booking",
+        "items": "faq",
+        "transfer_info_en": "faq",
+        "greeting_en": "general",
+    }
+
+
+def test_singleton_is_built_once_under_concurrent_first_calls(monkeypatch):
+    built = []
+
+    class SlowFallback:
+        def __init__(self):
+            built.append(self)
+            time.sleep(0.05)
+
+    monkeypatch.setattr(knn_fallback, "EmbeddingIntentFallback", SlowFallback)
+    monkeypatch.setattr(knn_fallback, "_fallback_instance", None)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(knn_fallback.get_intent_fallback())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(built) == 1
+    assert all(result is built[0] for result in results)
@@ -0,0 +1,133 @@
+import hashlib
+import os
+import shutil
+
+import pytest
+
+from app.config import settings
+from app.core.intent_layer.model_registry import IntentModelRegistry
+
+WEIGHTS_PATH = os.path.join(settings.MODEL_DIR, "intent_model.npz")
+
+pytestmark = pytest.mark.skipif(not os.path.exists(WEIGHTS_PATH), reason="intent_model.npz not available")
+
+
+def copy_model(tmp_path, name):
+    path = str(tmp_path / name)
+    shutil.copyfile(WEIGHTS_PATH, path)
+    return path
+
+
+def write_checksum(path, digest=None):
+    with open(path, "rb") as f:
+        digest = digest or hashlib.sha256(f.read()).hexdigest()
+    with open(f"{path}.sha256", "w", encoding="utf-8") as f:
+        f.write(f"{digest}  {os.path.basename(path)}\n")
+
+
+def touch(path, step):
+    """Change the file's mtime, as a trainer rewriting it would."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + step * 1_000_000_000))
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return IntentModelRegistry(copy_model(tmp_path, "active.npz"), backend="numpy")
+
+
+def test_reload_swaps_in_the_new_version(registry, tmp_path):
+    original = registry.active
+    candidate = copy_model(tmp_path, "candidate.npz")
+    write_checksum(candidate)
+
+    info = registry.reload(candidate)
+
+    assert info["model_path"] == candidate
+    assert registry.active is not original
+    assert registry.reloads == 1
+    status = registry.get_status()
+    assert status["previous"]["model_path"] == str(tmp_path / "active.npz")
+    assert status["last_error"] is None
+    # A request that already holds the old classifier can still finish on it
+    assert original.get_intent_details("hello")["intent"]
+
+
+def test_checksum_mismatch_keeps_the_active_model(registry, tmp_path):
+    original = registry.active
+    candidate = copy_model(tmp_path, "candidate.npz")
+    write_checksum(candidate, digest="0" * 64)
+
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        registry.reload(candidate)
+
+    assert registry.active is original
+    assert registry.reloads == 0
+    assert "Checksum mismatch" in registry.get_status()["last_error"]
+
+
+def test_unloadable_file_keeps_the_active_model(registry, tmp_path):
+    original = registry.active
+    broken = tmp_path / "broken.npz"
+    broken.write_bytes(b"not a model")
+
+    with pytest.raises(Exception):
+        registry.reload(str(broken))
+    assert registry.active is original
+
+
+def test_rollback_restores_the_previous_version(registry, tmp_path):
+    with pytest.raises(ValueError, match="No previous"):
+        registry.rollback()
+
+    original = registry.active
+    registry.reload(copy_model(tmp_path, "candidate.npz"))
+    replacement = registry.active
+
+    assert registry.rollback()["model_path"] == str(tmp_path / "active.npz")
+    assert registry.active is original
+    # Rolling back again returns to the replacement
+    registry.rollback()
+    assert registry.active is replacement
+
+
+class ScriptedPolls:
+    """Stands in for the watcher's stop event: runs one step per poll, then stops"""
+
+    def __init__(self, steps):
+        self.steps = iter(steps)
+
+    def wait(self, interval):
+        step = next(self.steps, None)
+        if step is None:
+            return True
+        step()
+        return False
+
+
+def test_watcher_reloads_once_the_file_is_stable_for_one_poll(registry, monkeypatch):
+    path = registry.get_status()["active"]["model_path"]
+    reloads = []
+    monkeypatch.setattr(registry, "reload", lambda *args: reloads.append(args))
+
+    def expect(count):
+        return lambda: None if len(reloads) == count else pytest.fail(f"{len(reloads)} reloads, expected {count}")
+
+    registry._stop_watching = ScriptedPolls([
+        lambda: None,                 # poll 1: unchanged
+        lambda: touch(path, 1),       # poll 2: changed -> pending
+        lambda: touch(path, 2),       # poll 3: still changing -> pending again
+        expect(0),                    # poll 4: stable for one poll -> reload
+        expect(1),
+    ])
+    registry._watch(interval=0)
+
+    assert reloads == [(path, "numpy")]
+
+
+def test_watcher_does_not_reload_an_unchanged_file(registry, monkeypatch):
+    reloads = []
+    monkeypatch.setattr(registry, "reload", lambda *args: reloads.append(args))
+    registry._stop_watching = ScriptedPolls([lambda: None] * 3)
+    registry._watch(interval=0)
+    assert reloads == []
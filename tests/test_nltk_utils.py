@@ -0,0 +1,90 @@
+import json
+import os
+
+import nltk
+import numpy as np
+import pytest
+from nltk.tokenize import NLTKWordTokenizer
+
+from utils.nltk_utils import BagOfWordsVectorizer, IGNORE_WORDS, fast_tokenize, stem, tokenize
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _has_punkt():
+    try:
+        nltk.data.find("tokenizers/punkt_tab/english/")
+        return True
+    except LookupError:
+        return False
+
+
+def reference_tokenize(sentence):
+    """
+    ``tokenize`` when the Punkt model is installed; otherwise the Treebank
+    tokenizer ``word_tokenize`` runs on each sentence, which gives the same
+    tokens for single-sentence text.
+    """
+    if _has_punkt():
+        return tokenize(sentence)
+    return NLTKWordTokenizer().tokenize(sentence.lower())
+
+
+@pytest.fixture(scope="module")
+def patterns():
+    with open(os.path.join(ROOT, "data", "intents.json"), "r", encoding="utf-8") as f:
+        intents = json.load(f)["intents"]
+    return [pattern for intent in intents for pattern in intent["patterns"]]
+
+
+@pytest.fixture(scope="module")
+def model_words():
+    return [str(word) for word in np.load(os.path.join(ROOT, "models", "intent_model.npz"))["all_words"]]
+
+
+def test_patterns_tokenize_identically(patterns):
+    mismatches = [
+        (pattern, reference_tokenize(pattern), fast_tokenize(pattern))
+        for pattern in patterns
+        if reference_tokenize(pattern) != fast_tokenize(pattern)
+    ]
+    assert mismatches == []
+
+
+def test_patterns_give_identical_bag_of_words(patterns, model_words):
+    # The shipped model's vocabulary plus every stem either tokenizer produces
+    vocabulary = sorted(set(model_words) | {
+        stem(token)
+        for pattern in patterns
+        for token in reference_tokenize(pattern) + fast_tokenize(pattern)
+        if token not in IGNORE_WORDS
+    })
+    vectorizer = BagOfWordsVectorizer(vocabulary)
+
+    expected = vectorizer.transform_batch([reference_tokenize(pattern) for pattern in patterns])
+    actual = vectorizer.transform_batch([fast_tokenize(pattern) for pattern in patterns])
+    assert np.array_equal(expected, actual)
+
+
+@pytest.mark.parametrize("sentence, tokens", [
+    ("Hi Mr. Otieno, pick me at 3 p.m. tomorrow",
+     ["hi", "mr.", "otieno", ",", "pick", "me", "at", "3", "p.m.", "tomorrow"]),
+    ("Is it open at 5 p.m.?", ["is", "it", "open", "at", "5", "p.m.", "?"]),
+    ("See you at 9 a.m.", ["see", "you", "at", "9", "a.m", "."]),
+    ("e.g. cbd", ["e.g.", "cbd"]),
+    ("I can't, gonna wait", ["i", "ca", "n't", ",", "gon", "na", "wait"]),
+    ('She said "hi"', ["she", "said", "``", "hi", "''"]),
+])
+def test_treebank_rules(sentence, tokens):
+    assert fast_tokenize(sentence) == tokens
+    assert NLTKWordTokenizer().tokenize(sentence.lower()) == tokens
+
+
+# Known divergences: Punkt knows more abbreviations than _ABBREVIATIONS, and
+# the Treebank tokenizer alone never splits a period inside the text
+@pytest.mark.parametrize("sentence, fast_tokens", [
+    ("approx. 5km away", ["approx", ".", "5km", "away"]),
+    ("I need a cab. now please", ["i", "need", "a", "cab", ".", "now", "please"]),
+])
+def test_known_divergences(sentence, fast_tokens):
+    assert fast_tokenize(sentence) == fast_tokens
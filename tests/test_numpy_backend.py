@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.core.intent_layer.numpy_backend import NumpyIntentBackend, export_numpy_weights, softmax
+
+MODEL_PATH = os.path.join(settings.MODEL_DIR, "intent_model.pth")
+
+
+def test_softmax_is_stable_for_large_logits():
+    probs = softmax(np.array([[1000.0, 1000.0, -1000.0]], dtype=np.float32))
+    assert np.allclose(probs, [[0.5, 0.5, 0.0]])
+
+
+def test_missing_weights_point_to_the_export_command(tmp_path):
+    with pytest.raises(FileNotFoundError, match="numpy_backend"):
+        NumpyIntentBackend(str(tmp_path / "missing.npz"))
+
+
+@pytest.fixture(scope="module")
+def backends(tmp_path_factory):
+    pytest.importorskip("torch")
+    if not os.path.exists(MODEL_PATH):
+        pytest.skip("intent_model.pth not available")
+    from app.core.intent_layer.torch_backend import TorchIntentBackend
+
+    weights_path = str(tmp_path_factory.mktemp("weights") / "intent_model.npz")
+    export_numpy_weights(MODEL_PATH, weights_path)
+    return TorchIntentBackend(MODEL_PATH), NumpyIntentBackend(weights_path)
+
+
+def test_export_keeps_vocabulary_and_tags(backends):
+    torch_backend, numpy_backend = backends
+    assert numpy_backend.all_words == list(torch_backend.all_words)
+    assert numpy_backend.tags == list(torch_backend.tags)
+    assert (numpy_backend.input_size, numpy_backend.output_size) == (
+        torch_backend.input_size, torch_backend.output_size,
+    )
+
+
+def test_numpy_matches_torch_probabilities(backends):
+    torch_backend, numpy_backend = backends
+    rng = np.random.default_rng(0)
+
+    # Bag-of-words rows (sparse 0/1), an empty message and dense noise
+    bow = (rng.random((64, numpy_backend.input_size)) < 0.02).astype(np.float32)
+    empty = np.zeros((1, numpy_backend.input_size), dtype=np.float32)
+    dense = rng.random((8, numpy_backend.input_size), dtype=np.float32)
+    X = np.vstack([bow, empty, dense])
+
+    expected = torch_backend.predict_proba(X)
+    actual = numpy_backend.predict_proba(X)
+
+    assert actual.dtype == np.float32
+    np.testing.assert_allclose(actual, expected, atol=1e-5)
+    assert (actual.argmax(axis=1) == expected.argmax(axis=1)).all()
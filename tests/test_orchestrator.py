@@ -0,0 +1,184 @@
+import asyncio
+
+import pytest
+
+orchastrator = pytest.importorskip("app.core.conversation.orchastrator")
+
+from app.core.conversation.stage_scheduler import StageScheduler
+
+
+def make_orchestrator():
+    """Orchestrator without agents, tools or stores (only the local parts)"""
+    orchestrator = orchastrator.ConversationOrchestrator.__new__(orchastrator.ConversationOrchestrator)
+    orchestrator.tools = {}
+    orchestrator.metrics = orchastrator.turn_metrics
+    return orchestrator
+
+
+def test_only_local_stages_start_speculatively(monkeypatch):
+    monkeypatch.setattr(orchastrator.settings, "SPECULATIVE_STAGES", True)
+    orchestrator = make_orchestrator()
+    retrieved = []
+
+    async def retrieve(message):
+        retrieved.append(message)
+        return ["doc"]
+
+    orchestrator._retrieve_faq_docs = retrieve
+
+    async def turn():
+        stages = StageScheduler()
+        orchestrator._start_speculative_stages(stages, "book a van", ["booking", "weather", "faq"])
+        started = [name for name in ("rag_docs", "booking_slots", "weather_city") if stages.has(name)]
+        docs = await stages.take("rag_docs")
+        return started, docs
+
+    assert asyncio.run(turn()) == (["rag_docs"], ["doc"])
+    assert retrieved == ["book a van"]
+
+
+class ScriptedAgent:
+    """Replies from a script and records which prompts were dropped from the completion cache"""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.prompts = []
+        self.forgotten = []
+
+    async def arun(self, prompt):
+        self.prompts.append(prompt)
+        return self.replies.pop(0)
+
+    def forget_completion(self, prompt):
+        self.forgotten.append(prompt)
+
+
+class FakeAgentManager:
+    def __init__(self, agent):
+        self.agent = agent
+
+    def get_agent(self, name):
+        return self.agent
+
+
+def make_verifier(replies):
+    orchestrator = make_orchestrator()
+    orchestrator.intent_handlers = dict.fromkeys(["faq", "booking", "payment", "weather", "general"])
+    agent = ScriptedAgent(replies)
+    orchestrator.agent_manager = FakeAgentManager(agent)
+    return orchestrator, agent
+
+
+CLASSIFIER_RESULT = {"category": "general", "category_confidence": 0.4, "category_probabilities": {"general": 0.4}}
+
+
+def test_rejected_replies_are_dropped_from_the_completion_cache():
+    orchestrator, agent = make_verifier(["not json", "still not json"])
+    asyncio.run(orchestrator._classify_and_extract_with_agent("hi", CLASSIFIER_RESULT))
+    assert agent.forgotten == agent.prompts
+
+
+def test_accepted_replies_stay_cached():
+    orchestrator, agent = make_verifier(['{"intent": "general", "confidence": 0.9, "slots": null, "city": null}'])
+    asyncio.run(orchestrator._classify_and_extract_with_agent("hi", CLASSIFIER_RESULT))
+    assert agent.forgotten == []
+
+
+def booking_turn(data, message):
+    from app.core.conversation.conversation_manager import ConversationState
+    from app.core.gazetteer import get_gazetteer
+
+    orchestrator = make_orchestrator()
+    orchestrator.gazetteer = get_gazetteer()
+    state = ConversationState(user_id="u1", session_id="s1")
+    state.start_flow("booking", dict.fromkeys(orchastrator.ConversationOrchestrator.BOOKING_SLOTS))
+    state.flow_data.update(data)
+    response = asyncio.run(orchestrator._continue_booking_flow(state, message))
+    return state.flow_data, response
+
+
+def test_booking_reply_fills_only_the_slots_it_states():
+    data, response = booking_turn({}, "tomorrow at 3pm")
+    assert data["vehicle_type"] is None
+    assert data["date"] and data["time"] == "15:00"
+    assert response.message.startswith("🚗 What type of vehicle")
+
+
+def test_booking_reply_answers_the_asked_slot():
+    data, _ = booking_turn({"vehicle_type": "van"}, "Westlands tomorrow")
+    assert data["pickup_location"] == "Westlands, Nairobi"
+    assert data["date"]
+
+    data, _ = booking_turn({"vehicle_type": "van", "pickup_location": "Karen"}, "Nairobi")
+    assert data["dropoff_location"] == "Nairobi"
+
+
+VALID_REPLY = '{"intent": "booking", "confidence": 0.8, "slots": {"vehicle_type": "van"}, "city": null}'
+
+
+def test_invalid_reply_is_repaired():
+    orchestrator, agent = make_verifier(["booking, 0.8", "```json\n" + VALID_REPLY + "\n```"])
+    result = asyncio.run(orchestrator._classify_and_extract_with_agent("book a van", CLASSIFIER_RESULT))
+
+    assert result == {"intent": "booking", "confidence": 0.8, "slots": {"vehicle_type": "van"}, "city": None}
+    assert len(agent.prompts) == 2
+    assert "booking, 0.8" in agent.prompts[1] and "not valid JSON" in agent.prompts[1]
+
+
+def test_failed_repair_falls_back_to_the_classifier():
+    orchestrator, agent = make_verifier(["booking, 0.8", '{"intent": "booking"}'])
+    result = asyncio.run(orchestrator._classify_and_extract_with_agent("book a van", CLASSIFIER_RESULT))
+
+    assert result == {"intent": "general", "confidence": 0.4, "slots": None, "city": None}
+    assert len(agent.prompts) == 2
+
+
+class ThreadRecordingTool:
+    def __init__(self, result):
+        self.result = result
+        self.threads = []
+
+    def _run(self, *args, **kwargs):
+        import threading
+        self.threads.append(threading.get_ident())
+        return self.result
+
+
+def test_tools_run_off_the_event_loop():
+    import threading
+    from app.core.conversation.conversation_manager import ConversationState
+
+    orchestrator = make_orchestrator()
+    weather = ThreadRecordingTool("Sunny")
+    booking = ThreadRecordingTool("Booked")
+    orchestrator.tools = {"get_weather": weather, "vehicle_booking": booking}
+    orchestrator.rule_matcher = orchastrator.get_rule_matcher()
+
+    state = ConversationState(user_id="u1", session_id="s1")
+    state.start_flow("booking", {"vehicle_type": "van"})
+    state.flow_step = "awaiting_confirmation"
+
+    async def turn():
+        stages = StageScheduler()
+        stages.provide("weather_city", "Nairobi")
+        weather_response = await orchestrator._handle_weather(state, "weather?", "weather", 0.9, stages=stages)
+        booking_response = await orchestrator._continue_booking_flow(state, "yes")
+        return weather_response, booking_response, threading.get_ident()
+
+    weather_response, booking_response, loop_thread = asyncio.run(turn())
+    assert weather_response.message == "Sunny"
+    assert booking_response.message == "✅ Booked"
+    assert loop_thread not in weather.threads + booking.threads
+
+
+def test_direct_replies_follow_the_message_language():
+    from app.core.intent_layer.direct_responses import DirectResponder
+
+    orchestrator = make_orchestrator()
+    orchestrator.direct_responder = DirectResponder(min_confidence=0.75)
+    swahili = set(orchestrator.direct_responder.responses["greeting_sw"])
+
+    # Clearly Swahili message, classified as the English greeting
+    assert orchestrator._direct_reply("greeting_en", "habari, naomba nataka safari") in swahili
+    # Too short for detect_language(): its "en" fallback does not override the tag
+    assert orchestrator._direct_reply("greeting_sw", "mambo") in swahili
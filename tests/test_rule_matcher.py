@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from app.core.intent_layer.rule_matcher import KeywordRuleMatcher
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return KeywordRuleMatcher()
+
+
+def intent(matcher, text):
+    result = matcher.match(text)
+    return result["intent"] if result else None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("yes", "affirm"),
+    ("  Yes!! ", "affirm"),
+    ("Sawa sawa", "affirm"),
+    ("ndio.", "affirm"),
+    ("hapana", "deny"),
+    ("Asante sana", "thanks_sw"),
+    ("thank you so much!", "thanks_en"),
+    ("Niaje msee", "greeting_sw"),
+    ("good morning", "greeting_en"),
+    ("tutaonana baadaye", "goodbye_sw"),
+])
+def test_keywords(matcher, text, expected):
+    assert intent(matcher, text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "yes please book",
+    "yes I want to book a car",
+    "no problem, what are your prices",
+    "hi, I need a van tomorrow",
+    "yesterday",
+    "okay google",
+    "",
+    "?!",
+])
+def test_only_whole_messages_match(matcher, text):
+    assert matcher.match(text) is None
+
+
+@pytest.mark.parametrize("text", ["0712345678", "+254712345678", "254112345678", "712345678"])
+def test_phone_numbers(matcher, text):
+    assert matcher.match(text) == {
+        "rule": "phone_number", "intent": "phone_number", "category": "general", "value": text.lower(),
+    }
+
+
+@pytest.mark.parametrize("text, value", [
+    ("500", "500"),
+    ("1,500", "1,500"),
+    ("ksh 2,000.50", "ksh 2,000.50"),
+    ("Ksh.300", "ksh.300"),
+    ("250 bob", "250 bob"),
+    ("1000/=", "1000/="),
+])
+def test_amounts(matcher, text, value):
+    result = matcher.match(text)
+    assert result["intent"] == "amount"
+    assert result["value"] == value
+
+
+@pytest.mark.parametrize("text", ["0812345678", "07123456789"])
+def test_not_phone_numbers(matcher, text):
+    assert intent(matcher, text) != "phone_number"
+
+
+@pytest.mark.parametrize("text", ["1,50", "500 dollars", "ksh"])
+def test_not_amounts(matcher, text):
+    assert matcher.match(text) is None
+
+
+def test_lastgroup_names_the_rule_in_file_order(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"rules": [
+        {"name": "short", "intent": "a", "category": "general", "keywords": ["ok"]},
+        {"name": "digits", "intent": "b", "category": "payment", "regex": r"\d+"},
+        {"name": "longer", "intent": "c", "category": "general", "keywords": ["ok ok", "123"]},
+    ]}))
+    matcher = KeywordRuleMatcher(str(path))
+
+    assert matcher.match("ok")["rule"] == "short"
+    # "ok ok" only fullmatches the later rule
+    assert matcher.match("ok ok")["rule"] == "longer"
+    # Both rules match the whole message: the earlier one wins
+    assert matcher.match("123") == {"rule": "digits", "intent": "b", "category": "payment", "value": "123"}
+
+    stats = matcher.get_stats()
+    assert stats["lookups"] == 3
+    assert stats["by_rule"] == {"short": 1, "longer": 1, "digits": 1}
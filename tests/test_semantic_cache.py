@@ -0,0 +1,141 @@
+import numpy as np
+import pytest
+
+from app.core.conversation import semantic_cache
+from app.core.conversation.semantic_cache import SemanticResponseCache, parse_thresholds
+
+
+class FakeEmbeddings:
+    """Fixed vectors for known queries."""
+
+    VECTORS = {
+        "what are your prices": [1.0, 0.0, 0.0],
+        "how much do you charge": [0.95, 0.31, 0.0],  # cosine ~0.95 to the above
+        "do you operate at night": [0.0, 1.0, 0.0],
+        "habari yako": [0.0, 0.0, 1.0],
+    }
+
+    def embed_query(self, text):
+        return self.VECTORS[text]
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(semantic_cache.time, "time", clock)
+    return clock
+
+
+def make_cache(**kwargs):
+    options = dict(threshold=0.9, thresholds={}, ttl_seconds=60, max_entries=10, watch_paths=[])
+    options.update(kwargs)
+    return SemanticResponseCache(FakeEmbeddings(), **options)
+
+
+def remember(cache, query, intent="faq", language="en"):
+    cache.store(cache.embed(query), intent, language, query, f"answer to {query}")
+
+
+def test_parse_thresholds():
+    assert parse_thresholds("faq=0.90, general:sw=0.96,") == {"faq": 0.9, "general:sw": 0.96}
+    assert parse_thresholds("") == {}
+
+
+def test_paraphrase_hits_within_scope(clock):
+    cache = make_cache()
+    remember(cache, "what are your prices")
+
+    hit = cache.lookup(cache.embed("how much do you charge"), "faq", "en")
+    assert hit["answer"] == "answer to what are your prices"
+    assert hit["similarity"] == pytest.approx(0.95, abs=0.01)
+    assert hit["hits"] == 1
+
+    assert cache.lookup(cache.embed("do you operate at night"), "faq", "en") is None
+    assert cache.lookup(cache.embed("how much do you charge"), "faq", "sw") is None
+    assert cache.lookup(cache.embed("how much do you charge"), "general", "en") is None
+
+
+def test_thresholds_per_intent_and_language(clock):
+    cache = make_cache(thresholds={"faq": 0.9, "faq:sw": 0.99})
+    assert cache.threshold_for("faq", "en") == 0.9
+    assert cache.threshold_for("faq", "sw") == 0.99
+    assert cache.threshold_for("general", "en") == 0.9
+
+    remember(cache, "what are your prices", language="sw")
+    assert cache.lookup(cache.embed("how much do you charge"), "faq", "sw") is None
+    assert cache.lookup(cache.embed("what are your prices"), "faq", "sw") is not None
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = make_cache(ttl_seconds=60)
+    remember(cache, "what are your prices")
+
+    clock.now += 59
+    assert cache.lookup(cache.embed("what are your prices"), "faq", "en") is not None
+    clock.now += 2
+    assert cache.lookup(cache.embed("what are your prices"), "faq", "en") is None
+
+    stats = cache.get_stats()
+    assert stats["expired"] == 1
+    assert stats["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = make_cache(max_entries=2)
+    remember(cache, "what are your prices")
+    remember(cache, "do you operate at night", intent="general")
+    # Touch the first entry so the second is least recently used
+    assert cache.lookup(cache.embed("what are your prices"), "faq", "en") is not None
+
+    remember(cache, "habari yako", intent="general", language="sw")
+
+    assert cache.lookup(cache.embed("what are your prices"), "faq", "en") is not None
+    assert cache.lookup(cache.embed("do you operate at night"), "general", "en") is None
+    assert cache.lookup(cache.embed("habari yako"), "general", "sw") is not None
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+
+
+def test_scope_grows_past_its_initial_capacity(clock):
+    cache = make_cache(max_entries=1000)
+    for i in range(100):
+        vector = np.array([np.cos(i / 100), np.sin(i / 100), 0.0], dtype=np.float32)
+        cache.store(vector, "faq", "en", f"q{i}", f"a{i}")
+    assert cache.get_stats()["entries"] == 100
+    assert cache.lookup(cache.embed("what are your prices"), "faq", "en")["query"] == "q0"
+
+
+def test_invalidate(clock):
+    cache = make_cache()
+    remember(cache, "what are your prices")
+    remember(cache, "do you operate at night", intent="general")
+
+    assert cache.invalidate("faq") == 1
+    assert cache.lookup(cache.embed("what are your prices"), "faq", "en") is None
+    assert cache.lookup(cache.embed("do you operate at night"), "general", "en") is not None
+    assert cache.invalidate() == 1
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_faq_answers_are_dropped_when_the_data_changes(tmp_path, clock):
+    faq = tmp_path / "faq_data.json"
+    faq.write_text("[]")
+    cache = make_cache(watch_paths=[str(faq)], check_interval=0)
+    remember(cache, "what are your prices")
+    remember(cache, "do you operate at night", intent="general")
+
+    assert cache.lookup(cache.embed("what are your prices"), "faq", "en") is not None
+    faq.write_text('[{"question": "new"}]')
+
+    assert cache.lookup(cache.embed("what are your prices"), "faq", "en") is None
+    assert cache.lookup(cache.embed("do you operate at night"), "general", "en") is not None
+    assert cache.get_stats()["invalidated_entries"] == 1
@@ -0,0 +1,94 @@
+import time
+from types import SimpleNamespace
+
+from app.core.intent_layer.shadow import ShadowEvaluator
+
+
+class FakeClassifier:
+    """Tags every text ``tag``, taking ``batch_ms`` per batch whatever its size."""
+
+    def __init__(self, tag, batch_ms):
+        self.tag = tag
+        self.batch_ms = batch_ms
+        self.batch_sizes = []
+        self.backend = SimpleNamespace(model_path=f"{tag}.pth")
+
+    def get_intent_details_batch(self, texts):
+        self.batch_sizes.append(len(texts))
+        time.sleep(self.batch_ms / 1000)
+        return [
+            {"intent": self.tag, "category": "general", "needs_llm_verification": False}
+            for _ in texts
+        ]
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def shadow_batches(active, candidate, batches):
+    shadow = ShadowEvaluator(candidate)
+    try:
+        for texts in batches:
+            shadow.observe_batch(texts, active.get_intent_details_batch(texts), active)
+        wait_for(lambda: shadow.get_report()["batches"] == len(batches))
+    finally:
+        shadow.stop()
+    return shadow
+
+
+def test_both_models_are_timed_on_the_live_batches():
+    # Long enough that sleep jitter stays well inside the latency gate
+    active = FakeClassifier("greeting", batch_ms=20)
+    candidate = FakeClassifier("greeting", batch_ms=20)
+    batches = [["hi"] * size for size in (1, 8, 1, 8, 2, 2)]
+
+    shadow = shadow_batches(active, candidate, batches)
+
+    # The live call plus the shadow re-timing, on the same batch sizes
+    assert candidate.batch_sizes == [1, 8, 1, 8, 2, 2]
+    assert sorted(active.batch_sizes) == sorted([1, 8, 1, 8, 2, 2] * 2)
+    decision = shadow.decision(min_samples=1, min_agreement=0.9, max_latency_ratio=1.5)
+    assert decision["report"]["batches"] == 6
+    assert decision["promote"], decision["reasons"]
+
+
+def test_slower_candidate_fails_the_latency_gate():
+    active = FakeClassifier("greeting", batch_ms=1)
+    candidate = FakeClassifier("greeting", batch_ms=20)
+
+    shadow = shadow_batches(active, candidate, [["hi", "hello"]] * 4)
+
+    decision = shadow.decision(min_samples=1, min_agreement=0.9, max_latency_ratio=2.0)
+    assert not decision["promote"]
+    assert any("p99 latency" in reason for reason in decision["reasons"])
+
+
+def test_disagreement_is_recorded_per_tag():
+    shadow = shadow_batches(FakeClassifier("greeting", 0), FakeClassifier("goodbye", 0), [["hi", "hey"]])
+
+    report = shadow.get_report()
+    assert report["tag_agreement"] == 0.0
+    assert report["category_agreement"] == 1.0
+    assert report["confusion"] == [{"active": "greeting", "candidate": "goodbye", "count": 2}]
+
+
+def test_stop_does_not_wait_for_a_full_queue():
+    active = FakeClassifier("greeting", batch_ms=0)
+    candidate = FakeClassifier("greeting", batch_ms=200)
+    shadow = ShadowEvaluator(candidate, max_queue=3)
+    for _ in range(10):
+        shadow.observe_batch(["hi"], active.get_intent_details_batch(["hi"]), active)
+    assert shadow.get_report()["dropped"] > 0
+
+    started = time.monotonic()
+    shadow.stop()
+    assert time.monotonic() - started < 1.0
+    assert not shadow._worker.is_alive()
+    assert shadow.get_report()["batches"] < 4
+
+    shadow.observe_batch(["hi"], [], active)
+    assert shadow.get_report()["pending"] <= 3
@@ -0,0 +1,104 @@
+import asyncio
+
+from app.core.conversation.metrics import TurnMetrics
+from app.core.conversation.stage_scheduler import StageScheduler
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def value_after(value, delay=0.0):
+    await asyncio.sleep(delay)
+    return value
+
+
+async def fail():
+    raise RuntimeError("retrieval down")
+
+
+def test_take_returns_the_stage_result_once():
+    async def turn():
+        stages = StageScheduler()
+        stages.start("rag_docs", value_after(["doc"]))
+        return await stages.take("rag_docs"), stages.has("rag_docs"), await stages.take("rag_docs")
+
+    assert run(turn()) == (["doc"], False, None)
+
+
+def test_take_of_a_failed_stage_returns_none():
+    metrics = TurnMetrics()
+
+    async def turn():
+        stages = StageScheduler(metrics)
+        stages.start("rag_docs", fail())
+        return await stages.take("rag_docs")
+
+    assert run(turn()) is None
+    assert metrics.snapshot()["speculative_stages"]["failed"] == 1
+
+
+def test_stage_never_started_falls_back_to_inline_work():
+    async def handler(stages):
+        docs = await stages.take("rag_docs")
+        if docs is None:
+            docs = await value_after(["inline doc"])
+        return docs
+
+    assert run(handler(StageScheduler())) == ["inline doc"]
+
+
+def test_starting_a_running_stage_again_is_ignored():
+    async def turn():
+        stages = StageScheduler()
+        stages.start("rag_docs", value_after("first"))
+        duplicate = value_after("second")
+        stages.start("rag_docs", duplicate)
+        # The duplicate coroutine is closed, not left un-awaited
+        assert duplicate.cr_frame is None
+        return await stages.take("rag_docs")
+
+    assert run(turn()) == "first"
+
+
+def test_cancel_except_cancels_and_counts_the_losers():
+    metrics = TurnMetrics()
+
+    async def turn():
+        stages = StageScheduler(metrics)
+        stages.start("rag_docs", value_after(["doc"], delay=10))
+        stages.start("weather_city", value_after("Nairobi", delay=10))
+        stages.start("booking_slots", value_after({"date": "2026-10-18"}))
+        losers = [stages._tasks["rag_docs"], stages._tasks["weather_city"]]
+
+        await stages.cancel_except(["booking_slots"])
+        await asyncio.sleep(0)
+        kept = await stages.take("booking_slots")
+        return kept, [task.cancelled() for task in losers], stages.has("rag_docs")
+
+    assert run(turn()) == ({"date": "2026-10-18"}, [True, True], False)
+    assert metrics.snapshot()["speculative_stages"] == {"started": 3, "cancelled": 2, "used": 1}
+
+
+def test_provide_replaces_a_running_stage():
+    async def turn():
+        stages = StageScheduler()
+        stages.start("booking_slots", value_after({"vehicle_type": "van"}, delay=10))
+        running = stages._tasks["booking_slots"]
+        stages.provide("booking_slots", {"vehicle_type": "SUV"})
+        await asyncio.sleep(0)
+        return await stages.take("booking_slots"), running.cancelled()
+
+    assert run(turn()) == ({"vehicle_type": "SUV"}, True)
+
+
+def test_close_cancels_everything_left():
+    async def turn():
+        stages = StageScheduler()
+        stages.start("rag_docs", value_after(["doc"], delay=10))
+        task = stages._tasks["rag_docs"]
+        await stages.close()
+        await asyncio.sleep(0)
+        return task.cancelled(), stages.has("rag_docs")
+
+    assert run(turn()) == (True, False)
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from app.core.agentic_layer.structured_output import (
+    StructuredOutputError,
+    intent_extraction_schema,
+    parse_intent_extraction,
+)
+
+INTENTS = ["faq", "booking", "payment", "weather", "general"]
+
+
+def reply(**fields):
+    data = {"intent": "booking", "confidence": 0.9, "slots": {}, "city": None}
+    data.update(fields)
+    return json.dumps(data)
+
+
+def test_valid_reply():
+    text = reply(intent=" Booking ", confidence=1, slots={"vehicle_type": "van", "date": None}, city="Nairobi")
+    assert parse_intent_extraction(text, INTENTS) == {
+        "intent": "booking",
+        "confidence": 1.0,
+        "slots": {"vehicle_type": "van"},
+        "city": "Nairobi",
+    }
+
+
+@pytest.mark.parametrize("fence", ["```json\n{}\n```", "```\n{}\n```", "  ```json {}```  "])
+def test_fenced_json(fence):
+    text = fence.replace("{}", reply(slots={"time": "15:00"}))
+    assert parse_intent_extraction(text, INTENTS)["slots"] == {"time": "15:00"}
+
+
+def test_reasoning_is_allowed_and_dropped():
+    assert "reasoning" not in parse_intent_extraction(reply(reasoning="mentions a van"), INTENTS)
+
+
+@pytest.mark.parametrize("text, message", [
+    ("Sure! " + reply(), "not valid JSON"),
+    (reply() + reply(), "not valid JSON"),
+    ("[1, 2]", "top level"),
+    (reply(extra=1), "unexpected fields: ['extra']"),
+    (reply(slots={"vehicle": "van"}), "unknown slots: ['vehicle']"),
+    (reply(slots=["van"]), "'slots' must be an object"),
+    (reply(intent="complaint"), "'intent' must be one of"),
+    (reply(intent=None), "'intent' must be one of"),
+    (reply(confidence=True), "'confidence'"),
+    (reply(confidence=1.5), "'confidence'"),
+    (reply(confidence=-0.1), "'confidence'"),
+    (reply(confidence="0.9"), "'confidence'"),
+    (reply(slots={"date": 18}), "'slots.date' must be a string or null"),
+    (reply(city=["Nairobi"]), "'city' must be a string or null"),
+])
+def test_invalid_replies(text, message):
+    with pytest.raises(StructuredOutputError, match=message.replace("[", r"\[").replace("]", r"\]")):
+        parse_intent_extraction(text, INTENTS)
+
+
+@pytest.mark.parametrize("value", ["unknown", "NULL", "none", "N/A", "", "   "])
+def test_not_mentioned_strings_become_none(value):
+    result = parse_intent_extraction(reply(slots={"pickup_location": value}, city=value), INTENTS)
+    assert result["slots"] == {}
+    assert result["city"] is None
+
+
+def test_schema_lists_the_intents():
+    schema = intent_extraction_schema(INTENTS)
+    assert "one of: faq, booking, payment, weather, general" in schema
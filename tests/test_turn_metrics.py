@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from app.core.agentic_layer import completion_cache
+from app.core.agentic_layer.agents.base_agent import BaseAgent
+from app.core.conversation.metrics import TurnMetrics, turn_metrics
+
+
+class EchoAgent(BaseAgent):
+    def run(self, message: str, **kwargs) -> str:
+        return f"echo: {message}"
+
+
+class LocalAgent(EchoAgent):
+    calls_llm = False
+
+
+@pytest.fixture(autouse=True)
+def no_completion_cache(monkeypatch):
+    monkeypatch.setattr(completion_cache.settings, "LLM_CACHE_ENABLED", False)
+
+
+def test_llm_calls_are_counted_per_turn():
+    async def turn():
+        turn_metrics.start_turn()
+        agent = EchoAgent("echo")
+        await agent.arun("hi")  # default arun: run on a worker thread
+        await asyncio.ensure_future(agent.arun("from a stage task"))
+        LocalAgent("local").run("not an LLM")
+        return turn_metrics.turn_llm_calls()
+
+    assert asyncio.run(turn()) == 2
+
+
+def test_turns_start_from_zero():
+    async def turn(calls):
+        turn_metrics.start_turn()
+        for _ in range(calls):
+            EchoAgent("echo").run("hi")
+        return turn_metrics.turn_llm_calls()
+
+    assert asyncio.run(turn(3)) == 3
+    assert asyncio.run(turn(0)) == 0
+
+
+def test_record_counts_each_turn_once():
+    metrics = TurnMetrics()
+    metrics.record("multi_turn", llm_free=True)
+    metrics.record("booking", llm_free=False)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["turns"] == 2
+    assert snapshot["llm_free_turns"] == 1
+    assert snapshot["by_path"] == {"multi_turn": 1, "booking": 1}
@@ -3,20 +3,28 @@ Data extraction utilities for workflows.
 """
 
 import re
-from typing import Optional, Tuple
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+# Patterns used by the single-entity helpers, compiled once at import
+_PHONE_PATTERNS = [
+    re.compile(r"\b(254)?([17]\d{8})\b"),  # 254712345678 or 712345678
+    re.compile(r"\b\+?(254)([17]\d{8})\b"),  # +254712345678
+    re.compile(r"\b(0[17]\d{8})\b"),  # 0712345678
+]
+_FLEET_PATTERN = re.compile(r"\b([a-zA-Z]{2}\d{2,4})\b")
+_AMOUNT_PATTERN = re.compile(r"(?:ksh?\.?\s*)?(\d+(?:,\d{3})*(?:\.\d{2})?)")
+_LOCATION_PAIR_PATTERNS = [
+    re.compile(r"from\s+([a-zA-Z\s]+?)\s+to\s+([a-zA-Z\s]+?)(?:\s|$|\.)"),
+    re.compile(r"([a-zA-Z\s]+?)\s+to\s+([a-zA-Z\s]+?)(?:\s|$|\.)"),
+]
 
 
 def extract_phone_number(text: str) -> Optional[str]:
     """Extract Kenyan phone number from text."""
     # Kenyan phone patterns: 07xx, 01xx, +254, 254
-    patterns = [
-        r"\b(254)?([17]\d{8})\b",  # 254712345678 or 712345678
-        r"\b\+?(254)([17]\d{8})\b",  # +254712345678
-        r"\b(0[17]\d{8})\b",  # 0712345678
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, text)
+    for pattern in _PHONE_PATTERNS:
+        match = pattern.search(text)
         if match:
             if len(match.groups()) == 2:
                 prefix, number = match.groups()
@@ -37,16 +45,14 @@ def extract_phone_number(text: str) -> Optional[str]:
 
 def extract_fleet_number(text: str) -> Optional[str]:
     """Extract fleet number from text (format: XX00)."""
-    pattern = r"\b([a-zA-Z]{2}\d{2,4})\b"
-    match = re.search(pattern, text.lower())
+    match = _FLEET_PATTERN.search(text.lower())
     return match.group(1).upper() if match else None
 
 
 def extract_amount(text: str) -> Optional[float]:
     """Extract monetary amount from text."""
     # Match patterns like: 500, KSh 500, 500 KSh, Ksh500
-    pattern = r"(?:ksh?\.?\s*)?(\d+(?:,\d{3})*(?:\.\d{2})?)"
-    match = re.search(pattern, text.lower())
+    match = _AMOUNT_PATTERN.search(text.lower())
     if match:
         amount_str = match.group(1).replace(",", "")
         return float(amount_str)
@@ -56,16 +62,309 @@ def extract_amount(text: str) -> Optional[float]:
 def extract_location_pair(text: str) -> Tuple[Optional[str], Optional[str]]:
     """Extract origin and destination from text."""
     # Patterns: "from X to Y", "X to Y"
-    patterns = [
-        r"from\s+([a-zA-Z\s]+?)\s+to\s+([a-zA-Z\s]+?)(?:\s|$|\.)",
-        r"([a-zA-Z\s]+?)\s+to\s+([a-zA-Z\s]+?)(?:\s|$|\.)",
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, text.lower())
+    for pattern in _LOCATION_PAIR_PATTERNS:
+        match = pattern.search(text.lower())
         if match:
             origin = match.group(1).strip().title()
             destination = match.group(2).strip().title()
             return origin, destination
 
     return None, None
+
+
+# ---------------------------
+# Single-pass entity extraction
+# ---------------------------
+
+# Canonical vehicle type for every way users name it
+VEHICLE_TYPES = {
+    "sedan": "sedan", "saloon": "sedan", "salon": "sedan", "probox": "sedan",
+    "suv": "SUV", "prado": "SUV", "land cruiser": "SUV", "4x4": "SUV",
+    "van": "van", "minivan": "van", "noah": "van", "voxy": "van", "hiace": "van",
+    "shuttle": "shuttle", "matatu": "matatu", "nganya": "matatu",
+    "minibus": "minibus", "bus": "bus", "basi": "bus",
+    "truck": "truck", "lorry": "truck", "pickup truck": "truck", "canter": "truck",
+    "motorbike": "motorbike", "motorcycle": "motorbike", "boda boda": "motorbike", "boda": "motorbike",
+    "tuk tuk": "tuk-tuk", "tuktuk": "tuk-tuk", "tuk-tuk": "tuk-tuk",
+}
+
+# Vehicle words that name no type ("I want to book a car" still gets asked which type)
+GENERIC_VEHICLES = frozenset({"car", "vehicle", "gari"})
+
+PAYMENT_METHODS = {
+    "m-pesa": "M-Pesa", "mpesa": "M-Pesa", "airtel money": "Airtel Money",
+    "t-kash": "T-Kash", "tkash": "T-Kash", "credit card": "card", "debit card": "card",
+    "card": "card", "bank transfer": "bank transfer", "bank": "bank transfer",
+}
+
+# Cities recognised without the LLM (weather lookups, bare destinations)
+CITIES = (
+    "Nairobi", "Mombasa", "Kisumu", "Nakuru", "Eldoret", "Thika", "Malindi", "Kitale",
+    "Garissa", "Nyeri", "Machakos", "Meru", "Kakamega", "Naivasha", "Nanyuki", "Kericho",
+    "Embu", "Lamu", "Kisii", "Narok", "Voi", "Diani", "Kilifi", "Kitui", "Bungoma",
+    "Busia", "Isiolo", "Marsabit", "Lodwar", "Wajir", "Mandera", "Kajiado", "Kiambu",
+    "Murang'a", "Nyahururu", "Kapenguria", "Homa Bay", "Migori", "Bomet", "Webuye",
+    "Kampala", "Kigali", "Arusha", "Dar es Salaam", "Moshi", "Addis Ababa",
+)
+
+WEEKDAYS = {
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3, "friday": 4, "saturday": 5, "sunday": 6,
+    "jumatatu": 0, "jumanne": 1, "jumatano": 2, "alhamisi": 3, "ijumaa": 4, "jumamosi": 5, "jumapili": 6,
+}
+
+RELATIVE_DAYS = {
+    "today": 0, "leo": 0, "tonight": 0, "usiku wa leo": 0,
+    "tomorrow": 1, "kesho": 1,
+    "day after tomorrow": 2, "the day after tomorrow": 2, "keshokutwa": 2, "kesho kutwa": 2,
+}
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+# Swahili clock: "saa moja" is the first hour after 6 (7 o'clock)
+SWAHILI_HOURS = {
+    "moja": 1, "mbili": 2, "tatu": 3, "nne": 4, "tano": 5, "sita": 6, "saba": 7,
+    "nane": 8, "tisa": 9, "kumi": 10, "kumi na moja": 11, "kumi na mbili": 12,
+}
+
+# Words that carry no slot information ("I want to book a van" has nothing left to ask the LLM about)
+FILLER_WORDS = frozenset("""
+a an the i i'd i'm im am me my we us our you please pls kindly want wanna would like need needs
+to for of in on at and or with is are be can could will book booking hire rent reserve get
+ride trip travel go going help hi hello hey nataka naomba tafadhali gari safari kubook na ya
+""".split())
+
+
+# Words a place name never contains: verbs, pronouns and connectors ("going
+# to book a car" names no destination); vehicle words are excluded as well
+NON_PLACE_WORDS = frozenset("""
+a an i me my you your we us our it this that to and or then but so because with for at on by from
+in into via using please pls tafadhali kutoka hadi mpaka kwenda na book booking get go going come take
+catch hire rent reserve ride travel pick drop pay send need want wanna like have be see check make
+order call
+""".split())
+
+# Words after which "to <place>" is a destination ("go to westlands", "ride
+# to cbd", "take me to jkia", "a van to karen")
+MOVEMENT_WORDS = frozenset("""
+go goes going went get getting ride drive driving travel travelling traveling head heading headed
+move moving me us lift trip taxi cab
+""".split())
+
+
+def _alternation(words) -> str:
+    # Longest first so "boda boda" wins over "boda", "keshokutwa" over "kesho"
+    return "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+_MONTH_NAMES = r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?" \
+               r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+_WEEKDAY_NAMES = _alternation(WEEKDAYS)
+_DATE_WORDS = _alternation(RELATIVE_DAYS)
+_VEHICLE_WORDS = _alternation(set(VEHICLE_TYPES) | GENERIC_VEHICLES)
+_NOT_PLACE = rf"(?:{_alternation(NON_PLACE_WORDS)}|(?:{_VEHICLE_WORDS})s?)\b"
+# Words of a place name, none of them a verb, filler or vehicle word; an
+# article in front is not part of the name ("to the airport")
+_PLACE_WORD = rf"(?!{_NOT_PLACE})[a-z][a-z'’.\-]*"
+_PLACE = rf"{_PLACE_WORD}(?:\s+{_PLACE_WORD})*?"
+_ARTICLE = r"(?:the\s+)?"
+# Where a place name ends: a date/time word, a non-place word, punctuation, a number or the end
+_PLACE_END = (
+    rf"(?=\s+(?:around|before|after|next|saa|{_DATE_WORDS}|{_WEEKDAY_NAMES})\b"
+    rf"|\s+{_NOT_PLACE}|\s*[,.!?;]|\s+\d|\s*$)"
+)
+# "to" right after a movement word (fixed-width lookbehinds, one per word)
+_MOVEMENT_TO = "(?:" + "|".join(rf"(?<=\b{re.escape(word)} )" for word in sorted(
+    MOVEMENT_WORDS | set(VEHICLE_TYPES) | GENERIC_VEHICLES, key=len, reverse=True
+)) + r")to"
+
+_ENTITY_PATTERN = re.compile("|".join([
+    r"(?P<phone>(?<![\d+])(?:\+?254|0)?[17]\d{8}(?!\d))",
+    r"(?P<amount>\b(?:kshs?|kes|sh)\.?\s*\d[\d,]*(?:\.\d{1,2})?"
+    r"|\b\d[\d,]*(?:\.\d{1,2})?\s*(?:kshs?|kes|bob|shillings?|/=))",
+    r"(?P<time>\b(?:1[0-2]|0?[1-9])(?::[0-5]\d)?\s*(?:am|pm|a\.m\.|p\.m\.)"
+    r"|\b(?:[01]?\d|2[0-3]):[0-5]\d\b|\bnoon\b|\bmidnight\b"
+    rf"|\bsaa\s+(?:{_alternation(SWAHILI_HOURS)})\b(?:\s+(?:asubuhi|mchana|jioni|usiku))?)",
+    rf"(?P<date>\b(?:(?:next|this|coming)\s+)?(?:{_WEEKDAY_NAMES})\b|\b(?:{_DATE_WORDS})\b"
+    r"|\b\d{1,2}[/-]\d{1,2}(?:[/-]\d{2,4})?\b"
+    rf"|\b\d{{1,2}}(?:st|nd|rd|th)?\s+(?:of\s+)?{_MONTH_NAMES}\b|\b{_MONTH_NAMES}\s+\d{{1,2}}(?:st|nd|rd|th)?\b)",
+    r"(?P<fleet>\b[a-z]{2}\d{2,4}\b)",
+    rf"(?P<vehicle>\b(?:{_VEHICLE_WORDS})s?\b)",
+    rf"(?P<method>\b(?:{_alternation(PAYMENT_METHODS)})\b)",
+    rf"(?P<pair>\b(?:from|kutoka)\s+{_ARTICLE}(?P<origin>{_PLACE})\s+(?:to|hadi|mpaka|kwenda)\s+"
+    rf"{_ARTICLE}(?P<destination>{_PLACE}){_PLACE_END})",
+    rf"(?P<pickup>\b(?:pick\s*(?:me\s+)?up\s+(?:at|from|in)|from|kutoka)\s+{_ARTICLE}(?P<pickup_place>{_PLACE}){_PLACE_END})",
+    rf"(?P<dropoff>(?:\bdrop\s*(?:me\s+)?(?:off\s+)?(?:at|in)|\bhadi|\bmpaka|\bkwenda|{_MOVEMENT_TO})"
+    rf"\s+{_ARTICLE}(?P<dropoff_place>{_PLACE}){_PLACE_END})",
+    rf"(?P<city>\b(?:{_alternation(city.lower() for city in CITIES)})\b)",
+    r"(?P<number>\b\d[\d,]*(?:\.\d+)?\b)",
+]))
+
+_CITY_NAMES = {city.lower(): city for city in CITIES}
+_NUMBER = re.compile(r"\d[\d,]*(?:\.\d+)?")
+_WORD = re.compile(r"[a-z][a-z'’-]*")
+
+
+def _normalize_phone(raw: str) -> str:
+    return "254" + raw[-9:]
+
+
+def _parse_amount(raw: str) -> Optional[float]:
+    number = _NUMBER.search(raw)
+    return float(number.group().replace(",", "")) if number else None
+
+
+def _parse_time(raw: str) -> Optional[str]:
+    raw = raw.replace(".", "")
+    if raw == "noon":
+        return "12:00"
+    if raw == "midnight":
+        return "00:00"
+
+    if raw.startswith("saa"):
+        words = raw.split()[1:]
+        qualifier = words[-1] if words[-1] in ("asubuhi", "mchana", "jioni", "usiku") else None
+        hour = (SWAHILI_HOURS[" ".join(words[:-1] if qualifier else words)] + 5) % 12 + 1
+        if qualifier == "asubuhi":
+            pm = False
+        elif qualifier in ("mchana", "jioni"):
+            pm = hour != 12
+        elif qualifier == "usiku":
+            if hour == 12:
+                return "00:00"
+            pm = hour >= 6
+        else:
+            pm = hour <= 6
+        return f"{hour if hour == 12 else hour + (12 if pm else 0):02d}:00"
+
+    hour, _, rest = raw.partition(":")
+    hour = int(re.match(r"\d+", hour).group())
+    minute = int(rest[:2]) if rest else 0
+    if raw.endswith("pm") and hour != 12:
+        hour += 12
+    elif raw.endswith("am") and hour == 12:
+        hour = 0
+    return f"{hour:02d}:{minute:02d}"
+
+
+def _parse_date(raw: str, today: date) -> Optional[str]:
+    raw = " ".join(raw.split())
+    if raw in RELATIVE_DAYS:
+        return (today + timedelta(days=RELATIVE_DAYS[raw])).isoformat()
+
+    words = raw.split()
+    if words[-1] in WEEKDAYS:
+        days = (WEEKDAYS[words[-1]] - today.weekday()) % 7
+        if len(words) > 1 and words[0] == "next" and days == 0:
+            days = 7
+        return (today + timedelta(days=days)).isoformat()
+
+    try:
+        if "/" in raw or "-" in raw:
+            # Day first, as written in Kenya
+            parts = [int(part) for part in re.split(r"[/-]", raw)]
+            year = parts[2] if len(parts) == 3 else today.year
+            year += 2000 if year < 100 else 0
+            parsed = date(year, parts[1], parts[0])
+        else:
+            day = int(re.search(r"\d+", raw).group())
+            month = next(MONTHS[word[:4] if word[:4] in MONTHS else word[:3]]
+                         for word in words if word[:3] in MONTHS)
+            parsed = date(today.year, month, day)
+    except (ValueError, StopIteration):
+        return None
+
+    # "25 dec" said in January means next December, not last
+    if len(raw.split("/")) < 3 and len(raw.split("-")) < 3 and parsed < today:
+        parsed = parsed.replace(year=parsed.year + 1)
+    return parsed.isoformat()
+
+
+def _place(raw: str) -> Optional[str]:
+    raw = raw.strip(" '’.-")
+    if not raw:
+        return None
+    return _CITY_NAMES.get(raw, raw.title())
+
+
+class EntityExtractor:
+    """
+    Pulls booking, payment and weather slots out of a message without an LLM.
+
+    All entity patterns (phone, amount, fleet number, time, relative and
+    absolute dates in English and Swahili, vehicle types, payment methods,
+    "from X to Y" / "kutoka X hadi Y" location pairs and a city gazetteer)
+    are compiled once into ONE alternation of named groups, so a message is
+    scanned by a single ``finditer`` and each hit is dispatched on
+    ``lastgroup``. The first mention of each entity wins. A bare number
+    ("2 cars", "in 2 hours") is returned as ``number``, never as ``amount``;
+    only the payment flow reads it as the amount.
+    """
+
+    def extract_with_remainder(self, text: str, now: Optional[datetime] = None) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Entities found in ``text`` plus the words no pattern matched (minus
+        filler words), which tells the caller whether an LLM could find more.
+        """
+        today = (now or datetime.now()).date()
+        lowered = text.lower()
+        entities: Dict[str, Any] = {}
+        remainder = []
+        position = 0
+
+        for match in _ENTITY_PATTERN.finditer(lowered):
+            remainder.append(lowered[position:match.start()])
+            position = match.end()
+            kind, raw = match.lastgroup, match.group().strip()
+
+            if kind == "phone":
+                entities.setdefault("phone", _normalize_phone(raw))
+            elif kind == "amount":
+                entities.setdefault("amount", _parse_amount(raw))
+            elif kind == "number":
+                entities.setdefault("number", _parse_amount(raw))
+            elif kind == "time":
+                entities.setdefault("time", _parse_time(raw))
+            elif kind == "date":
+                parsed = _parse_date(raw, today)
+                if parsed:
+                    entities.setdefault("date", parsed)
+            elif kind == "fleet":
+                entities.setdefault("fleet_number", raw.upper())
+            elif kind == "vehicle":
+                vehicle_type = VEHICLE_TYPES.get(raw, VEHICLE_TYPES.get(raw[:-1]))
+                if vehicle_type:
+                    entities.setdefault("vehicle_type", vehicle_type)
+            elif kind == "method":
+                entities.setdefault("payment_method", PAYMENT_METHODS[raw])
+            elif kind == "pair":
+                entities.setdefault("pickup_location", _place(match.group("origin")))
+                entities.setdefault("dropoff_location", _place(match.group("destination")))
+            elif kind == "pickup":
+                entities.setdefault("pickup_location", _place(match.group("pickup_place")))
+            elif kind == "dropoff":
+                entities.setdefault("dropoff_location", _place(match.group("dropoff_place")))
+            elif kind == "city":
+                entities.setdefault("city", _CITY_NAMES[raw])
+
+        remainder.append(lowered[position:])
+
+        words = [word for word in _WORD.findall(" ".join(remainder)) if word not in FILLER_WORDS]
+        return {key: value for key, value in entities.items() if value is not None}, words
+
+    def extract(self, text: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+        return self.extract_with_remainder(text, now)[0]
+
+
+_extractor = EntityExtractor()
+
+
+def extract_entities(text: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """All slots found in ``text`` (see ``EntityExtractor``)."""
+    return _extractor.extract(text, now)
+
+
+def extract_entities_with_remainder(text: str, now: Optional[datetime] = None) -> Tuple[Dict[str, Any], List[str]]:
+    return _extractor.extract_with_remainder(text, now)
@@ -3,10 +3,14 @@
 NLTK utilities for text processing.
 """
 
+import re
+import zlib
 import nltk
 import string
 import numpy as np
 
+from functools import lru_cache
+
 from nltk.stem.porter import PorterStemmer
 
 from nltk.stem.porter import PorterStemmer
@@ -27,6 +31,61 @@ lemmatizer = WordNetLemmatizer()
 stop_words = set(stopwords.words("english", "swahili"))
 
 
+# Punctuation tokens never used as features
+IGNORE_WORDS = {"?", "!", ".", ","}
+
+# Stems kept in memory; chat traffic repeats a small set of words
+STEM_CACHE_SIZE = 10000
+SYNONYM_CACHE_SIZE = 50000
+
+# ---------------------------------------------------------------
+# Precompiled tokenizer mirroring nltk.word_tokenize (Treebank rules)
+# ---------------------------------------------------------------
+# Characters the Treebank tokenizer always splits off a word
+_SPLIT_CHARS = r"""?!,;:@#$%&*()\[\]{}<>"'`«»“”‘’„\u2012-\u2015"""
+_WORD_CHAR = rf"[^\s{_SPLIT_CHARS}.\-]"
+
+# A word: runs of word characters, single hyphens, inner periods,
+# thousands/time separators and apostrophes that are not clitics
+_WORD_BODY = (
+    rf"(?:{_WORD_CHAR}|-(?!-)|\.(?={_WORD_CHAR})|[,:](?=\d)"
+    rf"|(?<=\w)'(?={_WORD_CHAR})(?!(?:s|m|d|ll|re|ve)\b))+"
+)
+
+# Abbreviations whose period word_tokenize keeps unless it ends the text
+# (Punkt does not treat it as a sentence boundary): "mr.", "p.m.", "e.g."
+_ABBREVIATIONS = ("mr", "mrs", "ms", "dr", "prof", "st", "jr", "sr", "vs", "etc", "e.g", "i.e", "a.m", "p.m")
+_ABBREVIATION = (
+    rf"(?<![^\s{_SPLIT_CHARS}])(?:{'|'.join(re.escape(word) for word in _ABBREVIATIONS)})"
+    rf"\.(?!{_WORD_CHAR})(?![\])}}>\"'»”’\s]*$)"
+)
+
+_TOKEN_PATTERN = re.compile(
+    rf"""
+    {_ABBREVIATION}                 # "mr." in "mr. otieno", not "a.m" "." at the end
+    | {_WORD_BODY}(?=n't\b)         # "do" in "don't", "ca" in "can't"
+    | n't\b
+    | '(?:s|m|d|ll|re|ve)\b         # clitics: 's 'm 'd 'll 're 've
+    | {_WORD_BODY}
+    | \.{{2,}} | -- | `+
+    | [{_SPLIT_CHARS}.]             # any other symbol on its own
+    """,
+    re.VERBOSE,
+)
+
+# Whole-word contractions the Treebank tokenizer splits in two
+_SPLIT_CONTRACTIONS = {
+    "cannot": ["can", "not"],
+    "d'ye": ["d", "'ye"],
+    "gimme": ["gim", "me"],
+    "gonna": ["gon", "na"],
+    "gotta": ["got", "ta"],
+    "lemme": ["lem", "me"],
+    "more'n": ["more", "'n"],
+    "wanna": ["wan", "na"],
+}
+
+
 def tokenize(sentence):
     """
     Split sentence into array of words/tokens.
@@ -40,6 +99,75 @@ def tokenize(sentence):
     return nltk.word_tokenize(sentence.lower())
 
 
+def fast_tokenize(sentence):
+    """
+    Split sentence into tokens with a single precompiled regex.
+
+    Drop-in replacement for ``tokenize`` on the hot path: it applies the
+    same Treebank rules as ``nltk.word_tokenize`` (clitics, "n't", split
+    punctuation) without running the Punkt sentence splitter, so models
+    trained on ``tokenize`` output can use it without retraining.
+    Use ``tokenizer_parity`` to check both agree on a corpus.
+
+    Known divergence: Punkt decides statistically whether a period ends a
+    sentence. Here the period stays on the word only for the abbreviations
+    in ``_ABBREVIATIONS`` ("mr.", "p.m.") and is split off everywhere else,
+    so an abbreviation Punkt knows but the list does not ("approx. 5km")
+    tokenizes differently.
+
+    Example:
+        fast_tokenize("Thank's a lot!")
+        # -> ["thank", "'s", "a", "lot", "!"]
+
+    Args:
+        sentence: String to tokenize
+
+    Returns:
+        List of tokens
+    """
+    text = sentence.lower()
+
+    if '"' in text:
+        # Treebank renders opening double quotes as `` and closing ones as ''
+        tokens = [
+            match.group()
+            if match.group() != '"'
+            else ("``" if match.start() == 0 or text[match.start() - 1] in " ([{<" else "''")
+            for match in _TOKEN_PATTERN.finditer(text)
+        ]
+    else:
+        tokens = _TOKEN_PATTERN.findall(text)
+
+    if not _SPLIT_CONTRACTIONS.keys().isdisjoint(tokens):
+        tokens = [
+            part
+            for tok in tokens
+            for part in _SPLIT_CONTRACTIONS.get(tok, [tok])
+        ]
+
+    return tokens
+
+
+def tokenizer_parity(sentences):
+    """
+    Compare ``fast_tokenize`` against ``tokenize`` on a list of sentences.
+
+    Args:
+        sentences: Iterable of strings
+
+    Returns:
+        List of (sentence, nltk_tokens, fast_tokens) for every mismatch
+    """
+    mismatches = []
+    for sentence in sentences:
+        expected = tokenize(sentence)
+        actual = fast_tokenize(sentence)
+        if expected != actual:
+            mismatches.append((sentence, expected, actual))
+    return mismatches
+
+
+@lru_cache(maxsize=STEM_CACHE_SIZE)
 def stem(word):
     """
     Stemming: find the root form of the word.
@@ -55,6 +183,7 @@ def stem(word):
     Returns:
         Stemmed word
     """
+    # Memoized: PorterStemmer is pure, and the same few words repeat
     return stemmer.stem(word.lower())
 
 
@@ -88,6 +217,298 @@ def bag_of_words(tokenized_sentence, words):
     return bag
 
 
+class BagOfWordsVectorizer:
+    """
+    Bag of words over a fixed vocabulary, indexed once up front.
+
+    Produces exactly the same vector as ``bag_of_words(tokens, words)``, but
+    each stemmed token is looked up in a word -> column index instead of
+    scanning the whole vocabulary, so the cost per message grows with the
+    number of tokens rather than the size of ``words``.
+
+    Example:
+        vectorizer = BagOfWordsVectorizer(all_words)
+        bag = vectorizer.transform(tokenize("Hello, how are you?"))
+
+    Args:
+        words: List of vocabulary words (e.g. ``all_words`` from the model file)
+    """
+
+    def __init__(self, words):
+        self.words = list(words)
+        self.size = len(self.words)
+
+        # A word may appear more than once in the vocabulary; bag_of_words
+        # sets every matching column, so keep all of them.
+        self.index = {}
+        for idx, w in enumerate(self.words):
+            self.index.setdefault(w, []).append(idx)
+
+    def indices(self, tokenized_sentence):
+        """
+        Return the sorted column indices that are 1 for the given tokens.
+
+        Args:
+            tokenized_sentence: List of tokens
+
+        Returns:
+            Sorted list of column indices
+        """
+        columns = set()
+        for word in tokenized_sentence:
+            columns.update(self.index.get(stem(word), ()))
+        return sorted(columns)
+
+    def transform(self, tokenized_sentence, out=None):
+        """
+        Return the bag of words array for the given tokens.
+
+        Args:
+            tokenized_sentence: List of tokens
+            out: Optional float32 buffer of length ``size`` to fill in place
+
+        Returns:
+            Numpy array of bag of words
+        """
+        if out is None:
+            out = np.zeros(self.size, dtype=np.float32)
+        else:
+            out.fill(0)
+
+        columns = self.indices(tokenized_sentence)
+        if columns:
+            out[columns] = 1
+
+        return out
+
+    def transform_batch(self, tokenized_sentences):
+        """
+        Return the bag of words matrix for a batch of token lists.
+
+        Args:
+            tokenized_sentences: List of token lists
+
+        Returns:
+            Numpy array of shape (len(tokenized_sentences), size)
+        """
+        rows, columns = [], []
+        for row, tokenized_sentence in enumerate(tokenized_sentences):
+            cols = self.indices(tokenized_sentence)
+            rows.extend([row] * len(cols))
+            columns.extend(cols)
+
+        out = np.zeros((len(tokenized_sentences), self.size), dtype=np.float32)
+        if columns:
+            out[rows, columns] = 1
+
+        return out
+
+
+def pad_id_lists(id_lists, pad_id=0):
+    """
+    Stack variable-length id lists into a (batch, longest) int64 matrix
+    padded with ``pad_id``, the input expected by ``nn.EmbeddingBag`` with
+    ``padding_idx=pad_id``.
+    """
+    width = max((len(ids) for ids in id_lists), default=0) or 1
+    out = np.full((len(id_lists), width), pad_id, dtype=np.int64)
+    for row, ids in enumerate(id_lists):
+        out[row, :len(ids)] = ids
+    return out
+
+
+class HashedNgramFeaturizer:
+    """
+    Word and character n-grams hashed into a fixed number of buckets.
+
+    Each token contributes its stem, and its character n-grams
+    (``<mambo>`` -> ``<ma``, ``mam``, ...); neighbouring stems contribute
+    word bigrams. Every feature is hashed (CRC32, stable across processes)
+    into ``num_buckets`` ids, so the feature space stays the same size as
+    languages and intents are added, and unseen Sheng/Swahili spellings
+    still share character n-grams with known words.
+
+    Bucket 0 is reserved for padding.
+
+    Example:
+        featurizer = HashedNgramFeaturizer(num_buckets=2 ** 16)
+        ids = featurizer.transform_batch([tokenize("Niko na shida ya mpesa")])
+
+    Args:
+        num_buckets: Size of the hashed feature space
+        char_ngrams: (min, max) character n-gram lengths
+        word_bigrams: Whether to add stem bigram features
+    """
+
+    pad_id = 0
+
+    def __init__(self, num_buckets=2 ** 15, char_ngrams=(3, 5), word_bigrams=True):
+        self.num_buckets = int(num_buckets)
+        self.char_ngrams = tuple(char_ngrams)
+        self.word_bigrams = bool(word_bigrams)
+        self.size = self.num_buckets
+
+        # Token -> feature ids, memoized like stem()
+        self._token_ids = lru_cache(maxsize=STEM_CACHE_SIZE)(self._compute_token_ids)
+
+    def config(self):
+        return {
+            "type": "hashed",
+            "num_buckets": self.num_buckets,
+            "char_ngrams": list(self.char_ngrams),
+            "word_bigrams": self.word_bigrams,
+        }
+
+    def _bucket(self, feature):
+        return 1 + zlib.crc32(feature.encode("utf-8")) % (self.num_buckets - 1)
+
+    def _compute_token_ids(self, token):
+        word = token.lower()
+        ids = [self._bucket("w:" + stem(word))]
+
+        padded = f"<{word}>"
+        low, high = self.char_ngrams
+        for n in range(low, high + 1):
+            for i in range(len(padded) - n + 1):
+                ids.append(self._bucket("c:" + padded[i:i + n]))
+
+        return tuple(ids)
+
+    def indices(self, tokenized_sentence):
+        """
+        Return the (unsorted, possibly repeated) feature ids for the given tokens.
+
+        Args:
+            tokenized_sentence: List of tokens
+
+        Returns:
+            List of bucket ids
+        """
+        words = [word for word in tokenized_sentence if word not in IGNORE_WORDS]
+
+        ids = []
+        for word in words:
+            ids.extend(self._token_ids(word))
+
+        if self.word_bigrams:
+            stems = [stem(word) for word in words]
+            ids.extend(self._bucket(f"b:{a} {b}") for a, b in zip(stems, stems[1:]))
+
+        return ids
+
+    def transform(self, tokenized_sentence):
+        return np.asarray(self.indices(tokenized_sentence), dtype=np.int64)
+
+    def transform_batch(self, tokenized_sentences):
+        """
+        Return the padded feature id matrix for a batch of token lists.
+
+        Args:
+            tokenized_sentences: List of token lists
+
+        Returns:
+            Numpy int64 array of shape (len(tokenized_sentences), longest)
+        """
+        return pad_id_lists([self.indices(tokens) for tokens in tokenized_sentences], self.pad_id)
+
+
+class VocabIndexer:
+    """
+    Token ids from a fixed ``word2idx`` table (``data/vocab.json``).
+
+    Tokens are lowercased and looked up as-is; unknown tokens map to
+    ``<UNK>`` and rows are padded with ``<PAD>`` for ``nn.EmbeddingBag``.
+
+    Example:
+        indexer = VocabIndexer.from_file("data/vocab.json")
+        ids = indexer.transform_batch([tokenize("I want to book a taxi")])
+
+    Args:
+        word2idx: Mapping of word -> id containing ``<PAD>`` and ``<UNK>``
+    """
+
+    PAD = "<PAD>"
+    UNK = "<UNK>"
+
+    def __init__(self, word2idx):
+        self.word2idx = dict(word2idx)
+        self.pad_id = self.word2idx[self.PAD]
+        self.unk_id = self.word2idx[self.UNK]
+        self.size = max(self.word2idx.values()) + 1
+
+    @classmethod
+    def from_file(cls, path):
+        import json
+
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f)["word2idx"])
+
+    def extend(self, tokenized_sentences, min_count=1):
+        """
+        Return a new indexer with words from ``tokenized_sentences`` appended
+        after the existing ids (existing ids never move).
+        """
+        counts = {}
+        for tokens in tokenized_sentences:
+            for word in tokens:
+                word = word.lower()
+                if word not in IGNORE_WORDS and word not in self.word2idx:
+                    counts[word] = counts.get(word, 0) + 1
+
+        word2idx = dict(self.word2idx)
+        for word in sorted(w for w, count in counts.items() if count >= min_count):
+            word2idx[word] = max(word2idx.values()) + 1
+        return VocabIndexer(word2idx)
+
+    def config(self):
+        return {"type": "vocab", "word2idx": self.word2idx}
+
+    def indices(self, tokenized_sentence):
+        """
+        Return the token ids for the given tokens (``<UNK>`` for unknown words).
+
+        Args:
+            tokenized_sentence: List of tokens
+
+        Returns:
+            List of token ids
+        """
+        return [
+            self.word2idx.get(word.lower(), self.unk_id)
+            for word in tokenized_sentence
+            if word not in IGNORE_WORDS
+        ]
+
+    def transform(self, tokenized_sentence):
+        return np.asarray(self.indices(tokenized_sentence), dtype=np.int64)
+
+    def transform_batch(self, tokenized_sentences):
+        """
+        Return the padded token id matrix for a batch of token lists.
+
+        Args:
+            tokenized_sentences: List of token lists
+
+        Returns:
+            Numpy int64 array of shape (len(tokenized_sentences), longest)
+        """
+        return pad_id_lists([self.indices(tokens) for tokens in tokenized_sentences], self.pad_id)
+
+
+def featurizer_from_config(config):
+    """Rebuild the featurizer saved in a model artifact (see ``config()``)."""
+    kind = config.get("type")
+    if kind == "hashed":
+        return HashedNgramFeaturizer(
+            num_buckets=config["num_buckets"],
+            char_ngrams=config["char_ngrams"],
+            word_bigrams=config["word_bigrams"],
+        )
+    if kind == "vocab":
+        return VocabIndexer(config["word2idx"])
+    raise ValueError(f"Unknown featurizer type '{kind}'")
+
+
 def preprocess_text(text):
     if isinstance(text, list):  # Convert list to a string if needed
         text = " ".join(text)
@@ -130,14 +551,49 @@ def create_bow(sentence, words):
     return np.array(bag)
 
 
-def augment_sentence(sentence):
+@lru_cache(maxsize=SYNONYM_CACHE_SIZE)
+def synonyms_for(word):
+    """
+    WordNet lemma names for ``word`` (first synset first), without the word
+    itself. Cached: a WordNet lookup costs far more than the rest of an
+    augmentation step and patterns repeat the same words.
+    """
+    names = []
+    for synset in wordnet.synsets(word):
+        for lemma in synset.lemmas():
+            name = lemma.name().replace("_", " ")
+            if name.lower() != word.lower() and name not in names:
+                names.append(name)
+    return tuple(names)
+
+
+@lru_cache(maxsize=SYNONYM_CACHE_SIZE)
+def _first_lemma(word):
+    synonyms = wordnet.synsets(word)
+    return synonyms[0].lemmas()[0].name() if synonyms else word
+
+
+def augment_sentence(sentence, rng=None, synonyms=None, replace_prob=0.5):
+    """
+    Replace words of ``sentence`` with WordNet synonyms.
+
+    Without ``rng`` every word becomes the first lemma of its first synset
+    (the original behaviour). With a ``random.Random`` each non-stopword is
+    swapped for a random synonym with probability ``replace_prob``;
+    ``synonyms`` may be a prebuilt {word: [synonyms]} table to look words up
+    in instead of WordNet.
+    """
     words = sentence.split()
+    if rng is None:
+        return " ".join(_first_lemma(word) for word in words)
+
     augmented = []
     for word in words:
-        synonyms = wordnet.synsets(word)
-        if synonyms:
-            synonym = synonyms[0].lemmas()[0].name()
-            augmented.append(synonym)
+        key = word.lower()
+        options = synonyms.get(key, ()) if synonyms is not None else synonyms_for(key)
+        if options and key not in stop_words and rng.random() < replace_prob:
+            augmented.append(rng.choice(options))
         else:
             augmented.append(word)
     return " ".join(augmented)
+